@@ -0,0 +1,87 @@
+# Compares input-order parsing with size-aware scheduling on a corpus whose
+# largest files come last and prints per-worker utilization. The
+# size-aware run is repeated with the shared memory transport, which
+# returns node arenas instead of pickled ASTs.
+#
+# Usage: python scripts/batch_report.py [DIRECTORY] [--workers N]
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from solp.batch import TRANSPORT_SHARED_MEMORY, parse_batch, plan_chunks
+from solp.project import load_project
+
+CONTRACT = """contract C{i} {{
+    function f{i}(address to, uint amount) public {{
+        require(msg.sender);
+        emit Transfer(msg.sender, to, amount);
+    }}
+}}
+"""
+
+
+def synthetic_corpus(directory, small=400, large=4):
+    paths = []
+    for i in range(small):
+        paths.append(_write(directory, f"small{i}.sol", CONTRACT.format(i=i)))
+    for i in range(large):
+        text = "".join(CONTRACT.format(i=j) for j in range(1500))
+        paths.append(_write(directory, f"large{i}.sol", text))
+    return paths
+
+
+def _write(directory, name, text):
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def input_order(paths, workers):
+    # Baseline: one task per file in input order (no imports to resolve).
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        load_project(paths, executor=pool)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory", nargs="?")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.directory:
+            paths = sorted(
+                os.path.join(root, name)
+                for root, _, files in os.walk(args.directory)
+                for name in files
+                if name.endswith(".sol")
+            )
+        else:
+            paths = synthetic_corpus(tmp)
+
+        baseline = input_order(paths, args.workers)
+        costs = {path: os.path.getsize(path) for path in paths}
+        chunks = plan_chunks(costs, args.workers)
+        result = parse_batch(paths, max_workers=args.workers)
+        with parse_batch(
+            paths, max_workers=args.workers, transport=TRANSPORT_SHARED_MEMORY
+        ) as shared:
+            start = time.perf_counter()
+            for view in shared.units.values():
+                view.materialize()
+            materialize = time.perf_counter() - start
+
+    print(f"{len(paths)} files, {len(chunks)} chunks, {args.workers} workers")
+    print(f"input order:  wall {baseline:.3f}s")
+    print(f"size-aware:   {result.report}")
+    print(f"shared mem:   {shared.report}")
+    print(f"  materializing all views in the parent: {materialize:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Builds control-flow graphs for synthetic functions with thousands of
+# statements and reports build, reachability and dominator times together
+# with block, edge and adjacency sizes.
+#
+# Usage: python scripts/cfg_benchmark.py [--statements N ...]
+import argparse
+import time
+
+from solp.cfg import build_cfg
+from solp.solidity_parser import parse_contract
+
+# One group is eight statements: a branch, a loop with break/continue, a
+# for-loop and dead code after a return inside a branch.
+GROUP = """
+        total = amount;
+        if (amount) {{ owner = amount; }} else {{ owner = total; }}
+        while (total) {{
+            if (owner) {{ break; }}
+            total = owner;
+            continue;
+        }}
+        for (i = amount; i; i) {{ add{n}(i); }}
+        if (locked) {{ return total; owner = total; }}
+"""
+
+
+def synthetic_function(statements):
+    groups = max(1, statements // 8)
+    body = "".join(GROUP.format(n=n) for n in range(groups))
+    source = f"contract C {{ function f(uint amount) public {{{body}}} }}"
+    return parse_contract(source).members[0]
+
+
+def measure(function, repeat=5):
+    best = {"build": float("inf"), "reachable": float("inf"), "dominators": 0}
+    best["dominators"] = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cfg = build_cfg(function)
+        built = time.perf_counter()
+        cfg.reachable()
+        reached = time.perf_counter()
+        cfg.dominators()
+        done = time.perf_counter()
+        best["build"] = min(best["build"], built - start)
+        best["reachable"] = min(best["reachable"], reached - built)
+        best["dominators"] = min(best["dominators"], done - reached)
+    return cfg, best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--statements", type=int, nargs="+", default=[1000, 4000, 16000]
+    )
+    args = parser.parse_args()
+    print(
+        f"{'statements':>10} {'blocks':>7} {'edges':>7} {'adjacency':>10} "
+        f"{'build ms':>9} {'reach ms':>9} {'idom ms':>8}"
+    )
+    for statements in args.statements:
+        cfg, best = measure(synthetic_function(statements))
+        adjacency = sum(
+            len(table) * table.itemsize
+            for table in (
+                cfg.successor_offsets,
+                cfg.successors_of,
+                cfg.predecessor_offsets,
+                cfg.predecessors_of,
+            )
+        )
+        print(
+            f"{statements:>10} {len(cfg):>7} {cfg.edge_count():>7} "
+            f"{adjacency:>9}B {best['build'] * 1000:>9.2f} "
+            f"{best['reachable'] * 1000:>9.2f} {best['dominators'] * 1000:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,9 @@ def extract_arc42_comments(base_dirs):
                     i = 0
                     while i < len(lines):
                         line = lines[i]
-                        match = re.match(r"#\s*arc42:\s*((?:\d+\.)*\d+)\s+(.*)", line)
+                        match = re.match(
+                            r"\s*#\s*arc42:\s*((?:\d+\.)*\d+)\s+(.*)", line
+                        )
                         if match:
                             section_id = match.group(1).strip()
                             section_title = match.group(2).strip()
@@ -32,7 +34,7 @@ def extract_arc42_comments(base_dirs):
                             while (
                                 i < len(lines)
                                 and lines[i].lstrip().startswith("#")
-                                and not re.match(r"#\s*arc42:", lines[i])
+                                and not re.match(r"\s*#\s*arc42:", lines[i])
                             ):
                                 description_lines.append(lines[i].lstrip("#").strip())
                                 i += 1
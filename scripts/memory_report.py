@@ -0,0 +1,77 @@
+# Reports the memory held by the ASTs of a corpus, built with the default
+# node factory and with the HashConsingNodeFactory.
+#
+# Usage: python scripts/memory_report.py [DIRECTORY]
+# Without a directory, a synthetic corpus of similar contracts is used.
+import gc
+import os
+import sys
+import tracemalloc
+
+from solp.solidity_ast.factory import HashConsingNodeFactory, NodeFactory
+from solp.solidity_parser import parse_source_unit
+
+TEMPLATE = """contract Token{i} {{
+    address owner;
+    function transfer(address to, uint amount) public {{
+        require(msg.sender);
+        balances.sub(msg.sender, amount);
+        balances.add(to, amount);
+        emit Transfer(msg.sender, to, amount);
+    }}
+    function approve(address spender, uint amount) public {{
+        require(msg.sender);
+        allowances.set(msg.sender, spender, amount);
+        emit Approval(msg.sender, spender, amount);
+    }}
+    function withdraw{i}() public payable {{
+        require(msg.value);
+        if (locked) {{ revert(); }}
+        msg.sender.transfer(msg.value);
+    }}
+}}
+"""
+
+
+def load_corpus(root=None):
+    if root is None:
+        return [TEMPLATE.format(i=i) for i in range(2000)]
+    sources = []
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if name.endswith(".sol"):
+                with open(os.path.join(directory, name), encoding="utf-8") as f:
+                    sources.append(f.read())
+    return sources
+
+
+def measure(sources, factory):
+    gc.collect()
+    tracemalloc.start()
+    units = []
+    for source in sources:
+        try:
+            units.append(parse_source_unit(source, factory))
+        except Exception:
+            continue
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return units, current
+
+
+def main(argv):
+    sources = load_corpus(argv[1] if len(argv) > 1 else None)
+    units, plain = measure(sources, NodeFactory())
+    del units
+    interning = HashConsingNodeFactory()
+    units, shared = measure(sources, interning)
+    print(f"files parsed:          {len(units)}")
+    print(f"default factory:       {plain / 1024:10.1f} KiB")
+    print(f"hash-consing factory:  {shared / 1024:10.1f} KiB")
+    print(f"saved:                 {100 * (1 - shared / plain):9.1f} %")
+    print(f"shared nodes:          {len(interning)} ({interning.hits} reuses)")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
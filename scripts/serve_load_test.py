@@ -0,0 +1,160 @@
+# Load-test client for `solp serve`. Opens one synthetic document, then
+# alternates single-character edits with parse, outline and diagnostics
+# requests and reports p50/p99 latency per method. For comparison, the
+# latency of a cold one-shot process (interpreter start, import, parse) is
+# measured as well.
+#
+# Usage: python scripts/serve_load_test.py [--requests N] [--contracts N]
+#                                          [--socket PATH]
+import argparse
+import json
+import socket
+import subprocess
+import sys
+import time
+
+CONTRACT = """contract Token{i} {{
+    address owner;
+    function transfer(address to, uint amount) public {{
+        require(msg.sender);
+        emit Transfer(msg.sender, to, amount);
+    }}
+    function approve(address spender, uint amount) public {{
+        allowances.set(msg.sender, spender, amount);
+    }}
+}}
+"""
+
+METHODS = ["solp/parse", "solp/outline", "solp/diagnostics"]
+
+
+class StdioClient:
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "solp", "serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+
+    def send(self, line):
+        self.process.stdin.write(line + "\n")
+        self.process.stdin.flush()
+
+    def receive(self):
+        return self.process.stdout.readline()
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+
+class SocketClient:
+    def __init__(self, path):
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.connection.connect(path)
+        self.reader = self.connection.makefile("r", encoding="utf-8")
+
+    def send(self, line):
+        self.connection.sendall((line + "\n").encode("utf-8"))
+
+    def receive(self):
+        return self.reader.readline()
+
+    def close(self):
+        self.connection.close()
+
+
+class Session:
+    def __init__(self, client):
+        self.client = client
+        self.next_id = 0
+
+    def notify(self, method, params):
+        self.client.send(
+            json.dumps({"jsonrpc": "2.0", "method": method, "params": params})
+        )
+
+    def request(self, method, params):
+        self.next_id += 1
+        message = {"jsonrpc": "2.0", "id": self.next_id, "method": method}
+        self.client.send(json.dumps(dict(message, params=params)))
+        response = json.loads(self.client.receive())
+        if "error" in response:
+            raise Exception(response["error"]["message"])
+        return response["result"]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def cold_latency(text, runs):
+    code = "import sys, solp; solp.parse_source_unit(sys.stdin.read())"
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], input=text, text=True, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--contracts", type=int, default=20)
+    parser.add_argument("--socket", help="connect to a running `solp serve --socket`")
+    parser.add_argument("--cold-runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    text = "".join(CONTRACT.format(i=i) for i in range(args.contracts))
+    client = SocketClient(args.socket) if args.socket else StdioClient()
+    session = Session(client)
+    session.request("initialize", {})
+    session.notify("textDocument/didOpen", {"uri": "load.sol", "text": text})
+
+    # Edits toggle a character in the first line of a function body of a
+    # rotating contract, so every edit invalidates exactly one chunk.
+    lines_per_contract = CONTRACT.count("\n")
+    timings = {method: [] for method in METHODS}
+    timings["didChange+request"] = []
+    for i in range(args.requests):
+        line = (i % args.contracts) * lines_per_contract + 3
+        edit = {
+            "range": {
+                "start": {"line": line, "character": 8},
+                "end": {"line": line, "character": 8 if i % 2 == 0 else 9},
+            },
+            "text": " " if i % 2 == 0 else "",
+        }
+        method = METHODS[i % len(METHODS)]
+        start = time.perf_counter()
+        session.notify(
+            "textDocument/didChange", {"uri": "load.sol", "contentChanges": [edit]}
+        )
+        session.request(method, {"uri": "load.sol"})
+        timings["didChange+request"].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        session.request(method, {"uri": "load.sol"})
+        timings[method].append(time.perf_counter() - start)
+
+    if not args.socket:
+        session.notify("exit", {})
+    client.close()
+
+    print(f"document: {args.contracts} contracts, {len(text)} characters")
+    for name, values in timings.items():
+        print(
+            f"{name:18} n={len(values):5}  p50={percentile(values, 0.5) * 1000:7.2f} ms"
+            f"  p99={percentile(values, 0.99) * 1000:7.2f} ms"
+        )
+    if args.cold_runs:
+        cold = cold_latency(text, args.cold_runs)
+        p50 = percentile(cold, 0.5) * 1000
+        print(f"{'cold process':18} n={len(cold):5}  p50={p50:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Measures the import cost of solp entry points with `python -X importtime`
+# in fresh interpreters and compares the best cumulative time of the
+# top-level solp module against a threshold per entry point. Exits with
+# status 1 if a threshold is exceeded.
+#
+# Usage: python scripts/startup_benchmark.py [--repeat N] [--top N]
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# statement -> maximum cumulative import time of the solp modules in ms.
+# Thresholds are generous so that slow machines pass; they catch eager
+# imports of the parser, the rule modules or multiprocessing again. The CLI
+# budget covers argparse, which every `solp` invocation loads.
+THRESHOLDS = {
+    "import solp": 15,
+    "from solp import scan_header": 30,
+    "from solp import parse_source_unit": 60,
+    "from solp import load_project": 120,
+    "import solp.cli": 30,
+}
+
+
+def import_times(statement):
+    """
+    Runs a statement in a fresh interpreter with -X importtime.
+
+    :param statement: Python statement, e.g. "import solp"
+    :return: dict of module name -> (self µs, cumulative µs, nesting depth)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        if not own.strip().isdigit():
+            continue  # header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times[name.strip()] = (int(own), int(cumulative), depth)
+    return times
+
+
+def solp_time(times):
+    # Cumulative µs of all solp imports made directly by the statement:
+    # `solp` itself and the modules its lazy attributes load afterwards.
+    return sum(
+        cumulative
+        for name, (_, cumulative, depth) in times.items()
+        if depth == 0 and name.split(".")[0] == "solp"
+    )
+
+
+def measure(statement, repeat):
+    best = None
+    for _ in range(repeat):
+        times = import_times(statement)
+        if best is None or solp_time(times) < solp_time(best):
+            best = times
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="solp import time benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'statement':<40} {'ms':>8} {'limit':>6} {'modules':>8}")
+    for statement, limit in THRESHOLDS.items():
+        times = measure(statement, args.repeat)
+        elapsed = solp_time(times) / 1000
+        modules = sum(1 for name in times if name.split(".")[0] == "solp")
+        flag = "" if elapsed <= limit else "  SLOW"
+        failed = failed or bool(flag)
+        print(f"{statement:<40} {elapsed:>8.1f} {limit:>6} {modules:>8}{flag}")
+        slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (own, _, _) in slowest[: args.top]:
+            print(f"    {own / 1000:>8.2f} ms  {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
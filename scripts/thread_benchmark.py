@@ -0,0 +1,71 @@
+# Parses a synthetic corpus with 1, 2, 4, ... threads sharing one
+# SymbolTable and one HashConsingNodeFactory and reports wall time and
+# speedup over one thread. On a GIL build the speedup stays near 1; on a
+# free-threaded build (python3.13t) it should approach the thread count.
+#
+# Usage: python scripts/thread_benchmark.py [--files N] [--threads N ...]
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from solp.lexer.interning import SymbolTable
+from solp.solidity_ast.factory import HashConsingNodeFactory
+from solp.solidity_parser import parse_source_unit
+
+CONTRACT = """contract C{i} {{
+    uint total;
+    function add{i}(uint amount) public {{
+        total = amount;
+        if (amount) {{ log(amount); }} else {{ revert(total); }}
+        for (i = amount; i; i) {{ total = i; }}
+    }}
+    function get() public returns (uint) {{
+        return total;
+    }}
+}}
+"""
+
+
+def corpus(files, contracts=20):
+    return [
+        "".join(CONTRACT.format(i=f * contracts + i) for i in range(contracts))
+        for f in range(files)
+    ]
+
+
+def parse_all(sources, threads):
+    symbols = SymbolTable()
+    nodes = HashConsingNodeFactory()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        units = list(
+            executor.map(lambda s: parse_source_unit(s, nodes, symbols), sources)
+        )
+    return time.perf_counter() - start, units
+
+
+def gil_enabled():
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else check()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="solp thread scaling benchmark")
+    parser.add_argument("--files", type=int, default=64)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    sources = corpus(args.files)
+    print(f"GIL enabled: {gil_enabled()}, CPUs: {os.cpu_count()}")
+    print(f"{'threads':>8} {'seconds':>9} {'speedup':>8}")
+    baseline = None
+    for threads in args.threads:
+        elapsed, _ = parse_all(sources, threads)
+        baseline = baseline or elapsed
+        print(f"{threads:>8} {elapsed:>9.3f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
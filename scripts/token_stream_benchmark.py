@@ -0,0 +1,99 @@
+# Micro-benchmarks for the TokenStream hot paths: nanoseconds per consumed
+# token for the generic match(type_, value) and the specialized
+# match_symbol / match_keyword / expect_symbol methods, plus end-to-end
+# parse time per token for a synthetic contract.
+#
+# Usage: python scripts/token_stream_benchmark.py [--tokens N] [--repeat N]
+import argparse
+import time
+
+from solp.lexer.lexer import Lexer
+from solp.lexer.token import Token
+from solp.lexer.token_types import KEYWORD, SYMBOL
+from solp.parser.parser import Parser
+from solp.parser.token_stream import TokenStream
+
+FUNCTION = """
+    function f{n}(uint amount) public payable {{
+        total = amount;
+        if (amount) {{ log(amount); }} else {{ revert(total); }}
+        while (total) {{ total = amount; }}
+        return total;
+    }}"""
+
+
+def alternating_tokens(count):
+    # `( return ( return ...`: every consumption tests one symbol or keyword.
+    return [
+        Token(SYMBOL, "(") if i % 2 == 0 else Token(KEYWORD, "return")
+        for i in range(count)
+    ]
+
+
+def consume_generic(stream, pairs):
+    match = stream.match
+    for _ in range(pairs):
+        match(SYMBOL, "(")
+        match(KEYWORD, "return")
+
+
+def consume_specialized(stream, pairs):
+    match_symbol = stream.match_symbol
+    match_keyword = stream.match_keyword
+    for _ in range(pairs):
+        match_symbol("(")
+        match_keyword("return")
+
+
+def consume_expect(stream, pairs):
+    expect_symbol = stream.expect_symbol
+    expect_keyword = stream.expect_keyword
+    for _ in range(pairs):
+        expect_symbol("(")
+        expect_keyword("return")
+
+
+def best_ns_per_token(consume, tokens, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        stream = TokenStream(tokens)
+        start = time.perf_counter_ns()
+        consume(stream, len(tokens) // 2)
+        best = min(best, time.perf_counter_ns() - start)
+        assert stream.at_end()
+    return best / len(tokens)
+
+
+def parse_ns_per_token(functions, repeat):
+    body = "".join(FUNCTION.format(n=n) for n in range(functions))
+    tokens = Lexer(f"contract C {{ uint total;{body}\n}}").tokenize()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        Parser(tokens).parse()
+        best = min(best, time.perf_counter_ns() - start)
+    return best / len(tokens), len(tokens)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TokenStream micro-benchmarks")
+    parser.add_argument("--tokens", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tokens = alternating_tokens(args.tokens)
+    generic = best_ns_per_token(consume_generic, tokens, args.repeat)
+    print(f"{'method':<32} {'ns/token':>9} {'saving':>8}")
+    print(f"{'match(type_, value)':<32} {generic:>9.1f} {'':>8}")
+    for name, consume in (
+        ("match_symbol / match_keyword", consume_specialized),
+        ("expect_symbol / expect_keyword", consume_expect),
+    ):
+        ns = best_ns_per_token(consume, tokens, args.repeat)
+        print(f"{name:<32} {ns:>9.1f} {generic - ns:>8.1f}")
+    ns, count = parse_ns_per_token(500, args.repeat)
+    print(f"{'Parser.parse() (' + str(count) + ' tokens)':<32} {ns:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,37 @@
-from .solidity_parser import parse_contract
+# arc42: 5.22 Lazy Package Loading
+# `import solp` only executes this module. The public functions are
+# resolved on first attribute access (PEP 562 module __getattr__): every
+# name maps to the module that defines it, which is imported then and the
+# value is stored in the module globals, so later lookups are plain global
+# reads. Submodules (solp.aio, solp.cli, ...) are imported as usual with
+# `import solp.aio` or `from solp import aio`.
+_EXPORTS = {
+    "check": "solp.solidity_parser",
+    "iter_declarations": "solp.solidity_parser",
+    "load_project": "solp.project",
+    "parse_contract": "solp.solidity_parser",
+    "parse_source_unit": "solp.solidity_parser",
+    "scan_header": "solp.lexer.header",
+}
 
-__all__ = ["parse_contract"]
+__all__ = [
+    "check",
+    "iter_declarations",
+    "load_project",
+    "parse_contract",
+    "parse_source_unit",
+    "scan_header",
+]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(__import__(module, fromlist=(name,)), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,5 @@
+import sys
+
+from solp.cli import main
+
+sys.exit(main())
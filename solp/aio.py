@@ -0,0 +1,144 @@
+# arc42: 5.15 Asyncio API
+# Coroutine wrappers for services running on an asyncio event loop. Lexing
+# and parsing are CPU bound and would block the loop, so they run in an
+# executor: the loop's default thread pool unless a ThreadPoolExecutor or
+# ProcessPoolExecutor is passed in. Files are read in a (separate,
+# optional) I/O executor so disk access never blocks the loop either.
+#
+# `iter_parse()` admits at most `concurrency` files at a time and only
+# admits the next file when the consumer asks for more results. The path
+# iterable is therefore consumed lazily (back-pressure), and closing or
+# cancelling the consumer cancels all admitted work that has not started
+# yet. `parse_many()` collects the same results in input order.
+import asyncio
+import time
+
+from solp.solidity_parser import parse_source_unit
+
+DEFAULT_CONCURRENCY = 8
+
+
+class ParseResult:
+    # Outcome of one file: the SourceUnitNode or the error message, plus
+    # wall-clock seconds spent reading and parsing it.
+    def __init__(
+        self, index, path, unit=None, error=None, read_time=0.0, parse_time=0.0
+    ):
+        self.index = index
+        self.path = path
+        self.unit = unit
+        self.error = error
+        self.read_time = read_time
+        self.parse_time = parse_time
+
+    @property
+    def latency(self):
+        return self.read_time + self.parse_time
+
+    def __repr__(self):
+        status = "error" if self.error is not None else "ok"
+        return f"ParseResult({self.path!r}, {status}, {self.latency * 1000:.1f} ms)"
+
+
+def _read_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+async def parse(source, executor=None):
+    """
+    Parses a Solidity source in an executor without blocking the loop.
+
+    :param source: Solidity source code as string
+    :param executor: concurrent.futures executor (default: loop default)
+    :return: SourceUnitNode
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, parse_source_unit, source)
+
+
+async def _parse_path(index, path, executor, read_executor):
+    loop = asyncio.get_running_loop()
+    result = ParseResult(index, path)
+    start = time.perf_counter()
+    parse_start = None
+    try:
+        source = await loop.run_in_executor(read_executor, _read_file, path)
+        parse_start = time.perf_counter()
+        result.unit = await loop.run_in_executor(executor, parse_source_unit, source)
+    except Exception as exc:
+        result.error = str(exc)
+    end = time.perf_counter()
+    if parse_start is None:
+        result.read_time = end - start
+    else:
+        result.read_time = parse_start - start
+        result.parse_time = end - parse_start
+    return result
+
+
+async def iter_parse(
+    paths,
+    concurrency=DEFAULT_CONCURRENCY,
+    executor=None,
+    read_executor=None,
+):
+    """
+    Reads and parses files concurrently, yielding results as they finish.
+
+    :param paths: iterable of file paths (consumed lazily)
+    :param concurrency: maximum number of files in flight
+    :param executor: executor for parsing (default: loop default)
+    :param read_executor: executor for file reads (default: loop default)
+    :return: async generator of ParseResult in completion order
+    """
+    iterator = enumerate(paths)
+    in_flight = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(in_flight) < concurrency:
+                item = next(iterator, None)
+                if item is None:
+                    exhausted = True
+                    break
+                index, path = item
+                in_flight.add(
+                    asyncio.ensure_future(
+                        _parse_path(index, path, executor, read_executor)
+                    )
+                )
+            if not in_flight:
+                return
+            done, in_flight = await asyncio.wait(
+                in_flight, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in sorted(done, key=lambda t: t.result().index):
+                yield task.result()
+    finally:
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+
+async def parse_many(
+    paths,
+    concurrency=DEFAULT_CONCURRENCY,
+    executor=None,
+    read_executor=None,
+):
+    """
+    Reads and parses files concurrently.
+
+    :param paths: iterable of file paths
+    :param concurrency: maximum number of files in flight
+    :param executor: executor for parsing (default: loop default)
+    :param read_executor: executor for file reads (default: loop default)
+    :return: list of ParseResult in input order
+    """
+    results = []
+    async for result in iter_parse(paths, concurrency, executor, read_executor):
+        results.append(result)
+    results.sort(key=lambda result: result.index)
+    return results
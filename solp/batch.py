@@ -0,0 +1,280 @@
+# arc42: 5.16 Batch Scheduling
+# Batch jobs over many files are dominated by their slowest tail: if a few
+# multi-megabyte flattened files start last, one worker parses them while
+# all others sit idle. `parse_batch()` schedules by estimated cost instead
+# of input order:
+#
+# 1. Cost estimate: file size by default (one stat call), or any callable
+#    such as `token_estimate` (a quick regex pre-scan without Token
+#    objects).
+# 2. Chunking: files are sorted by descending cost (longest processing time
+#    first). Files at or above the chunk target form a chunk of their own;
+#    smaller files are grouped into chunks of about the target cost, so
+#    per-task overhead does not dominate small files.
+# 3. Dynamic dispatch: chunks wait in one shared queue, largest first. Only
+#    a few chunks per worker are submitted at a time; whenever a chunk
+#    finishes, the next queued chunk is submitted, so an idle worker always
+#    takes over the remaining work instead of waiting on a fixed share.
+#
+# With `transport=TRANSPORT_SHARED_MEMORY` workers do not pickle their ASTs.
+# Each chunk is encoded into a flat node arena in a shared memory segment
+# (see 5.4.5 Node Arena) and only the segment name travels back. The result
+# then maps paths to zero-copy NodeViews; NodeView.materialize() builds
+# regular nodes on demand. BatchResult.close() removes the segments.
+# Segment names are chosen by the parent before a chunk is submitted, so if
+# a worker fails or the executor breaks, parse_batch() still removes every
+# segment that was created but never attached.
+#
+# Each chunk records which worker ran it and for how long. The BatchReport
+# compares the wall time with the total busy time divided by the number of
+# workers, which is the best achievable wall time.
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from solp.lexer.arrays import TOKEN_PATTERN
+from solp.solidity_ast.arena import (
+    ArenaEncoder,
+    SharedArena,
+    segment_name,
+    unlink_shared,
+    write_shared,
+)
+from solp.solidity_parser import parse_source_unit
+
+CHUNKS_PER_WORKER = 8
+PREFETCH_PER_WORKER = 2
+
+TRANSPORT_PICKLE = "pickle"
+TRANSPORT_SHARED_MEMORY = "shared_memory"
+
+
+def file_size(path):
+    return os.path.getsize(path)
+
+
+def token_estimate(path):
+    # Counts regex matches of the array scanner (tokens plus whitespace and
+    # comment runs); much faster than lexing and proportional to parse cost.
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for _ in TOKEN_PATTERN.finditer(f.read()))
+
+
+class BatchReport:
+    # - wall_time: seconds from the first submission to the last result
+    # - busy: worker id -> seconds spent parsing
+    # - chunks: worker id -> number of chunks processed
+    def __init__(self, workers):
+        self.workers = workers
+        self.wall_time = 0.0
+        self.busy = {}
+        self.chunks = {}
+
+    @property
+    def total_busy(self):
+        return sum(self.busy.values())
+
+    @property
+    def ideal_wall_time(self):
+        return self.total_busy / self.workers if self.workers else 0.0
+
+    @property
+    def efficiency(self):
+        # 1.0 means the wall time equals total busy time / workers.
+        return self.ideal_wall_time / self.wall_time if self.wall_time else 1.0
+
+    def utilization(self):
+        # worker id -> fraction of the wall time spent parsing
+        if not self.wall_time:
+            return {worker: 0.0 for worker in self.busy}
+        return {worker: busy / self.wall_time for worker, busy in self.busy.items()}
+
+    def __str__(self):
+        lines = [
+            f"wall {self.wall_time:.3f}s, busy {self.total_busy:.3f}s, "
+            f"ideal {self.ideal_wall_time:.3f}s, efficiency {self.efficiency:.0%}"
+        ]
+        for worker, share in sorted(self.utilization().items()):
+            lines.append(
+                f"  worker {worker}: {share:.0%} ({self.chunks[worker]} chunks)"
+            )
+        return "\n".join(lines)
+
+
+class BatchResult:
+    # `units` holds SourceUnitNodes, or NodeViews for the shared memory
+    # transport; `arenas` the attached shared memory segments.
+    def __init__(self, workers):
+        self.units = {}
+        self.errors = {}
+        self.arenas = []
+        self.report = BatchReport(workers)
+
+    def close(self):
+        # Releases all shared memory segments; NodeViews become invalid,
+        # materialized nodes stay usable.
+        for arena in self.arenas:
+            arena.close()
+        self.arenas = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def plan_chunks(costs, workers, chunk_cost=None):
+    """
+    Groups files into chunks ordered by descending total cost.
+
+    :param costs: dict path -> estimated cost
+    :param workers: number of workers the chunks are planned for
+    :param chunk_cost: target cost per chunk (default: total cost divided by
+        CHUNKS_PER_WORKER chunks per worker)
+    :return: list of (cost, [paths]) tuples, most expensive first
+    """
+    ordered = sorted(costs.items(), key=lambda item: (-item[1], item[0]))
+    if chunk_cost is None:
+        total = sum(costs.values())
+        chunk_cost = max(total / (max(workers, 1) * CHUNKS_PER_WORKER), 1)
+
+    chunks = []
+    current, current_cost = [], 0
+    for path, cost in ordered:
+        if cost >= chunk_cost:
+            chunks.append((cost, [path]))
+            continue
+        current.append(path)
+        current_cost += cost
+        if current_cost >= chunk_cost:
+            chunks.append((current_cost, current))
+            current, current_cost = [], 0
+    if current:
+        chunks.append((current_cost, current))
+    chunks.sort(key=lambda chunk: -chunk[0])
+    return chunks
+
+
+def _parse_chunk(paths, transport=TRANSPORT_PICKLE, name=None):
+    # Runs inside a worker. Returns the worker id, the busy time, the shared
+    # memory segment name (or None) and one (path, unit, error) entry per
+    # file, where unit is the root number inside the segment if one is used.
+    # `name` is the segment name chosen by the parent.
+    start = time.perf_counter()
+    encoder = ArenaEncoder() if transport == TRANSPORT_SHARED_MEMORY else None
+    results = []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                unit = parse_source_unit(f.read())
+        except Exception as exc:
+            results.append((path, None, str(exc)))
+            continue
+        results.append(
+            (path, unit if encoder is None else encoder.add_root(unit), None)
+        )
+    segment = write_shared(encoder, name) if encoder is not None else None
+    worker = f"{os.getpid()}/{threading.get_ident()}"
+    return worker, time.perf_counter() - start, segment, results
+
+
+def parse_batch(
+    paths,
+    max_workers=None,
+    executor=None,
+    cost=file_size,
+    chunk_cost=None,
+    transport=TRANSPORT_PICKLE,
+):
+    """
+    Parses many files with size-aware, dynamically dispatched chunks.
+
+    :param paths: iterable of file paths
+    :param max_workers: number of workers (default: CPUs); also the size of
+        the default process pool
+    :param executor: optional concurrent.futures executor to use instead;
+        pass its worker count as max_workers
+    :param cost: callable estimating the parse cost of a path
+    :param chunk_cost: target cost per chunk (see plan_chunks)
+    :param transport: TRANSPORT_PICKLE or TRANSPORT_SHARED_MEMORY
+    :return: BatchResult with units, errors and a BatchReport
+    """
+    if transport not in (TRANSPORT_PICKLE, TRANSPORT_SHARED_MEMORY):
+        raise Exception(f"Unknown transport: {transport}")
+    workers = max_workers or os.cpu_count() or 1
+    costs = {}
+    for path in paths:
+        try:
+            costs[path] = cost(path)
+        except OSError:
+            costs[path] = 0
+    chunks = plan_chunks(costs, workers, chunk_cost)
+    result = BatchResult(workers)
+    # Names of shared memory segments submitted but not attached yet.
+    pending = set()
+    try:
+        if executor is not None:
+            _dispatch(chunks, executor, workers, transport, result, pending)
+            return result
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            _dispatch(chunks, pool, workers, transport, result, pending)
+    except BaseException:
+        result.close()
+        raise
+    finally:
+        for name in pending:
+            unlink_shared(name)
+    return result
+
+
+def _dispatch(chunks, executor, workers, transport, result, pending):
+    # Keeps a bounded number of chunks in flight and submits the next one
+    # from the shared queue as soon as any chunk completes. If a chunk
+    # fails, the chunks still in flight are cancelled or awaited so that no
+    # worker creates a segment after parse_batch() cleaned up.
+    report = result.report
+    queue = iter([paths for _, paths in chunks])
+    limit = workers * PREFETCH_PER_WORKER
+    running = set()
+    start = time.perf_counter()
+    try:
+        while True:
+            while len(running) < limit:
+                paths = next(queue, None)
+                if paths is None:
+                    break
+                name = None
+                if transport == TRANSPORT_SHARED_MEMORY:
+                    name = segment_name()
+                    pending.add(name)
+                running.add(executor.submit(_parse_chunk, paths, transport, name))
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                _collect(future, result, pending)
+    except BaseException:
+        for future in running:
+            future.cancel()
+        wait(running)
+        raise
+    report.wall_time = time.perf_counter() - start
+
+
+def _collect(future, result, pending):
+    report = result.report
+    worker, busy, segment, results = future.result()
+    report.busy[worker] = report.busy.get(worker, 0.0) + busy
+    report.chunks[worker] = report.chunks.get(worker, 0) + 1
+    arena = None
+    if segment is not None:
+        arena = SharedArena(segment)
+        result.arenas.append(arena)
+        pending.discard(segment)
+    for path, unit, error in results:
+        if error is not None:
+            result.errors[path] = error
+        else:
+            result.units[path] = unit if arena is None else arena.root(unit)
@@ -0,0 +1,356 @@
+# arc42: 5.17 Binder
+# Resolves identifier uses in function bodies to their declarations in one
+# traversal of a SourceUnitNode. Scopes are nested dictionaries:
+#
+#   source unit  contracts, interfaces, libraries, imported symbols
+#   contract     state variables and functions (then base contracts
+#                declared in the same unit, in `is` order)
+#   function     parameters and named return values
+#   block        if/else branches, loop bodies, for-loop headers
+#   declaration  one local variable, from its declaration statement to the
+#                end of the enclosing block
+#
+# A local declaration opens its own scope for the statements after it
+# (C99-style scoping, as in Solidity >= 0.5): uses before the declaration,
+# and its own initializer, resolve outwards. Because every use keeps the
+# scope it was found in, later re-resolution (see rebind) cannot make a use
+# see a local declared after it.
+#
+# A lookup walks from the innermost scope outwards; each step is a dict
+# lookup, so resolution costs O(nesting depth).
+#
+# Results are kept in side tables instead of being written into the AST:
+# nodes may be shared between several places (5.5.2 Hash-Consing Factory),
+# so a node cannot carry the declaration of one particular use. Every use
+# is a Use object naming the node and field it was found in. Uses are
+# indexed by the function or constructor that contains them and by the
+# declaration they resolve to.
+#
+# `rebind(old, new)` replaces the bindings of one function after an edit:
+# only that function body is traversed again, plus the uses elsewhere that
+# referred to its old name or were waiting for its new one.
+from solp.lexer.definitions.keywords import KEYWORD_SET
+from solp.solidity_ast.nodes import (
+    CallNode,
+    ConstructorNode,
+    ContractNode,
+    ForNode,
+    FunctionNode,
+    IfNode,
+    ImportNode,
+    ReturnNode,
+    StatementNode,
+    VariableNode,
+    WhileNode,
+)
+
+DECL_CONTRACT = "contract"
+DECL_IMPORT = "import"
+DECL_STATE = "state"
+DECL_FUNCTION = "function"
+DECL_PARAMETER = "parameter"
+DECL_RETURN = "return"
+DECL_LOCAL = "local"
+
+SCOPE_SOURCE_UNIT = "source_unit"
+SCOPE_CONTRACT = "contract"
+SCOPE_FUNCTION = "function"
+SCOPE_BLOCK = "block"
+SCOPE_DECLARATION = "declaration"
+
+STATEMENT_DECLARATION = "declaration"
+
+
+class Declaration:
+    # `overloads` lists every function node sharing this name in a contract.
+    def __init__(self, name, kind, node, scope):
+        self.name = name
+        self.kind = kind
+        self.node = node
+        self.scope = scope
+        self.overloads = [node] if kind == DECL_FUNCTION else []
+
+    def __repr__(self):
+        return f"Declaration({self.kind} {self.name})"
+
+
+class Scope:
+    def __init__(self, kind, node=None, parent=None):
+        self.kind = kind
+        self.node = node
+        self.parent = parent
+        self.symbols = {}
+        self.bases = []
+
+    def define(self, name, kind, node):
+        existing = self.symbols.get(name)
+        if existing is not None:
+            if kind == DECL_FUNCTION and existing.kind == DECL_FUNCTION:
+                existing.overloads.append(node)
+            return existing
+        declaration = self.symbols[name] = Declaration(name, kind, node, self)
+        return declaration
+
+    def lookup(self, name):
+        scope = self
+        while scope is not None:
+            declaration = scope.symbols.get(name)
+            if declaration is None and scope.bases:
+                declaration = _lookup_bases(scope, name, set())
+            if declaration is not None:
+                return declaration
+            scope = scope.parent
+        return None
+
+    def lookup_member(self, name, bases_only=False):
+        # Looks a name up in this scope and its bases, without parents.
+        if not bases_only:
+            declaration = self.symbols.get(name)
+            if declaration is not None:
+                return declaration
+        return _lookup_bases(self, name, set())
+
+
+def _lookup_bases(scope, name, seen):
+    for base in scope.bases:
+        if id(base) in seen:
+            continue
+        seen.add(id(base))
+        declaration = base.symbols.get(name) or _lookup_bases(base, name, seen)
+        if declaration is not None:
+            return declaration
+    return None
+
+
+class Use:
+    # One identifier occurrence: `node.field` (or `node.field[index]` for
+    # list fields) refers to `name`, which resolved to `declaration` (None
+    # if unresolved) from `scope`.
+    def __init__(self, name, node, field, index, scope):
+        self.name = name
+        self.node = node
+        self.field = field
+        self.index = index
+        self.scope = scope
+        self.declaration = None
+
+    def __repr__(self):
+        target = self.declaration.kind if self.declaration else "unresolved"
+        return f"Use({self.name} -> {target})"
+
+
+class Bindings:
+    def __init__(self, unit):
+        # arc42: 5.17.1 Initialization
+        # - scope: the source unit scope
+        # - contract_scopes / function_scopes: node -> Scope
+        # - function_uses: function or constructor node -> list of Use
+        self.unit = unit
+        self.scope = Scope(SCOPE_SOURCE_UNIT, unit)
+        self.contract_scopes = {}
+        self.function_scopes = {}
+        self.function_uses = {}
+        self._references = {}
+        self._unresolved = {}
+
+    def uses_in(self, function):
+        return self.function_uses.get(function, [])
+
+    def references(self, declaration):
+        return list(self._references.get(declaration, ()))
+
+    def unresolved(self):
+        return [use for uses in self._unresolved.values() for use in uses]
+
+    def scope_of(self, function):
+        return self.function_scopes.get(function)
+
+    def bind(self):
+        # arc42: 5.17.2 Single Pass
+        # Defines all top-level and contract-level names first (they may be
+        # used before their declaration), then binds every function body.
+        contracts = []
+        for node in self.unit.children:
+            if isinstance(node, ContractNode):
+                self.scope.define(node.name, DECL_CONTRACT, node)
+                contracts.append(node)
+            elif isinstance(node, ImportNode):
+                for name, alias in node.symbols:
+                    self.scope.define(alias or name, DECL_IMPORT, node)
+                if node.alias:
+                    self.scope.define(node.alias, DECL_IMPORT, node)
+
+        for contract in contracts:
+            scope = self.contract_scopes[contract] = Scope(
+                SCOPE_CONTRACT, contract, self.scope
+            )
+            for member in contract.members:
+                if isinstance(member, VariableNode):
+                    scope.define(member.name, DECL_STATE, member)
+                elif isinstance(member, FunctionNode):
+                    scope.define(member.name, DECL_FUNCTION, member)
+
+        for contract in contracts:
+            scope = self.contract_scopes[contract]
+            for base in contract.bases:
+                declaration = self.scope.symbols.get(base)
+                if declaration is not None and declaration.kind == DECL_CONTRACT:
+                    scope.bases.append(self.contract_scopes[declaration.node])
+            for member in contract.members:
+                if isinstance(member, (FunctionNode, ConstructorNode)):
+                    self._bind_function(member, scope)
+        return self
+
+    def rebind(self, old, new=None):
+        # arc42: 5.17.3 Incremental Rebinding
+        # Replaces `old` by `new` (default: rebinds `old` in place) in the
+        # bindings of its contract. The contract's member list is expected
+        # to contain `new` already; only bindings are updated here. Uses of
+        # the removed name and all uses of the new name in the contract and
+        # its derived contracts are resolved again: the new function may
+        # shadow an inherited or source-unit declaration they were bound to.
+        new = old if new is None else new
+        contract_scope = self.function_scopes[old].parent
+        for use in self.function_uses.pop(old):
+            self._forget(use)
+        del self.function_scopes[old]
+
+        stale = []
+        if isinstance(old, FunctionNode):
+            declaration = contract_scope.symbols.get(old.name)
+            if declaration is not None and old in declaration.overloads:
+                declaration.overloads.remove(old)
+                if declaration.node is old and declaration.overloads:
+                    declaration.node = declaration.overloads[0]
+                elif not declaration.overloads:
+                    del contract_scope.symbols[old.name]
+                    stale = self.references(declaration)
+        if isinstance(new, FunctionNode):
+            contract_scope.define(new.name, DECL_FUNCTION, new)
+            stale.extend(self._uses_named(new.name, contract_scope))
+
+        self._bind_function(new, contract_scope)
+        for use in dict.fromkeys(stale):
+            if use.node is not new:
+                self._forget(use)
+                self._resolve(use)
+
+    def _uses_named(self, name, contract_scope):
+        # Uses of `name` in the functions of `contract_scope` and of every
+        # contract that inherits from it, directly or indirectly.
+        affected = {contract_scope}
+        changed = True
+        while changed:
+            changed = False
+            for scope in self.contract_scopes.values():
+                if scope not in affected and any(b in affected for b in scope.bases):
+                    affected.add(scope)
+                    changed = True
+        return [
+            use
+            for function, uses in self.function_uses.items()
+            if self.function_scopes[function].parent in affected
+            for use in uses
+            if use.name == name
+        ]
+
+    def _bind_function(self, function, contract_scope):
+        scope = self.function_scopes[function] = Scope(
+            SCOPE_FUNCTION, function, contract_scope
+        )
+        for parameter in function.parameters:
+            if parameter.name:
+                scope.define(parameter.name, DECL_PARAMETER, parameter)
+        for returned in getattr(function, "returns", []):
+            if returned.name:
+                scope.define(returned.name, DECL_RETURN, returned)
+        uses = self.function_uses[function] = []
+        self._bind_block(function.body or [], scope, uses)
+
+    def _bind_block(self, statements, scope, uses):
+        for statement in statements:
+            scope = self._bind_statement(statement, scope, uses)
+
+    def _bind_statement(self, statement, scope, uses):
+        # Returns the scope for the statements that follow `statement`.
+        if isinstance(statement, IfNode):
+            self._bind_expression(statement, "condition", None, scope, uses)
+            self._bind_block(
+                statement.then_block, Scope(SCOPE_BLOCK, statement, scope), uses
+            )
+            if statement.else_block:
+                else_scope = Scope(SCOPE_BLOCK, statement, scope)
+                self._bind_block(statement.else_block, else_scope, uses)
+        elif isinstance(statement, WhileNode):
+            self._bind_expression(statement, "condition", None, scope, uses)
+            self._bind_block(statement.body, Scope(SCOPE_BLOCK, statement, scope), uses)
+        elif isinstance(statement, ForNode):
+            header = Scope(SCOPE_BLOCK, statement, scope)
+            if statement.init is not None:
+                header = self._bind_statement(statement.init, header, uses)
+            self._bind_expression(statement, "condition", None, header, uses)
+            self._bind_expression(statement, "increment", None, header, uses)
+            self._bind_block(
+                statement.body, Scope(SCOPE_BLOCK, statement, header), uses
+            )
+        elif isinstance(statement, ReturnNode):
+            self._bind_expression(statement, "value", None, scope, uses)
+        elif isinstance(statement, StatementNode):
+            if statement.type == STATEMENT_DECLARATION:
+                if statement.value is not None:
+                    self._bind_expression(statement, "value", None, scope, uses)
+                scope = Scope(SCOPE_DECLARATION, statement, scope)
+                scope.define(statement.name, DECL_LOCAL, statement)
+                return scope
+            # assignment: left, right; expression: expr; emit: event and
+            # arguments; revert/assert: arguments
+            fields = vars(statement)
+            for field in ("left", "right", "expr", "event"):
+                if field in fields:
+                    self._bind_expression(statement, field, None, scope, uses)
+            if "arguments" in fields:
+                self._bind_list(statement, "arguments", scope, uses)
+        return scope
+
+    def _bind_list(self, node, field, scope, uses):
+        for index in range(len(getattr(node, field))):
+            self._bind_expression(node, field, index, scope, uses)
+
+    def _bind_expression(self, node, field, index, scope, uses):
+        value = getattr(node, field)
+        if index is not None:
+            value = value[index]
+        if isinstance(value, CallNode):
+            self._bind_expression(value, "function", None, scope, uses)
+            self._bind_list(value, "arguments", scope, uses)
+        elif isinstance(value, str):
+            # Only the first segment of a dotted name is a scope lookup;
+            # the rest are member accesses.
+            name = value.split(".", 1)[0]
+            if name and name not in KEYWORD_SET:
+                use = Use(name, node, field, index, scope)
+                uses.append(use)
+                self._resolve(use)
+
+    def _resolve(self, use):
+        use.declaration = use.scope.lookup(use.name)
+        if use.declaration is None:
+            self._unresolved.setdefault(use.name, {})[use] = None
+        else:
+            self._references.setdefault(use.declaration, {})[use] = None
+
+    def _forget(self, use):
+        if use.declaration is None:
+            self._unresolved.get(use.name, {}).pop(use, None)
+        else:
+            self._references.get(use.declaration, {}).pop(use, None)
+
+
+def bind(unit):
+    """
+    Resolves identifier uses in all function bodies of a source unit.
+
+    :param unit: SourceUnitNode from parse_source_unit()
+    :return: Bindings with scopes, uses and reference indexes
+    """
+    return Bindings(unit).bind()
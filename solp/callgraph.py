@@ -0,0 +1,187 @@
+# arc42: 5.19 Call Graph
+# Intra-contract call graph over the functions of a source unit, built on
+# the scopes of the binder (5.17).
+#
+# Every CallNode in a function or constructor body becomes a CallSite.
+# Its callee name is resolved from the caller's contract scope (own
+# members, then base contracts):
+#
+#   f(...)          f in the caller's contract or its bases
+#   this.f(...)     same, explicitly through `this`
+#   super.f(...)    f in the base contracts only
+#
+# Other dotted calls (`token.transfer(...)`) and builtins are external and
+# produce call sites without targets. Overloads are narrowed by argument
+# count; if none matches, all overloads are kept.
+#
+# Call sites are indexed by caller (outgoing edges) and by callee name, so
+# update_function() replaces the outgoing edges of one re-parsed function
+# and re-resolves only the call sites that name it. Transitive closures are
+# memoized per function; an update drops only the memoized closures that
+# contain the changed function.
+from solp.binder import DECL_FUNCTION, bind
+from solp.lexer.definitions.keywords import KEYWORD_SET
+from solp.solidity_ast.nodes import CallNode
+from solp.solidity_ast.traversal import walk
+
+THIS_PREFIX = "this."
+SUPER_PREFIX = "super."
+
+
+class CallSite:
+    def __init__(self, caller, call, name, via_super=False):
+        self.caller = caller
+        self.call = call
+        self.name = name
+        self.via_super = via_super
+        self.targets = []
+
+    def __repr__(self):
+        return f"CallSite({self.name}, {len(self.targets)} targets)"
+
+
+def _callee_name(call):
+    # Returns (name, via_super) for intra-contract calls, else None.
+    function = call.function
+    if not isinstance(function, str):
+        return None
+    if function.startswith(THIS_PREFIX):
+        function = function[len(THIS_PREFIX) :]
+    elif function.startswith(SUPER_PREFIX):
+        return function[len(SUPER_PREFIX) :], True
+    if "." in function or function in KEYWORD_SET:
+        return None
+    return function, False
+
+
+class CallGraph:
+    def __init__(self, bindings):
+        # arc42: 5.19.1 Initialization
+        # - sites: caller -> list of CallSite (outgoing edges)
+        # - sites_by_name: callee name -> {CallSite: None} (ordered set)
+        # - external: caller -> list of CallSite without intra-contract target
+        self.bindings = bindings
+        self.sites = {}
+        self.sites_by_name = {}
+        self.external = {}
+        self._closures = {}
+        for function in bindings.function_scopes:
+            self._add_function(function)
+
+    def call_sites(self, function):
+        return self.sites.get(function, [])
+
+    def callees(self, function):
+        # Distinct direct callees in call order.
+        result = {}
+        for site in self.sites.get(function, ()):
+            for target in site.targets:
+                result[target] = None
+        return list(result)
+
+    def callers(self, function):
+        # Distinct direct callers, found through the callee name index.
+        name = getattr(function, "name", None)
+        result = {}
+        for site in self.sites_by_name.get(name, ()):
+            if function in site.targets:
+                result[site.caller] = None
+        return list(result)
+
+    def reachable(self, function):
+        # arc42: 5.19.2 Transitive Closure
+        # All functions reachable from `function` through one or more calls
+        # (the function itself only if it is part of a cycle). The result
+        # is memoized; memoized closures of callees are reused while
+        # traversing.
+        closure = self._closures.get(function)
+        if closure is not None:
+            return closure
+        seen = set()
+        stack = list(self.callees(function))
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            known = self._closures.get(current)
+            if known is not None:
+                seen |= known
+                continue
+            stack.extend(self.callees(current))
+        closure = self._closures[function] = frozenset(seen)
+        return closure
+
+    def calls(self, caller, callee):
+        # True if `caller` reaches `callee` directly or transitively.
+        return callee in self.reachable(caller)
+
+    def update_function(self, old, new=None):
+        # arc42: 5.19.3 Incremental Updates
+        # Rebinds one re-parsed function (see Bindings.rebind) and replaces
+        # its outgoing call sites. Call sites elsewhere that name the old or
+        # new function are resolved again, since overload sets may change.
+        new = old if new is None else new
+        self._invalidate(old)
+        for site in self.sites.pop(old, ()):
+            self.sites_by_name[site.name].pop(site, None)
+        self.external.pop(old, None)
+        self.bindings.rebind(old, new)
+        self._add_function(new)
+        for name in {getattr(old, "name", None), getattr(new, "name", None)}:
+            for site in list(self.sites_by_name.get(name, ())):
+                if site.caller is not new:
+                    self._invalidate(site.caller)
+                    self._resolve(site)
+
+    def _invalidate(self, function):
+        # Drops every memoized closure that contains or starts at `function`.
+        stale = [
+            start
+            for start, closure in self._closures.items()
+            if start is function or function in closure
+        ]
+        for start in stale:
+            del self._closures[start]
+
+    def _add_function(self, function):
+        sites = self.sites[function] = []
+        external = self.external[function] = []
+        for node in _walk_body(function):
+            if not isinstance(node, CallNode):
+                continue
+            callee = _callee_name(node)
+            if callee is None:
+                external.append(CallSite(function, node, node.function))
+                continue
+            site = CallSite(function, node, *callee)
+            self._resolve(site)
+            sites.append(site)
+            self.sites_by_name.setdefault(site.name, {})[site] = None
+
+    def _resolve(self, site):
+        contract_scope = self.bindings.function_scopes[site.caller].parent
+        declaration = contract_scope.lookup_member(site.name, site.via_super)
+        if declaration is None or declaration.kind != DECL_FUNCTION:
+            site.targets = []
+            return
+        count = len(site.call.arguments)
+        matching = [f for f in declaration.overloads if len(f.parameters) == count]
+        site.targets = matching or list(declaration.overloads)
+
+
+def _walk_body(function):
+    # Yields all nodes in the body of a function or constructor.
+    for statement in function.body or []:
+        yield from walk(statement)
+
+
+def build_call_graph(unit, bindings=None):
+    """
+    Builds the intra-contract call graph of a source unit.
+
+    :param unit: SourceUnitNode from parse_source_unit()
+    :param bindings: Bindings of `unit` (computed with bind() if omitted)
+    :return: CallGraph
+    """
+    return CallGraph(bindings if bindings is not None else bind(unit))
@@ -0,0 +1,320 @@
+# arc42: 5.18 Control-Flow Graphs
+# Lowers the body of a FunctionNode or ConstructorNode into basic blocks.
+#
+# - Block 0 is the entry block, block 1 the (empty) exit block.
+# - A block holds the statements executed in order. A branch or loop header
+#   ends with the IfNode, WhileNode or ForNode whose condition it evaluates;
+#   the increment of a for-loop gets a block of its own that holds the
+#   increment expression.
+# - `return` and `revert(...)` end their block with an edge to the exit
+#   block, `break` and `continue` with an edge to the loop exit or loop
+#   header (for-loops: the increment block). Statements after them start a
+#   block without predecessors, so dead code stays visible.
+# - require/assert are treated as ordinary statements.
+#
+# Edges are stored in compressed sparse row form: `successors_of` holds
+# all successor block numbers, `successor_offsets[b]` and
+# `successor_offsets[b + 1]` delimit those of block b. Predecessors are
+# stored the same way. Both are `array("i")`, so a graph with thousands of
+# blocks costs a few kilobytes instead of one list object per block.
+from array import array
+
+from solp.lexer.token_types import RULE_BREAK, RULE_CONTINUE, RULE_REVERT
+from solp.solidity_ast.nodes import ForNode, IfNode, ReturnNode, WhileNode
+
+ENTRY = 0
+EXIT = 1
+NO_BLOCK = -1
+
+
+class ControlFlowGraph:
+    def __init__(self, function, blocks, edges):
+        # arc42: 5.18.1 Compact Adjacency
+        # `edges` is the list of (source, target) pairs collected while
+        # lowering; it is compressed into the CSR arrays here and dropped.
+        self.function = function
+        self.blocks = blocks
+        self.successor_offsets, self.successors_of = _compress(len(blocks), edges, 0)
+        self.predecessor_offsets, self.predecessors_of = _compress(
+            len(blocks), edges, 1
+        )
+        self._reachable = None
+        self._dominators = None
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def successors(self, block):
+        start, end = self.successor_offsets[block], self.successor_offsets[block + 1]
+        return self.successors_of[start:end]
+
+    def predecessors(self, block):
+        start = self.predecessor_offsets[block]
+        end = self.predecessor_offsets[block + 1]
+        return self.predecessors_of[start:end]
+
+    def edge_count(self):
+        return len(self.successors_of)
+
+    def reachable(self):
+        # arc42: 5.18.2 Reachability
+        # bytearray with 1 for every block reachable from the entry block.
+        if self._reachable is None:
+            seen = bytearray(len(self.blocks))
+            seen[ENTRY] = 1
+            stack = [ENTRY]
+            offsets, targets = self.successor_offsets, self.successors_of
+            while stack:
+                block = stack.pop()
+                for i in range(offsets[block], offsets[block + 1]):
+                    target = targets[i]
+                    if not seen[target]:
+                        seen[target] = 1
+                        stack.append(target)
+            self._reachable = seen
+        return self._reachable
+
+    def is_reachable(self, block):
+        return bool(self.reachable()[block])
+
+    def unreachable_blocks(self):
+        # Non-empty blocks that cannot be reached from the entry block.
+        reachable = self.reachable()
+        return [
+            block
+            for block, statements in enumerate(self.blocks)
+            if statements and not reachable[block]
+        ]
+
+    def dominators(self):
+        # arc42: 5.18.3 Dominators
+        # Immediate dominator of every block (NO_BLOCK if unreachable), by
+        # the Lengauer-Tarjan algorithm with path compression over a
+        # depth-first numbering, which stays near-linear on long functions
+        # where the iterative fixpoint would walk long dominator chains.
+        # The entry block is its own dominator.
+        if self._dominators is not None:
+            return self._dominators
+        vertex, parent = self._preorder()
+        count = len(vertex)
+        number = [NO_BLOCK] * len(self.blocks)
+        for index, block in enumerate(vertex):
+            number[block] = index
+        semi = list(range(count))
+        label = list(range(count))
+        ancestor = [NO_BLOCK] * count
+        dom = [0] * count
+        bucket = [[] for _ in range(count)]
+        offsets = self.predecessor_offsets.tolist()
+        sources = self.predecessors_of.tolist()
+
+        def evaluate(v):
+            if ancestor[v] == NO_BLOCK:
+                return v
+            path = []
+            while ancestor[ancestor[v]] != NO_BLOCK:
+                path.append(v)
+                v = ancestor[v]
+            for x in reversed(path):
+                a = ancestor[x]
+                if semi[label[a]] < semi[label[x]]:
+                    label[x] = label[a]
+                ancestor[x] = ancestor[a]
+            return label[path[0]] if path else label[v]
+
+        for w in range(count - 1, 0, -1):
+            block = vertex[w]
+            for i in range(offsets[block], offsets[block + 1]):
+                v = number[sources[i]]
+                if v == NO_BLOCK:
+                    continue
+                u = evaluate(v)
+                if semi[u] < semi[w]:
+                    semi[w] = semi[u]
+            bucket[semi[w]].append(w)
+            p = parent[w]
+            ancestor[w] = p
+            for v in bucket[p]:
+                u = evaluate(v)
+                dom[v] = u if semi[u] < semi[v] else p
+            bucket[p] = []
+        idom = array("i", [NO_BLOCK]) * len(self.blocks)
+        idom[ENTRY] = ENTRY
+        for w in range(1, count):
+            if dom[w] != semi[w]:
+                dom[w] = dom[dom[w]]
+            idom[vertex[w]] = vertex[dom[w]]
+        self._dominators = idom
+        return idom
+
+    def dominates(self, a, b):
+        # True if every path from the entry block to b passes through a.
+        idom = self.dominators()
+        if idom[b] == NO_BLOCK:
+            return False
+        while b != a:
+            if b == ENTRY:
+                return False
+            b = idom[b]
+        return True
+
+    def _preorder(self):
+        # Iterative depth-first preorder of the reachable blocks and the
+        # preorder number of every block's depth-first tree parent.
+        offsets, targets = self.successor_offsets, self.successors_of
+        seen = bytearray(len(self.blocks))
+        seen[ENTRY] = 1
+        vertex = [ENTRY]
+        parent = [0]
+        stack = [(ENTRY, 0, offsets[ENTRY])]
+        while stack:
+            block, index, position = stack[-1]
+            if position < offsets[block + 1]:
+                stack[-1] = (block, index, position + 1)
+                target = targets[position]
+                if not seen[target]:
+                    seen[target] = 1
+                    stack.append((target, len(vertex), offsets[target]))
+                    vertex.append(target)
+                    parent.append(index)
+            else:
+                stack.pop()
+        return vertex, parent
+
+
+def _compress(count, edges, side):
+    # CSR arrays of the edges grouped by their source (side 0) or target
+    # (side 1), keeping insertion order within each group.
+    offsets = array("i", [0]) * (count + 1)
+    for edge in edges:
+        offsets[edge[side] + 1] += 1
+    for block in range(count):
+        offsets[block + 1] += offsets[block]
+    fill = array("i", offsets)
+    values = array("i", [0]) * len(edges)
+    other = 1 - side
+    for edge in edges:
+        position = fill[edge[side]]
+        values[position] = edge[other]
+        fill[edge[side]] = position + 1
+    return offsets, values
+
+
+class _Builder:
+    def __init__(self):
+        self.blocks = [[], []]
+        self.edges = []
+
+    def new_block(self):
+        self.blocks.append([])
+        return len(self.blocks) - 1
+
+    def edge(self, source, target):
+        self.edges.append((source, target))
+
+    def lower(self, statements, current, loop):
+        # Appends `statements` starting in block `current` and returns the
+        # block control falls out of, or None after a jump. `loop` is the
+        # (continue target, break target) pair of the innermost loop.
+        for statement in statements:
+            if current is None:
+                current = self.new_block()
+            if isinstance(statement, IfNode):
+                current = self._lower_if(statement, current, loop)
+            elif isinstance(statement, WhileNode):
+                current = self._lower_while(statement, current)
+            elif isinstance(statement, ForNode):
+                current = self._lower_for(statement, current)
+            else:
+                self.blocks[current].append(statement)
+                target = self._jump_target(statement, loop)
+                if target is not None:
+                    self.edge(current, target)
+                    current = None
+        return current
+
+    def _jump_target(self, statement, loop):
+        if isinstance(statement, ReturnNode):
+            return EXIT
+        kind = getattr(statement, "type", None)
+        if kind == RULE_REVERT:
+            return EXIT
+        if kind == RULE_CONTINUE and loop is not None:
+            return loop[0]
+        if kind == RULE_BREAK and loop is not None:
+            return loop[1]
+        return None
+
+    def _lower_if(self, statement, current, loop):
+        self.blocks[current].append(statement)
+        join = None
+        for branch in (statement.then_block, statement.else_block):
+            if branch is None:
+                join = self._join(join, current)
+                continue
+            start = self.new_block()
+            self.edge(current, start)
+            end = self.lower(branch, start, loop)
+            if end is not None:
+                join = self._join(join, end)
+        return join
+
+    def _join(self, join, source):
+        if join is None:
+            join = self.new_block()
+        self.edge(source, join)
+        return join
+
+    def _header(self, current):
+        # Loop headers are jump targets and need a block of their own; an
+        # empty block (e.g. the join after an if) is reused as it is.
+        if current != ENTRY and not self.blocks[current]:
+            return current
+        header = self.new_block()
+        self.edge(current, header)
+        return header
+
+    def _lower_while(self, statement, current):
+        header = self._header(current)
+        self.blocks[header].append(statement)
+        body = self.new_block()
+        after = self.new_block()
+        self.edge(header, body)
+        self.edge(header, after)
+        end = self.lower(statement.body, body, (header, after))
+        if end is not None:
+            self.edge(end, header)
+        return after
+
+    def _lower_for(self, statement, current):
+        if statement.init is not None:
+            current = self.lower([statement.init], current, None)
+        header = self._header(current)
+        self.blocks[header].append(statement)
+        body = self.new_block()
+        increment = self.new_block()
+        after = self.new_block()
+        self.edge(header, body)
+        if statement.condition is not None:
+            self.edge(header, after)
+        if statement.increment is not None:
+            self.blocks[increment].append(statement.increment)
+        end = self.lower(statement.body, body, (increment, after))
+        if end is not None:
+            self.edge(end, increment)
+        self.edge(increment, header)
+        return after
+
+
+def build_cfg(function):
+    """
+    Lowers the body of a function or constructor into a control-flow graph.
+
+    :param function: FunctionNode or ConstructorNode
+    :return: ControlFlowGraph with block 0 as entry and block 1 as exit
+    """
+    builder = _Builder()
+    end = builder.lower(function.body or [], ENTRY, None)
+    if end is not None:
+        builder.edge(end, EXIT)
+    return ControlFlowGraph(function, builder.blocks, builder.edges)
@@ -0,0 +1,105 @@
+# arc42: 5.10 Command Line Interface
+# `solp <command>` entry point. Each subcommand registers its own argparse
+# parser and a handler taking the parsed arguments. Handlers import their
+# modules on first use: every `solp` invocation is a short-lived process,
+# and only the chosen subcommand should pay for the parser, worker pools or
+# socket servers.
+import argparse
+import json
+import sys
+
+# solp.metrics FORMAT_CSV and FORMAT_JSONL, spelled out so that building
+# the argument parser does not import solp.metrics.
+METRICS_FORMATS = ("csv", "jsonl")
+
+
+def _print_event(event):
+    line = f"{event.kind} {event.path}"
+    if event.error:
+        line += f": {event.error}"
+    print(line, flush=True)
+
+
+def _run_watch(args):
+    from solp.watch import watch
+
+    try:
+        watch(args.root, _print_event, args.interval, args.index)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _run_serve(args):
+    from solp.server import serve_socket, serve_stdio
+
+    try:
+        if args.socket:
+            serve_socket(args.socket)
+        else:
+            serve_stdio()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _print_error(path, message):
+    print(f"error {path}: {message}", file=sys.stderr, flush=True)
+
+
+def _run_metrics(args):
+    from solp.metrics import MetricsWriter, corpus_metrics, iter_source_files
+
+    writer = MetricsWriter(sys.stdout, args.format)
+    summary = corpus_metrics(
+        iter_source_files(args.root),
+        writer,
+        max_workers=args.workers,
+        on_error=_print_error,
+    )
+    print(json.dumps(summary.as_dict()), file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="solp")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    watch_cmd = commands.add_parser(
+        "watch", help="poll a directory and re-parse changed .sol files"
+    )
+    watch_cmd.add_argument("root", help="directory to watch")
+    watch_cmd.add_argument(
+        "--interval", type=float, default=0.5, help="seconds between polls"
+    )
+    watch_cmd.add_argument("--index", help="JSON file persisting the file index")
+    watch_cmd.set_defaults(handler=_run_watch)
+
+    serve_cmd = commands.add_parser(
+        "serve", help="answer JSON-RPC parse requests over stdio or a socket"
+    )
+    serve_cmd.add_argument("--socket", help="listen on this Unix socket path")
+    serve_cmd.set_defaults(handler=_run_serve)
+
+    metrics_cmd = commands.add_parser(
+        "metrics", help="stream per-function complexity metrics of a directory"
+    )
+    metrics_cmd.add_argument("root", help="directory with .sol files")
+    metrics_cmd.add_argument(
+        "--format", choices=METRICS_FORMATS, default=METRICS_FORMATS[0]
+    )
+    metrics_cmd.add_argument(
+        "--workers", type=int, help="parse in this many worker processes"
+    )
+    metrics_cmd.set_defaults(handler=_run_metrics)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# arc42: 5.13 Token Clone Detection
+# Finds copy-pasted code across a corpus in near-linear time instead of
+# comparing ASTs pairwise.
+#
+# 1. Normalization: the solp token stream is abstracted so renamed copies
+#    still match. Identifiers, numbers and strings are replaced by their
+#    kind; keywords, operators and symbols keep their value.
+# 2. Fingerprinting: a Rabin–Karp rolling hash is computed over every
+#    window of k normalized tokens, updating in O(1) per token.
+# 3. Bucketing: a hash index maps every window hash to its occurrences.
+#    A new file only looks up its own windows, so adding a file costs time
+#    proportional to its length (plus the size of the matched buckets).
+#    Hash hits are verified token by token to rule out collisions.
+# 4. Extension: consecutive matching windows on the same diagonal are
+#    merged into one maximal clone pair.
+#
+# Files can be added incrementally; each call reports the new pairs.
+import os
+
+from solp.lexer.lexer import Lexer
+from solp.lexer.token_types import IDENTIFIER, NUMBER, STRING
+
+HASH_BASE = 1_000_003
+HASH_MODULUS = (1 << 61) - 1
+ABSTRACTED_KINDS = {IDENTIFIER: "$id", NUMBER: "$num", STRING: "$str"}
+
+
+class ClonePair:
+    # Token spans are half-open [start, end) indexes into each file's token
+    # stream; `lines` holds the (first, last) source line of each side.
+    def __init__(self, path_a, span_a, lines_a, path_b, span_b, lines_b):
+        self.path_a = path_a
+        self.span_a = span_a
+        self.lines_a = lines_a
+        self.path_b = path_b
+        self.span_b = span_b
+        self.lines_b = lines_b
+
+    @property
+    def length(self):
+        return self.span_a[1] - self.span_a[0]
+
+    def __repr__(self):
+        return (
+            f"ClonePair({self.path_a!r} {self.span_a}, "
+            f"{self.path_b!r} {self.span_b})"
+        )
+
+
+class _Run:
+    __slots__ = ("file_id", "start", "other_start", "last")
+
+    def __init__(self, file_id, start, other_start):
+        self.file_id = file_id
+        self.start = start
+        self.other_start = other_start
+        self.last = start
+
+
+class CloneDetector:
+    def __init__(self, window=30, max_bucket=64):
+        # arc42: 5.13.1 Initialization
+        # - window: k, the minimum clone length in tokens
+        # - max_bucket: cap on indexed occurrences per hash, which bounds
+        #   the work spent on ubiquitous boilerplate windows
+        self.window = window
+        self.max_bucket = max_bucket
+        self.paths = []
+        self.codes = []
+        self.lines = []
+        self.index = {}
+        self.pairs = []
+        self._symbols = {}
+        self._high_power = pow(HASH_BASE, window - 1, HASH_MODULUS)
+
+    def normalize(self, tokens):
+        # Maps tokens to small integers after kind abstraction.
+        symbols = self._symbols
+        codes = []
+        for tok in tokens:
+            key = ABSTRACTED_KINDS.get(tok.type, tok.value)
+            code = symbols.get(key)
+            if code is None:
+                code = symbols[key] = len(symbols) + 1
+            codes.append(code)
+        return codes
+
+    def add_file(self, path, source):
+        # arc42: 5.13.2 Incremental Addition
+        # Tokenizes, fingerprints and indexes one file. Returns the clone
+        # pairs between this file and all previously added files (including
+        # non-overlapping clones within the file itself).
+        tokens = Lexer(source).tokenize()
+        codes = self.normalize(tokens)
+        file_id = len(self.paths)
+        self.paths.append(path)
+        self.codes.append(codes)
+        self.lines.append([tok.line for tok in tokens])
+
+        runs = {}
+        finished = []
+        for position, fingerprint in enumerate(self._fingerprints(codes)):
+            bucket = self.index.get(fingerprint)
+            if bucket is not None:
+                for other_id, other_position in bucket:
+                    if other_id == file_id and other_position > position - self.window:
+                        continue
+                    if not self._same(other_id, other_position, codes, position):
+                        continue
+                    key = (other_id, other_position - position)
+                    run = runs.get(key)
+                    if run is not None and run.last == position - 1:
+                        run.last = position
+                    else:
+                        if run is not None:
+                            finished.append(run)
+                        runs[key] = _Run(other_id, position, other_position)
+            else:
+                bucket = self.index[fingerprint] = []
+            if len(bucket) < self.max_bucket:
+                bucket.append((file_id, position))
+
+        finished.extend(runs.values())
+        new_pairs = [self._pair(file_id, run) for run in finished]
+        new_pairs.sort(key=lambda pair: (pair.span_b, pair.path_a, pair.span_a))
+        self.pairs.extend(new_pairs)
+        return new_pairs
+
+    def add_directory(self, root, suffix=".sol"):
+        # Adds every matching file below `root` in sorted path order.
+        new_pairs = []
+        for directory, _, files in sorted(os.walk(root)):
+            for name in sorted(files):
+                if name.endswith(suffix):
+                    path = os.path.join(directory, name)
+                    with open(path, "r", encoding="utf-8") as f:
+                        new_pairs.extend(self.add_file(path, f.read()))
+        return new_pairs
+
+    def _fingerprints(self, codes):
+        # arc42: 5.13.3 Rolling Hash
+        # Yields the Rabin–Karp hash of every k-token window in order.
+        k = self.window
+        if len(codes) < k:
+            return
+        value = 0
+        for code in codes[:k]:
+            value = (value * HASH_BASE + code) % HASH_MODULUS
+        yield value
+        high = self._high_power
+        for i in range(k, len(codes)):
+            value = (value - codes[i - k] * high) % HASH_MODULUS
+            value = (value * HASH_BASE + codes[i]) % HASH_MODULUS
+            yield value
+
+    def _same(self, other_id, other_position, codes, position):
+        k = self.window
+        other = self.codes[other_id]
+        return (
+            other[other_position : other_position + k] == codes[position : position + k]
+        )
+
+    def _pair(self, file_id, run):
+        k = self.window
+        end = run.last + k
+        other_end = run.other_start + (end - run.start)
+        own_lines = self.lines[file_id]
+        other_lines = self.lines[run.file_id]
+        return ClonePair(
+            self.paths[run.file_id],
+            (run.other_start, other_end),
+            (other_lines[run.other_start], other_lines[other_end - 1]),
+            self.paths[file_id],
+            (run.start, end),
+            (own_lines[run.start], own_lines[end - 1]),
+        )
+
+
+def detect_clones(root, window=30, max_bucket=64):
+    """
+    Reports token clones between all Solidity files below a directory.
+
+    :param root: directory to scan
+    :param window: minimum clone length in tokens
+    :param max_bucket: maximum indexed occurrences per window hash
+    :return: list of ClonePair
+    """
+    return CloneDetector(window, max_bucket).add_directory(root)
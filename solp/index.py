@@ -0,0 +1,236 @@
+# arc42: 5.11 Project Index
+# A persistent SQLite database (stdlib `sqlite3`) of the declarations found
+# in a corpus: contracts, their members (functions, constructors, state
+# variables), function signatures, parameter types, visibility, `payable`
+# and source line spans. Cross-repository questions such as "which files
+# define a payable `transferFrom(address,address,uint)`" become indexed SQL
+# lookups that never touch the parser.
+#
+# Updates are incremental per file: each file row stores the hash of the
+# content it was indexed from. Re-indexing an unchanged file is a single
+# hash comparison; a changed file has its rows replaced inside one
+# transaction (child rows are removed through ON DELETE CASCADE). Files are
+# stored under their absolute path, so different spellings of one path
+# share a row, and files that are no longer part of the corpus (deleted,
+# moved or unreadable) are pruned by update().
+import hashlib
+import os
+import sqlite3
+
+from solp.solidity_ast.nodes import ConstructorNode, FunctionNode, VariableNode
+from solp.solidity_parser import parse_source_unit
+
+MEMBER_FUNCTION = "function"
+MEMBER_CONSTRUCTOR = "constructor"
+MEMBER_VARIABLE = "variable"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    hash TEXT NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS contracts (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    start_line INTEGER,
+    end_line INTEGER
+);
+CREATE TABLE IF NOT EXISTS members (
+    id INTEGER PRIMARY KEY,
+    contract_id INTEGER NOT NULL REFERENCES contracts(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    name TEXT,
+    var_type TEXT,
+    visibility TEXT,
+    is_payable INTEGER NOT NULL DEFAULT 0,
+    signature TEXT,
+    start_line INTEGER,
+    end_line INTEGER
+);
+CREATE TABLE IF NOT EXISTS parameters (
+    member_id INTEGER NOT NULL REFERENCES members(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_contracts_file ON contracts(file_id);
+CREATE INDEX IF NOT EXISTS idx_contracts_name ON contracts(name);
+CREATE INDEX IF NOT EXISTS idx_members_contract ON members(contract_id);
+CREATE INDEX IF NOT EXISTS idx_members_name ON members(name);
+CREATE INDEX IF NOT EXISTS idx_members_signature ON members(signature);
+CREATE INDEX IF NOT EXISTS idx_parameters_member ON parameters(member_id);
+CREATE INDEX IF NOT EXISTS idx_parameters_type ON parameters(type);
+"""
+
+FIND_FUNCTIONS = """
+SELECT files.path, contracts.name, members.name, members.signature,
+       members.visibility, members.is_payable, members.start_line,
+       members.end_line
+FROM members
+JOIN contracts ON contracts.id = members.contract_id
+JOIN files ON files.id = contracts.file_id
+WHERE members.kind = ?
+"""
+
+
+def function_signature(node):
+    # Canonical `name(type1,type2)` signature of a function or constructor.
+    name = MEMBER_CONSTRUCTOR if isinstance(node, ConstructorNode) else node.name
+    return f"{name}({','.join(p.var_type for p in node.parameters)})"
+
+
+class ProjectIndex:
+    def __init__(self, database=":memory:"):
+        # arc42: 5.11.1 Initialization
+        # Opens (or creates) the database and ensures the schema exists.
+        self.connection = sqlite3.connect(database)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def update(self, paths, prune=True):
+        # arc42: 5.11.2 Incremental Update
+        # Indexes every path whose content hash changed, all in a single
+        # transaction. `paths` is the current corpus: with `prune`, rows of
+        # indexed files that are not among them, or can no longer be read,
+        # are deleted. Pass prune=False to update a subset of the corpus.
+        # Returns the absolute paths that were (re-)indexed.
+        changed = []
+        current = set()
+        with self.connection:
+            for path in paths:
+                path = os.path.abspath(path)
+                try:
+                    if self.update_file(path):
+                        changed.append(path)
+                except OSError:
+                    continue
+                current.add(path)
+            if prune:
+                indexed = self.connection.execute("SELECT path FROM files")
+                for (path,) in indexed.fetchall():
+                    if path not in current:
+                        self.remove_file(path)
+        return changed
+
+    def update_file(self, path):
+        path = os.path.abspath(path)
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        row = self.connection.execute(
+            "SELECT hash FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is not None and row[0] == digest:
+            return False
+
+        try:
+            unit, error = parse_source_unit(content.decode("utf-8")), None
+        except Exception as exc:
+            unit, error = None, str(exc)
+        self.remove_file(path)
+        file_id = self.connection.execute(
+            "INSERT INTO files (path, hash, error) VALUES (?, ?, ?)",
+            (path, digest, error),
+        ).lastrowid
+        if unit is not None:
+            self._insert_unit(file_id, unit)
+        return True
+
+    def remove_file(self, path):
+        self.connection.execute(
+            "DELETE FROM files WHERE path = ?", (os.path.abspath(path),)
+        )
+
+    def _insert_unit(self, file_id, unit):
+        for node in unit.children:
+            if node.type != "Contract":
+                continue
+            start, end = node.span or (None, None)
+            contract_id = self.connection.execute(
+                "INSERT INTO contracts (file_id, name, kind, start_line, end_line) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (file_id, node.name, node.kind, start, end),
+            ).lastrowid
+            for member in node.members:
+                self._insert_member(contract_id, member)
+
+    def _insert_member(self, contract_id, member):
+        start, end = member.span or (None, None)
+        if isinstance(member, VariableNode):
+            self.connection.execute(
+                "INSERT INTO members (contract_id, kind, name, var_type, "
+                "visibility, start_line, end_line) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    contract_id,
+                    MEMBER_VARIABLE,
+                    member.name,
+                    member.var_type,
+                    member.visibility,
+                    start,
+                    end,
+                ),
+            )
+            return
+
+        is_function = isinstance(member, FunctionNode)
+        member_id = self.connection.execute(
+            "INSERT INTO members (contract_id, kind, name, visibility, is_payable, "
+            "signature, start_line, end_line) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                contract_id,
+                MEMBER_FUNCTION if is_function else MEMBER_CONSTRUCTOR,
+                member.name if is_function else None,
+                member.visibility,
+                int(is_function and member.is_payable),
+                function_signature(member),
+                start,
+                end,
+            ),
+        ).lastrowid
+        self.connection.executemany(
+            "INSERT INTO parameters (member_id, position, type, name) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (member_id, position, param.var_type, param.name)
+                for position, param in enumerate(member.parameters)
+            ],
+        )
+
+    def find_functions(self, name=None, signature=None, payable=None, visibility=None):
+        # arc42: 5.11.3 Queries
+        # Returns (path, contract, name, signature, visibility, is_payable,
+        # start_line, end_line) rows for functions matching all given
+        # filters. Every filter column is indexed or joined by index.
+        sql = FIND_FUNCTIONS
+        params = [MEMBER_FUNCTION]
+        for column, value in (
+            ("members.name", name),
+            ("members.signature", signature),
+            ("members.visibility", visibility),
+        ):
+            if value is not None:
+                sql += f" AND {column} = ?"
+                params.append(value)
+        if payable is not None:
+            sql += " AND members.is_payable = ?"
+            params.append(int(payable))
+        return self.connection.execute(sql, params).fetchall()
+
+    def find_contracts(self, name):
+        return self.connection.execute(
+            "SELECT files.path, contracts.kind, contracts.start_line, "
+            "contracts.end_line FROM contracts "
+            "JOIN files ON files.id = contracts.file_id WHERE contracts.name = ?",
+            (name,),
+        ).fetchall()
+
+    def execute(self, sql, params=()):
+        # Raw read access for ad-hoc queries against the schema above.
+        return self.connection.execute(sql, params).fetchall()
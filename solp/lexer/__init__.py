@@ -0,0 +1,24 @@
+# Array export and symbol interning are loaded on first access (see 5.22);
+# importing a lexer submodule does not compile the array scanner.
+_EXPORTS = {
+    "SymbolTable": "solp.lexer.interning",
+    "TokenArrays": "solp.lexer.arrays",
+    "Vocabulary": "solp.lexer.arrays",
+    "to_arrays": "solp.lexer.arrays",
+    "to_arrays_batch": "solp.lexer.arrays",
+}
+
+__all__ = ["SymbolTable", "TokenArrays", "Vocabulary", "to_arrays", "to_arrays_batch"]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(__import__(module, fromlist=(name,)), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,194 @@
+# arc42: 5.2.14 Array Export
+# Machine-learning pipelines consume token sequences as integer arrays.
+# `to_arrays()` scans source code directly into NumPy arrays of
+# (kind id, vocabulary id, start offset, length) without creating Token
+# objects. `to_arrays_batch()` fills one preallocated, padded matrix per
+# field for many files at once.
+#
+# The scanner is a single regular expression assembled from the lexer's
+# tables (KEYWORD_SET, SYMBOLS, OPERATORS) that reproduces the token
+# boundaries, types and values of Lexer.tokenize(). Tokens are written into
+# typed `array.array` buffers and handed to NumPy without per-token Python
+# objects being kept alive.
+#
+# NumPy is an optional dependency (`pip install solidity-parser-lib[numpy]`)
+# and is only imported when an array is built.
+import json
+import re
+from array import array
+
+from solp.lexer.definitions.keywords import KEYWORD_SET
+from solp.lexer.definitions.operators import OPERATORS
+from solp.lexer.definitions.symbols import SYMBOLS
+from solp.lexer.token_types import IDENTIFIER, KEYWORD, NUMBER, OPERATOR, STRING, SYMBOL
+
+# Kind ids; 0 is reserved for padding.
+PAD = 0
+KIND_IDS = {KEYWORD: 1, IDENTIFIER: 2, SYMBOL: 3, OPERATOR: 4, NUMBER: 5, STRING: 6}
+KIND_NAMES = {kind_id: kind for kind, kind_id in KIND_IDS.items()}
+
+
+TOKEN_PATTERN = re.compile(
+    r"(?P<SKIP>\s+|//[^\n]*|/\*.*?\*/)"
+    r"|(?P<WORD>[^\W\d]\w*)"
+    r"|(?P<NUMBER>\d+)"
+    rf"|(?P<SYMBOL>[{re.escape(''.join(SYMBOLS))}])"
+    rf"|(?P<OPERATOR>{'|'.join(re.escape(op) for op in OPERATORS)})"
+    r'|(?P<STRING>"(?:\\"|[^"\\]|\\(?!"))*"'
+    r"|'(?:\\'|[^'\\]|\\(?!'))*')"
+    r"|(?P<ERROR>.)",
+    re.DOTALL,
+)
+
+
+def require_numpy():
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "Array export requires NumPy: pip install solidity-parser-lib[numpy]"
+        ) from exc
+    return numpy
+
+
+class Vocabulary:
+    # arc42: 5.2.14.1 Vocabulary
+    # Maps (token type, token value) pairs to dense integer ids. Id 0 is
+    # reserved for padding and, in a frozen vocabulary, for unknown tokens.
+    # A vocabulary is shared across files and can be saved as JSON so ids
+    # stay stable between featurization runs.
+    def __init__(self, entries=None, frozen=False):
+        self.entries = [None]
+        self.ids = {}
+        self.frozen = frozen
+        for kind, value in entries or []:
+            self.ids[(kind, value)] = len(self.entries)
+            self.entries.append((kind, value))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def id_for(self, kind, value):
+        key = (kind, value)
+        token_id = self.ids.get(key)
+        if token_id is None:
+            if self.frozen:
+                return PAD
+            token_id = self.ids[key] = len(self.entries)
+            self.entries.append(key)
+        return token_id
+
+    def lookup(self, token_id):
+        return self.entries[token_id]
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([list(entry) for entry in self.entries[1:]], f)
+
+    @classmethod
+    def load(cls, path, frozen=False):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls([tuple(entry) for entry in json.load(f)], frozen=frozen)
+
+
+class TokenArrays:
+    # arc42: 5.2.14.2 TokenArrays
+    # Parallel arrays for one file (shape (n,)) or a batch (shape
+    # (files, max_tokens), padded with 0). `counts` holds the number of
+    # real tokens per file.
+    def __init__(self, kinds, ids, starts, lengths, counts):
+        self.kinds = kinds
+        self.ids = ids
+        self.starts = starts
+        self.lengths = lengths
+        self.counts = counts
+
+    def __len__(self):
+        return len(self.kinds)
+
+
+def _scan(source, vocabulary, kinds, ids, starts, lengths):
+    # Appends one entry per token to the four typed buffers. Bound methods
+    # are hoisted into locals because this loop runs once per token.
+    known = vocabulary.ids
+    id_for = vocabulary.id_for
+    add_kind, add_id = kinds.append, ids.append
+    add_start, add_length = starts.append, lengths.append
+    keyword, identifier = KIND_IDS[KEYWORD], KIND_IDS[IDENTIFIER]
+    for match in TOKEN_PATTERN.finditer(source):
+        group = match.lastgroup
+        if group == "SKIP":
+            continue
+        value = match.group()
+        if group == "WORD":
+            group = KEYWORD if value in KEYWORD_SET else IDENTIFIER
+            add_kind(keyword if group == KEYWORD else identifier)
+        elif group == "STRING":
+            quote = value[0]
+            value = value[1:-1].replace("\\" + quote, quote)
+            add_kind(KIND_IDS[group])
+        elif group == "ERROR":
+            raise Exception(f"Unexpected character '{value}' at offset {match.start()}")
+        else:
+            add_kind(KIND_IDS[group])
+        token_id = known.get((group, value))
+        add_id(token_id if token_id is not None else id_for(group, value))
+        start = match.start()
+        add_start(start)
+        add_length(match.end() - start)
+
+
+def _buffers():
+    return array("b"), array("i"), array("i"), array("i")
+
+
+def to_arrays(source, vocabulary=None):
+    """
+    Encodes the tokens of one source as NumPy arrays.
+
+    :param source: Solidity source code as string
+    :param vocabulary: shared Vocabulary (a new one is created if omitted)
+    :return: TokenArrays with int8 kinds and int32 ids, starts and lengths
+    """
+    np = require_numpy()
+    vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+    buffers = _buffers()
+    _scan(source, vocabulary, *buffers)
+    kinds, ids, starts, lengths = (np.frombuffer(b, dtype=b.typecode) for b in buffers)
+    counts = np.array([len(kinds)], dtype=np.int32)
+    return TokenArrays(kinds.copy(), ids.copy(), starts.copy(), lengths.copy(), counts)
+
+
+def to_arrays_batch(sources, vocabulary=None, max_tokens=None):
+    """
+    Encodes many sources into one padded matrix per field.
+
+    :param sources: iterable of Solidity source strings
+    :param vocabulary: shared Vocabulary (a new one is created if omitted)
+    :param max_tokens: row width; longer files are truncated. Defaults to
+        the longest file in the batch.
+    :return: TokenArrays with shape (files, max_tokens), padded with 0
+    """
+    np = require_numpy()
+    vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+    scanned = []
+    for source in sources:
+        buffers = _buffers()
+        _scan(source, vocabulary, *buffers)
+        scanned.append(buffers)
+
+    width = max_tokens
+    if width is None:
+        width = max((len(b[0]) for b in scanned), default=0)
+    rows = len(scanned)
+    kinds = np.zeros((rows, width), dtype=np.int8)
+    ids = np.zeros((rows, width), dtype=np.int32)
+    starts = np.zeros((rows, width), dtype=np.int32)
+    lengths = np.zeros((rows, width), dtype=np.int32)
+    counts = np.zeros(rows, dtype=np.int32)
+    for row, buffers in enumerate(scanned):
+        n = min(len(buffers[0]), width)
+        counts[row] = n
+        for target, buffer in zip((kinds, ids, starts, lengths), buffers):
+            target[row, :n] = np.frombuffer(buffer, dtype=buffer.typecode)[:n]
+    return TokenArrays(kinds, ids, starts, lengths, counts)
@@ -60,3 +60,7 @@ KEYWORDS = [
     "tx",
     "block",
 ]
+
+# Shared membership set; modules test `name in KEYWORD_SET` instead of
+# building their own frozenset of KEYWORDS.
+KEYWORD_SET = frozenset(KEYWORDS)
@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 OPERATOR_GROUPS = {
     "arithmetic": ["+", "-", "*", "/", "%", "**"],
     "comparison": ["==", "!=", "<", "<=", ">", ">="],
@@ -7,3 +9,90 @@ OPERATOR_GROUPS = {
     "increment": ["++", "--"],
     "other": ["->", "=>"],
 }
+
+# arc42: 5.2.16 Precomputed Operator Tables
+# Derived from OPERATOR_GROUPS but written out as literals so that importing
+# the lexer does no work. OPERATORS is ordered longest first, which gives
+# maximal munch when the lexer tries them in order; OPERATOR_GROUP maps each
+# operator to its group. A test keeps both in sync with OPERATOR_GROUPS.
+# Both are immutable (tuple, read-only mapping) so that lexers running in
+# several threads can share them (see 8. Thread Safety).
+OPERATORS = (
+    "<<=",
+    ">>=",
+    "**",
+    "==",
+    "!=",
+    "<=",
+    ">=",
+    "&&",
+    "||",
+    "<<",
+    ">>",
+    "+=",
+    "-=",
+    "*=",
+    "/=",
+    "%=",
+    "&=",
+    "|=",
+    "^=",
+    "++",
+    "--",
+    "->",
+    "=>",
+    "+",
+    "-",
+    "*",
+    "/",
+    "%",
+    "<",
+    ">",
+    "!",
+    "&",
+    "|",
+    "^",
+    "~",
+    "=",
+)
+
+OPERATOR_GROUP = MappingProxyType(
+    {
+        "+": "arithmetic",
+        "-": "arithmetic",
+        "*": "arithmetic",
+        "/": "arithmetic",
+        "%": "arithmetic",
+        "**": "arithmetic",
+        "==": "comparison",
+        "!=": "comparison",
+        "<": "comparison",
+        "<=": "comparison",
+        ">": "comparison",
+        ">=": "comparison",
+        "&&": "logical",
+        "||": "logical",
+        "!": "logical",
+        "&": "bitwise",
+        "|": "bitwise",
+        "^": "bitwise",
+        "~": "bitwise",
+        "<<": "bitwise",
+        ">>": "bitwise",
+        "=": "assignment",
+        "+=": "assignment",
+        "-=": "assignment",
+        "*=": "assignment",
+        "/=": "assignment",
+        "%=": "assignment",
+        "&=": "assignment",
+        "|=": "assignment",
+        "^=": "assignment",
+        "<<=": "assignment",
+        ">>=": "assignment",
+        "++": "increment",
+        "--": "increment",
+        "->": "other",
+        "=>": "other",
+    }
+)
@@ -10,3 +10,6 @@ SYMBOLS = [
     ".",
     ":",
 ]
+
+# Immutable membership set used by the lexer.
+SYMBOL_SET = frozenset(SYMBOLS)
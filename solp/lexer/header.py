@@ -0,0 +1,138 @@
+# arc42: 5.7 File Header Scanner
+# Dependency graphs across large corpora only need the preamble of each file:
+# pragma directives, import paths and the names of top-level contracts,
+# interfaces and libraries. `scan_header()` extracts exactly this without
+# producing Token objects or running the parser.
+#
+# The scanner uses two regular expressions assembled from the lexer's
+# tables. At file level it recognizes comments, string literals, words and
+# the `{` / `;` symbols. Once a declaration body (or any other top-level
+# block) opens, it switches to a body pattern that only matches braces,
+# comments and strings, so function bodies are skipped by brace counting
+# instead of being tokenized.
+import re
+
+from solp.lexer.token_types import (
+    CTX_ABSTRACT,
+    KW_CONTRACT_KINDS,
+    KW_IMPORT,
+    KW_PRAGMA,
+    SYM_LBRACE,
+    SYM_RBRACE,
+    SYM_SEMICOLON,
+)
+
+_COMMENT = r"//[^\n]*|/\*.*?(?:\*/|\Z)"
+_STRING = r"\"(?:\\.|[^\"\\\n])*\"?|'(?:\\.|[^'\\\n])*'?"
+
+TOP_LEVEL_PATTERN = re.compile(
+    rf"(?:{_COMMENT}|{_STRING})|(?P<word>[^\W\d]\w*)"
+    rf"|(?P<symbol>[{re.escape(SYM_LBRACE + SYM_SEMICOLON)}])",
+    re.DOTALL,
+)
+BODY_PATTERN = re.compile(
+    rf"(?:{_COMMENT}|{_STRING})|(?P<brace>[{re.escape(SYM_LBRACE + SYM_RBRACE)}])",
+    re.DOTALL,
+)
+STRING_LITERAL_PATTERN = re.compile(r"\"((?:\\.|[^\"\\])*)\"|'((?:\\.|[^'\\])*)'")
+
+
+class FileHeader:
+    # arc42: 5.7.1 FileHeader
+    # - pragmas: list of (name, value) tuples, e.g. ("solidity", "^0.8.0")
+    # - imports: list of import paths in source order
+    # - declarations: list of (kind, name, start, end) tuples where start and
+    #   end are character offsets spanning the whole declaration text
+    def __init__(self, pragmas=None, imports=None, declarations=None):
+        self.pragmas = pragmas or []
+        self.imports = imports or []
+        self.declarations = declarations or []
+
+    def __repr__(self):
+        return (
+            f"FileHeader(pragmas={self.pragmas!r}, imports={self.imports!r}, "
+            f"declarations={self.declarations!r})"
+        )
+
+
+def scan_header(source):
+    """
+    Extracts pragmas, imports and top-level declaration names from a file.
+
+    :param source: Solidity source code as string
+    :return: FileHeader describing the file preamble and declarations
+    """
+    header = FileHeader()
+    position = 0
+    abstract_start = None
+    while True:
+        match = TOP_LEVEL_PATTERN.search(source, position)
+        if match is None:
+            return header
+        position = match.end()
+        word = match.group("word")
+
+        if word == KW_PRAGMA:
+            position = _scan_pragma(source, position, header)
+        elif word == KW_IMPORT:
+            position = _scan_import(source, position, header)
+        elif word in KW_CONTRACT_KINDS:
+            start = match.start() if abstract_start is None else abstract_start
+            position = _scan_declaration(source, word, start, position, header)
+        elif match.group("symbol") == SYM_LBRACE:
+            position = skip_block(source, position)
+
+        abstract_start = match.start() if word == CTX_ABSTRACT else None
+
+
+def skip_block(source, position):
+    # arc42: 5.7.2 Brace Counting
+    # Skips a block whose opening brace ends right before `position`.
+    # Returns the offset after the matching closing brace, or the end of the
+    # source for unbalanced input.
+    depth = 1
+    for match in BODY_PATTERN.finditer(source, position):
+        brace = match.group("brace")
+        if brace == SYM_LBRACE:
+            depth += 1
+        elif brace == SYM_RBRACE:
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return len(source)
+
+
+def _scan_pragma(source, position, header):
+    end = source.find(SYM_SEMICOLON, position)
+    if end < 0:
+        end = len(source)
+    parts = source[position:end].split(None, 1)
+    if parts:
+        header.pragmas.append((parts[0], parts[1].strip() if len(parts) > 1 else ""))
+    return end + 1
+
+
+def _scan_import(source, position, header):
+    # Every import form contains exactly one string literal: the path.
+    match = STRING_LITERAL_PATTERN.search(source, position)
+    if match is None:
+        return len(source)
+    path = match.group(1) if match.group(1) is not None else match.group(2)
+    header.imports.append(path)
+    end = source.find(SYM_SEMICOLON, match.end())
+    return len(source) if end < 0 else end + 1
+
+
+def _scan_declaration(source, kind, start, position, header):
+    name = None
+    while True:
+        match = TOP_LEVEL_PATTERN.search(source, position)
+        if match is None:
+            return len(source)
+        position = match.end()
+        if name is None and match.group("word"):
+            name = match.group("word")
+        elif match.group("symbol") == SYM_LBRACE:
+            end = skip_block(source, position)
+            header.declarations.append((kind, name, start, end))
+            return end
@@ -0,0 +1,41 @@
+# arc42: 5.2.15 Symbol Interning
+# Identifier values are sliced out of the source for every occurrence, so a
+# name used a thousand times would otherwise be stored a thousand times and
+# then referenced from tokens, AST nodes and side tables.
+#
+# - Keywords: the lexer returns the canonical constant string from
+#   CANONICAL_KEYWORDS instead of the slice. Rule constants such as
+#   RULE_IF are the same interned literals, so `==` checks in the grammar
+#   rules succeed on the identity fast path.
+# - Identifiers: every value passes through a SymbolTable, which returns
+#   the first string object seen for that value. A table lives for one
+#   Lexer by default; passing the same table to many lexers interns names
+#   across a whole corpus.
+#
+# Thread safety: CANONICAL_KEYWORDS is a read-only mapping. SymbolTable.intern
+# is a single dict.setdefault call, which is atomic with and without the GIL,
+# so one table can be shared by lexers in several threads; every thread gets
+# the same canonical string for a value.
+import sys
+from types import MappingProxyType
+
+from solp.lexer.definitions.keywords import KEYWORDS
+
+CANONICAL_KEYWORDS = MappingProxyType(
+    {keyword: sys.intern(keyword) for keyword in KEYWORDS}
+)
+
+
+class SymbolTable:
+    def __init__(self):
+        self.symbols = {}
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, value):
+        return value in self.symbols
+
+    def intern(self, value):
+        # Returns the canonical string object equal to `value`.
+        return self.symbols.setdefault(value, value)
@@ -22,7 +22,7 @@
 
 # arc42: 5.2.12 Symbols
 # Symbols such as `{`, `;`, and `(` are matched directly by checking if the
-# current character exists in the predefined SYMBOLS list. Each match results
+# current character exists in the predefined SYMBOLS set. Each match results
 # in a single SYMBOL token.
 
 # arc42: 5.3 Token Object
@@ -32,9 +32,10 @@
 # - position (line, column)
 # - subtype (optional: e.g. operator group)
 
-from solp.lexer.definitions.keywords import KEYWORDS
-from solp.lexer.definitions.operators import OPERATOR_GROUPS
-from solp.lexer.definitions.symbols import SYMBOLS
+from solp.lexer.definitions.keywords import KEYWORD_SET
+from solp.lexer.definitions.operators import OPERATOR_GROUP, OPERATORS
+from solp.lexer.definitions.symbols import SYMBOL_SET
+from solp.lexer.interning import CANONICAL_KEYWORDS, SymbolTable
 
 # arc42: 8. Crosscutting Concepts – Testing Strategy
 # Every lexer function is individually tested using unit tests.
@@ -43,27 +44,27 @@ from solp.lexer.definitions.symbols import SYMBOLS
 # updates to Solidity.
 from solp.lexer.token import Token
 
-KEYWORDS = set(KEYWORDS)
-
-OPERATORS = sorted(
-    {op for group in OPERATOR_GROUPS.values() for op in group}, key=len, reverse=True
-)
+# arc42: 8. Crosscutting Concepts – Thread Safety
+# Module-level tables are immutable (frozenset, tuple, read-only mappings)
+# and are never written after import. All scanning state (position, line,
+# column) lives on the Lexer instance, so one Lexer serves one call while
+# any number of Lexers may run concurrently in threads.
+KEYWORDS = KEYWORD_SET
 
 
 def get_operator_group(op):
-    for group, ops in OPERATOR_GROUPS.items():
-        if op in ops:
-            return group
-    return "unknown"
+    return OPERATOR_GROUP.get(op, "unknown")
 
 
 class Lexer:
-    def __init__(self, code):
+    def __init__(self, code, symbols=None):
         # arc42: 5.2.1 Initialization
         # Initializes lexer with source code string.
         # Maintains position tracking (line, column) for accurate error
-        # reporting.
+        # reporting. Identifier values are interned through `symbols`, a
+        # SymbolTable that may be shared across lexers (see 5.2.15).
         self.code = code
+        self.symbols = symbols if symbols is not None else SymbolTable()
         self.position = 0
         self.line = 1
         self.col = 1
@@ -73,7 +74,13 @@ class Lexer:
         # Main method that performs the lexical scan. Returns a list of Token
         # objects. Skips whitespace and comments. Delegates recognition to
         # helper methods.
-        tokens = []
+        return list(self.iter_tokens())
+
+    def iter_tokens(self):
+        # arc42: 5.2.2.1 Streaming Scan – iter_tokens()
+        # Generator form of tokenize(). Tokens are produced on demand, so a
+        # lazily filled TokenStream can start parsing before the whole
+        # source has been scanned.
         while self.position < len(self.code):
             current = self.code[self.position]
 
@@ -84,24 +91,23 @@ class Lexer:
             elif current == "/" and self._peek() == "*":
                 self._consume_block_comment()
             elif current.isalpha() or current == "_":
-                tokens.append(self._consume_identifier_or_keyword())
+                yield self._consume_identifier_or_keyword()
             elif current.isdigit():
-                tokens.append(self._consume_number())
-            elif current in SYMBOLS:
-                tokens.append(Token("SYMBOL", current, self.line, self.col))
+                yield self._consume_number()
+            elif current in SYMBOL_SET:
+                yield Token("SYMBOL", current, self.line, self.col)
                 self._advance()
             elif self._match_operator():
                 op = self._consume_operator()
                 group = get_operator_group(op)
-                tokens.append(Token("OPERATOR", op, self.line, self.col, group))
+                yield Token("OPERATOR", op, self.line, self.col, group)
             elif current in ('"', "'"):
-                tokens.append(self._consume_string())
+                yield self._consume_string()
             else:
                 raise Exception(
                     f"Unexpected character '{current}' "
                     f"at line {self.line}, col {self.col}"
                 )
-        return tokens
 
     def _advance(self, amount=1):
         # arc42: 5.2.3 Position Tracking – _advance()
@@ -148,15 +154,18 @@ class Lexer:
         # arc42: 5.2 Lexer internals
         # This method extracts either a language keyword or an identifier from
         # the source. It scans from the current position until a
-        # non-alphanumeric character is found.
+        # non-alphanumeric character is found. Keywords are returned as
+        # their canonical constant, identifiers through the symbol table.
         start = self.position
         while self.position < len(self.code) and (
             self.code[self.position].isalnum() or self.code[self.position] == "_"
         ):
             self._advance()
         value = self.code[start : self.position]
-        type_ = "KEYWORD" if value in KEYWORDS else "IDENTIFIER"
-        return Token(type_, value, self.line, self.col)
+        keyword = CANONICAL_KEYWORDS.get(value)
+        if keyword is not None:
+            return Token("KEYWORD", keyword, self.line, self.col)
+        return Token("IDENTIFIER", self.symbols.intern(value), self.line, self.col)
 
     def _consume_number(self):
         # arc42: 5.2.9 Numeric Literals
@@ -7,22 +7,50 @@ SYMBOL = "SYMBOL"
 OPERATOR = "OPERATOR"
 NUMBER = "NUMBER"
 STRING = "STRING"
+# Sentinel closing every TokenStream (see 5.3.1); never produced by the lexer
+EOF = "EOF"
 
 # Keywords
 KW_CONTRACT = "contract"
 KW_FUNCTION = "function"
 KW_RETURN = "return"
-KW_TYPES = {"uint", "string", "address", "bool"}
+# Elementary type keywords; sized variants such as uint256 or bytes32 are
+# lexed as identifiers.
+KW_TYPES = {
+    "address",
+    "bool",
+    "string",
+    "bytes",
+    "byte",
+    "int",
+    "uint",
+    "fixed",
+    "ufixed",
+}
+KW_ADDRESS = "address"
 KW_VISIBILITY = {"public", "private", "internal", "external"}
 KW_PAYABLE = "payable"
 KW_RETURNS = "returns"
 KW_CONSTRUCTOR = "constructor"
+KW_PRAGMA = "pragma"
+KW_IMPORT = "import"
+KW_CONTRACT_KINDS = {"contract", "interface", "library"}
+KW_DATA_LOCATIONS = {"memory", "storage", "calldata"}
+
+# Contextual identifiers (not reserved, meaningful only in position)
+CTX_ABSTRACT = "abstract"
+CTX_IS = "is"
+CTX_AS = "as"
+CTX_FROM = "from"
 
 # Rule names (for dispatcher)
+RULE_CONTRACT = "contract"
 RULE_FUNCTION = "function"
 RULE_VARIABLE = "variable"
 RULE_STATEMENTS = "statements"
 RULE_ASSIGNMENT = "assignment"
+RULE_DECLARATION = "declaration"
+RULE_PATH = "path"
 RULE_EXPRESSION = "expression"
 RULE_REQUIRE = "require"
 RULE_IF = "if"
@@ -35,6 +63,8 @@ RULE_WHILE = "while"
 RULE_FOR = "for"
 RULE_BREAK = "break"
 RULE_CONTINUE = "continue"
+RULE_PRAGMA = "pragma"
+RULE_IMPORT = "import"
 
 # Common symbols
 SYM_LBRACE = "{"
@@ -44,4 +74,10 @@ SYM_RPAREN = ")"
 SYM_SEMICOLON = ";"
 SYM_DOT = "."
 SYM_COMMA = ","
+SYM_LBRACKET = "["
+SYM_RBRACKET = "]"
 SYM_EMPTY = ""
+
+# Common operators
+OP_STAR = "*"
+OP_ASSIGN = "="
@@ -0,0 +1,364 @@
+# arc42: 5.21 Streaming Metrics
+# Per-function size and complexity metrics computed while parsing, without
+# building an AST. The MetricsNodeFactory plugs into the node factory
+# extension point (5.5) like the RecognizerNodeFactory: the grammar rules
+# run unchanged, but the factory methods that StatementRule calls for
+# statements, returns, calls and if/while/for blocks only update counters
+# of the function being parsed.
+#
+# Metrics per function or constructor:
+# - statements: statements of all kinds, including nested ones
+# - cyclomatic: 1 + number of if, while and for statements
+# - max_depth: deepest nesting of if/while/for blocks (0 for flat bodies)
+# - calls / fan_out: call expressions and distinct callee names
+#
+# Nesting depth is computed bottom-up through the sequences handed to the
+# factory: every block remembers the deepest item appended to it.
+#
+# Function records receive their span from the RuleDispatcher and are
+# handed to a sink when their contract is complete, so memory is bounded by
+# the largest contract, not by the corpus. MetricsSummary aggregates the
+# records; summaries of separate workers can be merged.
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from solp.lexer.lexer import Lexer
+from solp.parser.parser import Parser
+from solp.solidity_ast.factory import ACCEPTED, RecognizerNodeFactory
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+
+FIELDS = (
+    "path",
+    "contract",
+    "function",
+    "first_line",
+    "last_line",
+    "statements",
+    "cyclomatic",
+    "max_depth",
+    "calls",
+    "fan_out",
+)
+CONSTRUCTOR_NAME = "constructor"
+
+
+class FunctionMetrics:
+    __slots__ = (
+        "path",
+        "contract",
+        "name",
+        "span",
+        "statements",
+        "cyclomatic",
+        "max_depth",
+        "calls",
+        "fan_out",
+    )
+
+    def __init__(self, name, statements, decisions, max_depth, calls, fan_out):
+        self.path = None
+        self.contract = None
+        self.name = name
+        self.span = None
+        self.statements = statements
+        self.cyclomatic = decisions + 1
+        self.max_depth = max_depth
+        self.calls = calls
+        self.fan_out = fan_out
+
+    def row(self):
+        first, last = self.span or (None, None)
+        return (
+            self.path,
+            self.contract,
+            self.name,
+            first,
+            last,
+            self.statements,
+            self.cyclomatic,
+            self.max_depth,
+            self.calls,
+            self.fan_out,
+        )
+
+    def as_dict(self):
+        return dict(zip(FIELDS, self.row()))
+
+
+class _Nested:
+    # Result of an if/while/for statement: truthy like ACCEPTED, carrying
+    # the nesting depth of the block.
+    __slots__ = ("depth",)
+
+    def __init__(self, depth):
+        self.depth = depth
+
+
+class _DepthSequence:
+    __slots__ = ("count", "depth")
+
+    def __init__(self):
+        self.count = 0
+        self.depth = 0
+
+    def append(self, item):
+        self.count += 1
+        if type(item) is _Nested and item.depth > self.depth:
+            self.depth = item.depth
+
+    def __len__(self):
+        return self.count
+
+
+class _Contract:
+    # Contract result; `span` is assigned by the RuleDispatcher.
+    __slots__ = ("span",)
+
+    def __init__(self):
+        self.span = None
+
+
+class MetricsNodeFactory(RecognizerNodeFactory):
+    def __init__(self, sink, path=None):
+        # arc42: 5.21.1 Factory Hooks
+        # - sink: callable receiving every FunctionMetrics
+        # - path: file path recorded in every record
+        self.sink = sink
+        self.path = path
+        self._functions = []
+        self._reset()
+
+    def _reset(self):
+        self._statements = 0
+        self._decisions = 0
+        self._calls = 0
+        self._callees = set()
+
+    def _finish(self, name, body):
+        # `body` is None for functions without implementation (interfaces,
+        # abstract functions ending in `;`).
+        metrics = FunctionMetrics(
+            name,
+            self._statements,
+            self._decisions,
+            body.depth if body is not None else 0,
+            self._calls,
+            len(self._callees),
+        )
+        metrics.path = self.path
+        self._functions.append(metrics)
+        self._reset()
+        return metrics
+
+    def contract(self, name, members, kind="contract", bases=None):
+        for metrics in self._functions:
+            metrics.contract = name
+            self.sink(metrics)
+        self._functions = []
+        self._reset()
+        return _Contract()
+
+    def function(self, name, visibility, is_payable, parameters, returns, body):
+        return self._finish(name, body)
+
+    def constructor(self, parameters, visibility, body):
+        return self._finish(CONSTRUCTOR_NAME, body)
+
+    def statement(self, type_, **kwargs):
+        self._statements += 1
+        return ACCEPTED
+
+    def return_(self, value):
+        self._statements += 1
+        return ACCEPTED
+
+    def call(self, function, arguments):
+        self._calls += 1
+        self._callees.add(function)
+        return ACCEPTED
+
+    def if_(self, condition, then_block, else_block):
+        self._statements += 1
+        self._decisions += 1
+        depth = then_block.depth
+        if else_block is not None and else_block.depth > depth:
+            depth = else_block.depth
+        return _Nested(depth + 1)
+
+    def while_(self, condition, body):
+        self._statements += 1
+        self._decisions += 1
+        return _Nested(body.depth + 1)
+
+    def for_(self, init, condition, increment, body):
+        self._statements += 1
+        self._decisions += 1
+        return _Nested(body.depth + 1)
+
+    def sequence(self):
+        return _DepthSequence()
+
+
+class MetricsSummary:
+    # Mergeable aggregate: counts and sums add up, maxima are kept, and the
+    # cyclomatic histogram maps complexity -> number of functions.
+    def __init__(self):
+        self.files = 0
+        self.errors = 0
+        self.functions = 0
+        self.statements = 0
+        self.cyclomatic = 0
+        self.calls = 0
+        self.max_cyclomatic = 0
+        self.max_depth = 0
+        self.histogram = {}
+
+    def add(self, metrics):
+        self.functions += 1
+        self.statements += metrics.statements
+        self.cyclomatic += metrics.cyclomatic
+        self.calls += metrics.calls
+        self.max_cyclomatic = max(self.max_cyclomatic, metrics.cyclomatic)
+        self.max_depth = max(self.max_depth, metrics.max_depth)
+        self.histogram[metrics.cyclomatic] = (
+            self.histogram.get(metrics.cyclomatic, 0) + 1
+        )
+
+    def merge(self, other):
+        self.files += other.files
+        self.errors += other.errors
+        self.functions += other.functions
+        self.statements += other.statements
+        self.cyclomatic += other.cyclomatic
+        self.calls += other.calls
+        self.max_cyclomatic = max(self.max_cyclomatic, other.max_cyclomatic)
+        self.max_depth = max(self.max_depth, other.max_depth)
+        for value, count in other.histogram.items():
+            self.histogram[value] = self.histogram.get(value, 0) + count
+        return self
+
+    @property
+    def mean_cyclomatic(self):
+        return self.cyclomatic / self.functions if self.functions else 0.0
+
+    def as_dict(self):
+        return {
+            "files": self.files,
+            "errors": self.errors,
+            "functions": self.functions,
+            "statements": self.statements,
+            "calls": self.calls,
+            "mean_cyclomatic": self.mean_cyclomatic,
+            "max_cyclomatic": self.max_cyclomatic,
+            "max_depth": self.max_depth,
+            "histogram": dict(sorted(self.histogram.items())),
+        }
+
+
+class MetricsWriter:
+    # Writes records to a text stream as they arrive, as CSV with a header
+    # row or as one JSON object per line.
+    def __init__(self, stream, output_format=FORMAT_CSV):
+        if output_format not in (FORMAT_CSV, FORMAT_JSONL):
+            raise Exception(f"Unknown metrics format: {output_format}")
+        self.stream = stream
+        self.format = output_format
+        self._csv = None
+        if output_format == FORMAT_CSV:
+            self._csv = csv.writer(stream)
+            self._csv.writerow(FIELDS)
+
+    def write(self, metrics):
+        if self._csv is not None:
+            self._csv.writerow(metrics.row())
+        else:
+            self.stream.write(json.dumps(metrics.as_dict()) + "\n")
+
+
+def source_metrics(source, sink, path=None):
+    """
+    Computes the metrics of every function in a Solidity file.
+
+    :param source: Solidity source code
+    :param sink: callable receiving one FunctionMetrics per function
+    :param path: path recorded in the records
+    """
+    parser = Parser(Lexer(source).tokenize(), MetricsNodeFactory(sink, path))
+    parser.parse_source_unit()
+
+
+def file_metrics(path):
+    """
+    Computes the metrics of one file and its summary.
+
+    :param path: path of a Solidity file
+    :return: (list of FunctionMetrics, MetricsSummary, error message or None)
+    """
+    records = []
+    summary = MetricsSummary()
+    summary.files = 1
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            source_metrics(f.read(), records.append, path)
+    except Exception as exc:
+        summary.errors = 1
+        return [], summary, str(exc)
+    for metrics in records:
+        summary.add(metrics)
+    return records, summary, None
+
+
+def iter_source_files(root, suffix=".sol"):
+    # Yields matching file paths below `root` in sorted order, lazily.
+    for directory, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(suffix):
+                yield os.path.join(directory, name)
+
+
+def _path_metrics(path):
+    # Worker entry point: file_metrics() together with its path, so errors
+    # can be attributed while results arrive in order.
+    return (path,) + file_metrics(path)
+
+
+def corpus_metrics(paths, writer=None, max_workers=None, executor=None, on_error=None):
+    """
+    Computes metrics for many files, streaming records to a writer.
+
+    Files are processed in order, in worker processes when `max_workers` or
+    `executor` is given; per-file summaries are merged into one.
+
+    :param paths: iterable of file paths
+    :param writer: MetricsWriter (or any object with write(metrics))
+    :param max_workers: size of a process pool to create
+    :param executor: concurrent.futures executor to use instead
+    :param on_error: optional callable(path, message) for files that failed
+    :return: MetricsSummary over all files
+    """
+    summary = MetricsSummary()
+    own = None
+    if executor is None and max_workers:
+        executor = own = ProcessPoolExecutor(max_workers)
+    try:
+        results = (
+            map(_path_metrics, paths)
+            if executor is None
+            else executor.map(_path_metrics, paths, chunksize=16)
+        )
+        for path, records, file_summary, error in results:
+            summary.merge(file_summary)
+            if error is not None and on_error is not None:
+                on_error(path, error)
+            if writer is not None:
+                for metrics in records:
+                    writer.write(metrics)
+    finally:
+        if own is not None:
+            own.shutdown()
+    return summary
@@ -10,11 +10,10 @@
 # - Loose coupling between parser components
 # - Easy extensibility: new rules can be added in one place
 # - Enables unit testing of each rule in isolation
-from solp.parser.rules.constructor import ConstructorRule
-from solp.parser.rules.contract import ContractRule
-from solp.parser.rules.function import FunctionRule
-from solp.parser.rules.statement import StatementRule
-from solp.parser.rules.variable import VariableRule
+#
+# Rule modules are imported on first use, not when the dispatcher is
+# imported: a parse that never meets a constructor never loads its rule.
+import importlib
 
 # arc42: 5.3.2.1 Rule Name Constants
 # These constants define all supported parser rules to avoid magic strings.
@@ -23,14 +22,54 @@ RULE_FUNCTION = "function"
 RULE_VARIABLE = "variable"
 RULE_STATEMENTS = "statements"
 RULE_CONSTRUCTOR = "constructor"
+RULE_PRAGMA = "pragma"
+RULE_IMPORT = "import"
+
+# arc42: 5.3.2.6 Rule Registry
+# rule name -> (module, class, whether the rule delegates back to the
+# dispatcher). Classes are resolved once and kept in _rule_classes; a
+# concurrent first use resolves the same class twice, which is harmless,
+# since the import system serializes the module import itself.
+RULES = {
+    RULE_CONTRACT: ("solp.parser.rules.contract", "ContractRule", True),
+    RULE_FUNCTION: ("solp.parser.rules.function", "FunctionRule", True),
+    RULE_VARIABLE: ("solp.parser.rules.variable", "VariableRule", False),
+    RULE_STATEMENTS: ("solp.parser.rules.statement", "StatementRule", True),
+    RULE_CONSTRUCTOR: ("solp.parser.rules.constructor", "ConstructorRule", True),
+    RULE_PRAGMA: ("solp.parser.rules.directive", "PragmaRule", False),
+    RULE_IMPORT: ("solp.parser.rules.directive", "ImportRule", False),
+}
+
+_rule_classes = {}
+
+
+def rule_class(rule_name):
+    """
+    Returns the rule class for a rule name, importing its module on first use.
+
+    :param rule_name: one of the RULE_* constants
+    :return: (rule class, whether it takes the dispatcher)
+    """
+    entry = _rule_classes.get(rule_name)
+    if entry is None:
+        if rule_name not in RULES:
+            # arc42: 5.3.2.4 Error Handling
+            # Raises a descriptive exception for unknown rules
+            raise Exception(f"Unknown parse rule: {rule_name}")
+        module, name, delegates = RULES[rule_name]
+        rule = getattr(importlib.import_module(module), name)
+        entry = _rule_classes[rule_name] = (rule, delegates)
+    return entry
 
 
 class RuleDispatcher:
-    def __init__(self, token_stream):
+    def __init__(self, token_stream, nodes=None):
         # arc42: 5.3.2.2 Initialization
         # The dispatcher holds a reference to the active token stream and
-        # is passed to rule classes that require further delegation.
+        # is passed to rule classes that require further delegation. The
+        # node factory is injected into every rule it creates.
         self.tokens = token_stream
+        self.nodes = nodes
 
     def parse_rule(self, rule_name):
         # arc42: 5.3.2.3 Rule Delegation
@@ -43,22 +82,21 @@ class RuleDispatcher:
         # - function: FunctionRule
         # - variable: VariableRule
         # - statements: StatementRule
+        # - constructor: ConstructorRule
+        # - pragma / import: PragmaRule / ImportRule
+        start = self.tokens.current()
+        node = self._create_and_parse(rule_name)
 
-        if rule_name == RULE_CONTRACT:
-            return ContractRule(self.tokens, self).parse()
-
-        if rule_name == RULE_FUNCTION:
-            return FunctionRule(self.tokens, self).parse()
-
-        if rule_name == RULE_VARIABLE:
-            return VariableRule(self.tokens).parse()
-
-        if rule_name == RULE_STATEMENTS:
-            return StatementRule(self.tokens).parse()
-
-        if rule_name == RULE_CONSTRUCTOR:
-            return ConstructorRule(self.tokens, self).parse()
+        # arc42: 5.3.2.5 Source Spans
+        # Declaration nodes expose a `span` attribute. The dispatcher is the
+        # single place that sees both the first and the last token of every
+        # delegated rule, so it records the (first line, last line) span.
+        if hasattr(node, "span"):
+            node.span = (start.line, self.tokens.last().line)
+        return node
 
-        # arc42: 5.3.2.4 Error Handling
-        # Raises a descriptive exception for unknown rules
-        raise Exception(f"Unknown parse rule: {rule_name}")
+    def _create_and_parse(self, rule_name):
+        rule, delegates = rule_class(rule_name)
+        if delegates:
+            return rule(self.tokens, self, self.nodes).parse()
+        return rule(self.tokens, self.nodes).parse()
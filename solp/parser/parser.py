@@ -6,33 +6,49 @@
 # Responsibilities:
 # - Convert raw tokens into a navigable token stream
 # - Instantiate and coordinate the RuleDispatcher
-# - Delegate parsing to the top-level ContractRule
+# - Delegate parsing to the top-level ContractRule, or to the SourceUnitRule
+#   for complete files with directives and several declarations
 #
 # This parser does not implement parsing logic itself.
 # All grammar rules are modularized in dedicated rule classes
 # (ContractRule, FunctionRule, etc.)
 
-from solp.parser.dispatcher import RuleDispatcher
-from solp.parser.rules.contract import ContractRule
+from solp.parser.dispatcher import RULE_CONTRACT, RuleDispatcher
+from solp.parser.rules.source_unit import SourceUnitRule
 from solp.parser.token_stream import TokenStream
 
 
 class Parser:
-    def __init__(self, tokens):
+    def __init__(self, tokens, nodes=None):
         # arc42: 5.3.1.1 Initialization
         # The parser wraps the token list in a TokenStream for controlled
         # access and sets up the RuleDispatcher used to invoke rule-based
-        # parsing logic.
+        # parsing logic. An optional node factory replaces the default AST
+        # construction (see 5.5 Node Factory).
         self.tokens = TokenStream(tokens)
-        self.rules = RuleDispatcher(self.tokens)
+        self.nodes = nodes
+        self.rules = RuleDispatcher(self.tokens, nodes)
 
     def parse(self):
         # arc42: 5.3.1.2 Entry Point
         # Starts the parsing process and returns the root AST node.
-        # In this grammar, a contract is always the top-level structure.
+        # parse() expects a single contract as the top-level structure;
+        # complete files are handled by parse_source_unit().
         return self.parse_contract()
 
     def parse_contract(self):
         # arc42: 5.3.1.3 Contract Delegation
-        # Delegates contract parsing to ContractRule.
-        return ContractRule(self.tokens, self.rules).parse()
+        # Delegates contract parsing to ContractRule via the dispatcher.
+        return self.rules.parse_rule(RULE_CONTRACT)
+
+    def parse_source_unit(self):
+        # arc42: 5.3.1.4 Source Unit
+        # Parses every top-level directive and declaration into a
+        # SourceUnitNode.
+        return SourceUnitRule(self.tokens, self.rules, self.nodes).parse()
+
+    def iter_declarations(self):
+        # arc42: 5.3.1.5 Streamed Declarations
+        # Generator variant of parse_source_unit() yielding each top-level
+        # node as soon as it is parsed.
+        return SourceUnitRule(self.tokens, self.rules, self.nodes).iter_declarations()
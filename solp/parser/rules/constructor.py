@@ -17,43 +17,39 @@ from solp.lexer.token_types import (
     SYM_LPAREN,
     SYM_RBRACE,
     SYM_RPAREN,
-    SYMBOL,
 )
-from solp.solidity_ast.nodes import ConstructorNode, VariableNode
+from solp.solidity_ast.factory import DEFAULT_NODE_FACTORY
 
 
 class ConstructorRule:
-    def __init__(self, tokens, dispatcher):
+    def __init__(self, tokens, dispatcher, nodes=None):
         self.tokens = tokens
         self.dispatcher = dispatcher
+        self.nodes = nodes if nodes is not None else DEFAULT_NODE_FACTORY
 
     def parse(self):
-        self.tokens.expect(KEYWORD, RULE_CONSTRUCTOR)
+        self.tokens.expect_keyword(RULE_CONSTRUCTOR)
         parameters = self._parse_parameters()
         visibility = self._parse_visibility()
 
-        self.tokens.expect(SYMBOL, SYM_LBRACE)
+        self.tokens.expect_symbol(SYM_LBRACE)
         body = self.dispatcher.parse_rule(RULE_STATEMENTS)
-        self.tokens.expect(SYMBOL, SYM_RBRACE)
+        self.tokens.expect_symbol(SYM_RBRACE)
 
-        return ConstructorNode(parameters, visibility, body)
+        return self.nodes.constructor(parameters, visibility, body)
 
     def _parse_parameters(self):
-        params = []
-        self.tokens.expect(SYMBOL, SYM_LPAREN)
-        while not self.tokens.match(SYMBOL, SYM_RPAREN):
+        params = self.nodes.sequence()
+        self.tokens.expect_symbol(SYM_LPAREN)
+        while not self.tokens.match_symbol(SYM_RPAREN):
             if params:
-                self.tokens.expect(SYMBOL, SYM_COMMA)
+                self.tokens.expect_symbol(SYM_COMMA)
             typ = self.tokens.current().value
             self.tokens.expect(KEYWORD)
             name = self.tokens.current().value
             self.tokens.expect(IDENTIFIER)
-            params.append(VariableNode(typ, name))
+            params.append(self.nodes.parameter(typ, name))
         return params
 
     def _parse_visibility(self):
-        tok = self.tokens.current()
-        if tok.type == KEYWORD and tok.value in KW_VISIBILITY:
-            self.tokens.advance()
-            return tok.value
-        return None
+        return self.tokens.match_keyword_in(KW_VISIBILITY)
@@ -1,59 +1,82 @@
 # arc42: 5.3.6 Contract Rule
-# This rule parses Solidity contract declarations. It handles:
-# - the contract keyword and name (header)
+# This rule parses Solidity contract, interface and library declarations.
+# It handles:
+# - the declaration kind, name and optional `is` base list (header)
 # - the opening and closing braces
 # - delegation of contract members (e.g. functions, variables) to other rules
 # The contract body is iterated token by token and parsed modularly via
 # the dispatcher.
 from solp.lexer.token_types import (
+    CTX_ABSTRACT,
+    CTX_IS,
     IDENTIFIER,
-    KEYWORD,
     KW_CONSTRUCTOR,
     KW_CONTRACT,
+    KW_CONTRACT_KINDS,
     KW_FUNCTION,
     KW_TYPES,
     RULE_FUNCTION,
     RULE_VARIABLE,
+    SYM_COMMA,
     SYM_LBRACE,
     SYM_RBRACE,
-    SYMBOL,
 )
-from solp.solidity_ast.nodes import ContractNode
+from solp.solidity_ast.factory import DEFAULT_NODE_FACTORY
 
 
 class ContractRule:
-    def __init__(self, tokens, dispatcher):
+    def __init__(self, tokens, dispatcher, nodes=None):
         # arc42: 5.3.6.1 Initialization
-        # The rule receives a token stream and a dispatcher used to
-        # invoke sub-rules
+        # The rule receives a token stream, a dispatcher used to
+        # invoke sub-rules and the node factory that builds the result
         self.tokens = tokens
         self.dispatcher = dispatcher
+        self.nodes = nodes if nodes is not None else DEFAULT_NODE_FACTORY
+        self.bases = []
 
     def parse(self):
         # arc42: 5.3.6.2 Entry Point
         # The main parsing method for a contract.
+        kind = self.parse_contract_kind()
         name = self.parse_contract_header()
         members = self.parse_members()
 
-        return ContractNode(name, members)
+        return self.nodes.contract(name, members, kind, self.bases)
+
+    def parse_contract_kind(self):
+        # arc42: 5.3.6.3 Declaration Kind
+        # Consumes an optional `abstract` prefix and returns the declaration
+        # keyword (contract, interface or library). The keyword itself is
+        # left for the header to consume.
+        self.tokens.match(IDENTIFIER, CTX_ABSTRACT)
+        return self.tokens.at_keyword_in(KW_CONTRACT_KINDS) or KW_CONTRACT
 
     def parse_contract_header(self):
-        # arc42: 5.3.6.3 Contract Header
-        # Parses the "contract" keyword, contract name, and opening brace
-        self.tokens.expect(KEYWORD, KW_CONTRACT)
+        # arc42: 5.3.6.4 Contract Header
+        # Parses the declaration keyword, contract name, the optional
+        # inheritance list (`is A, B`) and the opening brace
+        if self.tokens.match_keyword_in(KW_CONTRACT_KINDS) is None:
+            self.tokens.expect_keyword(KW_CONTRACT)
         self.tokens.expect(IDENTIFIER)
         name = self.tokens.last().value
-        self.tokens.expect(SYMBOL, SYM_LBRACE)
+
+        if self.tokens.match(IDENTIFIER, CTX_IS):
+            self.tokens.expect(IDENTIFIER)
+            self.bases.append(self.tokens.last().value)
+            while self.tokens.match_symbol(SYM_COMMA):
+                self.tokens.expect(IDENTIFIER)
+                self.bases.append(self.tokens.last().value)
+        self.tokens.expect_symbol(SYM_LBRACE)
 
         return name
 
     def parse_members(self):
-        members = []
+        members = self.nodes.sequence()
         while True:
-            if self.tokens.current() is None:
+            if self.tokens.at_end():
                 raise Exception("Unexpected EOF while parsing contract members")
 
-            if self.tokens.match(SYMBOL, SYM_RBRACE):
+            if self.tokens.match_symbol(SYM_RBRACE):
                 break
 
             member = self.next_member_or_skip()
@@ -76,14 +99,10 @@ class ContractRule:
         # arc42: 5.3.6.6 Member Dispatch
         # Checks which kind of member is next (e.g. function, variable)
         # and delegates to the corresponding rule via dispatcher.
-        current = self.tokens.current()
-        if not current:
-            return None
-
-        if current.type == KEYWORD and current.value == KW_FUNCTION:
+        if self.tokens.at_keyword(KW_FUNCTION):
             return self.dispatcher.parse_rule(RULE_FUNCTION)
-        if current.type == KEYWORD and current.value in KW_TYPES:
+        if self.tokens.at_keyword_in(KW_TYPES) is not None:
             return self.dispatcher.parse_rule(RULE_VARIABLE)
-        if current.type == KEYWORD and current.value == KW_CONSTRUCTOR:
+        if self.tokens.at_keyword(KW_CONSTRUCTOR):
             return self.dispatcher.parse_rule(KW_CONSTRUCTOR)
         return None
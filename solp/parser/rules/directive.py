@@ -0,0 +1,120 @@
+# arc42: 5.3.11 Directive Rules
+# Source-level directives that may appear before, between or after the
+# contract declarations of a file:
+# - `pragma <name> <value>;` e.g. `pragma solidity ^0.8.0;`
+# - `import "<path>";`, `import "<path>" as X;`, `import * as X from "<path>";`
+#   and `import {A, B as C} from "<path>";`
+# Results in PragmaNode and ImportNode entries of the SourceUnitNode.
+from solp.lexer.token_types import (
+    CTX_AS,
+    CTX_FROM,
+    IDENTIFIER,
+    KW_IMPORT,
+    KW_PRAGMA,
+    OP_STAR,
+    OPERATOR,
+    STRING,
+    SYM_COMMA,
+    SYM_DOT,
+    SYM_LBRACE,
+    SYM_RBRACE,
+    SYM_SEMICOLON,
+    SYMBOL,
+)
+from solp.solidity_ast.factory import DEFAULT_NODE_FACTORY
+
+# Operators that bind to the version number following them (`^0.8.0`).
+VERSION_PREFIX_OPERATORS = {"^", "~", "=", "<", "<=", ">", ">="}
+
+
+class PragmaRule:
+    def __init__(self, tokens, nodes=None):
+        self.tokens = tokens
+        self.nodes = nodes if nodes is not None else DEFAULT_NODE_FACTORY
+
+    def parse(self):
+        # arc42: 5.3.11.1 Pragma
+        # The pragma value is rebuilt from its tokens: version operators and
+        # dots are joined to their number, everything else is separated by
+        # one space (`>=0.8.0 <0.9.0`, `^0.8.0 || ^0.9.0`).
+        self.tokens.expect_keyword(KW_PRAGMA)
+        name = self.tokens.current().value
+        self.tokens.expect(IDENTIFIER)
+
+        value = ""
+        previous = None
+        while not self.tokens.match_symbol(SYM_SEMICOLON):
+            if self.tokens.at_end():
+                raise Exception("Unexpected EOF in pragma directive")
+            tok = self.tokens.current()
+            if previous is not None and not self._joins(previous, tok):
+                value += " "
+            value += tok.value
+            previous = tok
+            self.tokens.advance()
+
+        return self.nodes.pragma(name, value)
+
+    def _joins(self, previous, tok):
+        if tok.type == SYMBOL and tok.value == SYM_DOT:
+            return True
+        if previous.type == SYMBOL and previous.value == SYM_DOT:
+            return True
+        return previous.type == OPERATOR and previous.value in VERSION_PREFIX_OPERATORS
+
+
+class ImportRule:
+    def __init__(self, tokens, nodes=None):
+        self.tokens = tokens
+        self.nodes = nodes if nodes is not None else DEFAULT_NODE_FACTORY
+
+    def parse(self):
+        # arc42: 5.3.11.2 Import
+        # Dispatches on the token after `import`: a path string, `*` or a
+        # `{...}` symbol list.
+        self.tokens.expect_keyword(KW_IMPORT)
+
+        alias = None
+        symbols = None
+        if self.tokens.match(OPERATOR, OP_STAR):
+            alias = self._parse_alias()
+            path = self._parse_from()
+        elif self.tokens.match_symbol(SYM_LBRACE):
+            symbols = self._parse_symbols()
+            path = self._parse_from()
+        else:
+            path = self._parse_path()
+            if self._is_alias():
+                alias = self._parse_alias()
+        self.tokens.expect_symbol(SYM_SEMICOLON)
+
+        return self.nodes.import_(path, alias=alias, symbols=symbols)
+
+    def _parse_path(self):
+        path = self.tokens.current().value
+        self.tokens.expect(STRING)
+        return path
+
+    def _is_alias(self):
+        return self.tokens.at(IDENTIFIER, CTX_AS)
+
+    def _parse_alias(self):
+        self.tokens.expect(IDENTIFIER, CTX_AS)
+        self.tokens.expect(IDENTIFIER)
+        return self.tokens.last().value
+
+    def _parse_from(self):
+        self.tokens.expect(IDENTIFIER, CTX_FROM)
+        return self._parse_path()
+
+    def _parse_symbols(self):
+        # Parses `A, B as C }` into [("A", None), ("B", "C")]
+        symbols = self.nodes.sequence()
+        while not self.tokens.match_symbol(SYM_RBRACE):
+            if symbols:
+                self.tokens.expect_symbol(SYM_COMMA)
+            self.tokens.expect(IDENTIFIER)
+            name = self.tokens.last().value
+            alias = self._parse_alias() if self._is_alias() else None
+            symbols.append((name, alias))
+        return symbols
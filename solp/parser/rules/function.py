@@ -5,7 +5,8 @@
 # - Parse the parameter list
 # - Parse optional function modifiers (visibility, payable)
 # - Parse optional return types (via 'returns')
-# - Parse the function body using the delegated 'statements' rule
+# - Parse the function body using the delegated 'statements' rule, or a
+#   terminating ';' for bodiless declarations (interfaces, abstract members)
 # Output: A fully constructed FunctionNode in the AST
 from solp.lexer.token_types import (
     IDENTIFIER,
@@ -21,19 +22,21 @@ from solp.lexer.token_types import (
     SYM_LPAREN,
     SYM_RBRACE,
     SYM_RPAREN,
-    SYMBOL,
+    SYM_SEMICOLON,
 )
-from solp.solidity_ast.nodes import FunctionNode, VariableNode
+from solp.solidity_ast.factory import DEFAULT_NODE_FACTORY
 
 
 class FunctionRule:
-    def __init__(self, tokens, dispatcher):
+    def __init__(self, tokens, dispatcher, nodes=None):
         # arc42: 5.3.7.1 Initialization
         # Inputs:
         # - tokens: a token stream used for lookahead and matching
         # - dispatcher: used to invoke subrules (e.g. statements)
+        # - nodes: node factory building the FunctionNode and its parameters
         self.tokens = tokens
         self.dispatcher = dispatcher
+        self.nodes = nodes if nodes is not None else DEFAULT_NODE_FACTORY
 
     def parse(self):
         # arc42: 5.3.7.2 Entry Point
@@ -42,24 +45,32 @@ class FunctionRule:
         parameters = self.parse_parameters()
         visibility, is_payable = self.parse_modifiers()
         returns = self.parse_returns()
+        body = self.parse_body()
 
-        self.tokens.expect(SYMBOL, SYM_LBRACE)
-        body = self.dispatcher.parse_rule(RULE_STATEMENTS)
-        self.tokens.expect(SYMBOL, SYM_RBRACE)
-
-        return FunctionNode(
+        return self.nodes.function(
             name=name,
-            parameters=parameters,
             visibility=visibility,
             is_payable=is_payable,
+            parameters=parameters,
             returns=returns,
             body=body,
         )
 
+    def parse_body(self):
+        # arc42: 5.3.7.6 Body
+        # A declaration without implementation ends with ';' and has an
+        # empty body. Otherwise the block is parsed by the statements rule.
+        if self.tokens.match_symbol(SYM_SEMICOLON):
+            return None
+        self.tokens.expect_symbol(SYM_LBRACE)
+        body = self.dispatcher.parse_rule(RULE_STATEMENTS)
+        self.tokens.expect_symbol(SYM_RBRACE)
+        return body
+
     def _parse_function_header(self):
         # arc42: 5.3.7.2.1 Function Header
         # Matches 'function' keyword and extracts function name (identifier)
-        self.tokens.expect(KEYWORD, KW_FUNCTION)
+        self.tokens.expect_keyword(KW_FUNCTION)
         self.tokens.expect(IDENTIFIER)
         return self.tokens.last().value
 
@@ -67,16 +78,16 @@ class FunctionRule:
         # arc42: 5.3.7.3 Parameters
         # Parses parameter list enclosed in parentheses
         # Example: (uint amount, address recipient)
-        parameters = []
-        self.tokens.expect(SYMBOL, SYM_LPAREN)
-        while not self.tokens.match(SYMBOL, SYM_RPAREN):
+        parameters = self.nodes.sequence()
+        self.tokens.expect_symbol(SYM_LPAREN)
+        while not self.tokens.match_symbol(SYM_RPAREN):
             if parameters:
-                self.tokens.expect(SYMBOL, SYM_COMMA)
+                self.tokens.expect_symbol(SYM_COMMA)
             type_ = self.tokens.current().value
             self.tokens.expect(KEYWORD)
             name = self.tokens.current().value
             self.tokens.expect(IDENTIFIER)
-            parameters.append(VariableNode(type_, name))
+            parameters.append(self.nodes.parameter(type_, name))
         return parameters
 
     def parse_modifiers(self):
@@ -87,15 +98,11 @@ class FunctionRule:
         visibility = None
         is_payable = False
         while True:
-            tok = self.tokens.current()
-            if tok is None or tok.type != KEYWORD:
-                break
-            if tok.value in KW_VISIBILITY:
-                visibility = tok.value
-                self.tokens.advance()
-            elif tok.value == KW_PAYABLE:
+            keyword = self.tokens.match_keyword_in(KW_VISIBILITY)
+            if keyword is not None:
+                visibility = keyword
+            elif self.tokens.match_keyword(KW_PAYABLE):
                 is_payable = True
-                self.tokens.advance()
             else:
                 break
         return visibility, is_payable
@@ -105,14 +112,14 @@ class FunctionRule:
         # Parses optional return types defined using 'returns (...)'
         # Currently supports unnamed return types only
         # (e.g., returns (bool, uint))
-        if not self.tokens.match(KEYWORD, KW_RETURNS):
+        if not self.tokens.match_keyword(KW_RETURNS):
             return []
-        self.tokens.expect(SYMBOL, SYM_LPAREN)
-        returns = []
-        while not self.tokens.match(SYMBOL, SYM_RPAREN):
+        self.tokens.expect_symbol(SYM_LPAREN)
+        returns = self.nodes.sequence()
+        while not self.tokens.match_symbol(SYM_RPAREN):
             if returns:
-                self.tokens.expect(SYMBOL, SYM_COMMA)
+                self.tokens.expect_symbol(SYM_COMMA)
             type_ = self.tokens.current().value
             self.tokens.expect(KEYWORD)
-            returns.append(VariableNode(type_, SYM_EMPTY))
+            returns.append(self.nodes.parameter(type_, SYM_EMPTY))
         return returns
@@ -0,0 +1,54 @@
+# arc42: 5.3.12 Source Unit Rule
+# A source unit is a complete Solidity file: any sequence of pragma and
+# import directives and contract, interface and library declarations.
+# The rule can either collect all top-level nodes into a SourceUnitNode or
+# yield them one by one as soon as each is parsed. Together with a lazily
+# filled TokenStream, the first declaration of a large file is available
+# before the rest of the file has been lexed.
+from solp.lexer.token_types import (
+    CTX_ABSTRACT,
+    IDENTIFIER,
+    KW_CONTRACT_KINDS,
+    KW_IMPORT,
+    KW_PRAGMA,
+    RULE_CONTRACT,
+    RULE_IMPORT,
+    RULE_PRAGMA,
+)
+from solp.solidity_ast.factory import DEFAULT_NODE_FACTORY
+
+
+class SourceUnitRule:
+    def __init__(self, tokens, dispatcher, nodes=None):
+        self.tokens = tokens
+        self.dispatcher = dispatcher
+        self.nodes = nodes if nodes is not None else DEFAULT_NODE_FACTORY
+
+    def parse(self):
+        # arc42: 5.3.12.1 Entry Point
+        # Parses the whole token stream into a SourceUnitNode.
+        children = self.nodes.sequence()
+        for declaration in self.iter_declarations():
+            children.append(declaration)
+        return self.nodes.source_unit(children)
+
+    def iter_declarations(self):
+        # arc42: 5.3.12.2 Streaming
+        # Yields every top-level node as soon as it has been parsed.
+        while not self.tokens.at_end():
+            yield self.parse_declaration()
+
+    def parse_declaration(self):
+        # arc42: 5.3.12.3 Declaration Dispatch
+        # Delegates to the directive rules or the contract rule; anything
+        # else is not valid at file level.
+        if self.tokens.at_keyword(KW_PRAGMA):
+            return self.dispatcher.parse_rule(RULE_PRAGMA)
+        if self.tokens.at_keyword(KW_IMPORT):
+            return self.dispatcher.parse_rule(RULE_IMPORT)
+        if self.tokens.at_keyword_in(KW_CONTRACT_KINDS) is not None:
+            return self.dispatcher.parse_rule(RULE_CONTRACT)
+        if self.tokens.at(IDENTIFIER, CTX_ABSTRACT):
+            return self.dispatcher.parse_rule(RULE_CONTRACT)
+        current = self.tokens.current()
+        raise Exception(f"Unexpected token at source unit level: {current}")
@@ -3,63 +3,72 @@
 #
 # Supported:
 # - return statements (`return;`, `return expr;`)
+# - local declarations (e.g. `uint x = y;`, `Foo.Bar memory b;`)
 # - assignment statements (e.g. `x = 1;`, `y += 2;`)
 # - expression statements (e.g. `require(x > 0);`)
 #
+# Declarations, assignments and expression statements can all start with
+# an identifier and are only told apart several tokens later. Their
+# headers are parsed speculatively through TokenStream.speculate() (see
+# 5.3.1.10): a header that does not apply resets the cursor. All three
+# begin with the same dotted name path (`Foo.Bar`, `x`, `msg.sender`),
+# which is a speculative rule of its own: it is parsed once per position,
+# and the alternatives tried after the first reuse the memoized result.
 from solp.lexer.token_types import (
     IDENTIFIER,
     KEYWORD,
+    KW_ADDRESS,
+    KW_DATA_LOCATIONS,
+    KW_PAYABLE,
     KW_RETURN,
+    KW_TYPES,
+    OP_ASSIGN,
     OPERATOR,
     RULE_ASSERT,
     RULE_ASSIGNMENT,
     RULE_BREAK,
     RULE_CONTINUE,
+    RULE_DECLARATION,
     RULE_ELSE,
     RULE_EMIT,
     RULE_EXPRESSION,
     RULE_FOR,
     RULE_IF,
+    RULE_PATH,
     RULE_REQUIRE,
     RULE_REVERT,
     RULE_WHILE,
     SYM_COMMA,
     SYM_DOT,
     SYM_LBRACE,
+    SYM_LBRACKET,
     SYM_LPAREN,
     SYM_RBRACE,
+    SYM_RBRACKET,
     SYM_RPAREN,
     SYM_SEMICOLON,
-    SYMBOL,
-)
-from solp.solidity_ast.nodes import (
-    CallNode,
-    ForNode,
-    IfNode,
-    ReturnNode,
-    StatementNode,
-    WhileNode,
 )
+from solp.solidity_ast.factory import DEFAULT_NODE_FACTORY
 from solp.utils.errors import EXPECTED_AFTER_DOT, INVALID_EXPRESSION_START
 
 
 class StatementRule:
-    def __init__(self, tokens, dispatcher=None):
+    def __init__(self, tokens, dispatcher=None, nodes=None):
         # arc42: 5.3.9.1 Initialization
         # Token stream is passed; dispatcher reserved for future
-        # rule delegation.
+        # rule delegation. Nodes are built through the injected node factory.
         self.tokens = tokens
+        self.nodes = nodes if nodes is not None else DEFAULT_NODE_FACTORY
 
     def parse(self):
         # Parses a block of statements inside a function
-        statements = []
+        statements = self.nodes.sequence()
         depth = 1  # count function-body braces
         while depth > 0:
-            current = self.tokens.current()
-            if not current:
+            if self.tokens.at_end():
                 raise Exception("Unexpected EOF in function body")
 
-            if current.type == SYMBOL and current.value == "}":
+            if self.tokens.at_symbol(SYM_RBRACE):
                 break  # Stop parsing function body here
 
             stmt = self.parse_statement()
@@ -73,8 +82,18 @@ class StatementRule:
         # Dispatches to specific parsers based on token pattern.
         if self._is_return():
             return self._parse_return()
+        if self._may_declare():
+            # A type followed by something other than a variable name is
+            # an assignment or expression; fall through to them.
+            stmt = self._parse_declaration()
+            if stmt:
+                return stmt
         if self._is_assignment():
-            return self._parse_assignment()
+            # An identifier that is not followed by an operator starts an
+            # expression statement (e.g. `foo(x);`); fall through to it.
+            stmt = self._parse_assignment()
+            if stmt:
+                return stmt
         if self._is_require_call():
             return self._parse_require()
         if self._is_if():
@@ -96,74 +115,123 @@ class StatementRule:
         return self._parse_expression_statement()
 
     def _is_return(self):
-        return self._tok(KEYWORD, KW_RETURN)
+        return self.tokens.at_keyword(KW_RETURN)
 
     def _is_assignment(self):
-        return self.tokens.current().type == IDENTIFIER
+        return self.tokens.at(IDENTIFIER)
+
+    def _may_declare(self):
+        return (
+            self.tokens.at(IDENTIFIER)
+            or self.tokens.at_keyword_in(KW_TYPES) is not None
+        )
 
     def _parse_return(self):
         # arc42: 5.3.9.4 Return Statement
-        self.tokens.expect(KEYWORD, KW_RETURN)
-        if self._tok(SYMBOL, SYM_SEMICOLON):
-            self.tokens.advance()
-            return ReturnNode(value=None)
+        self.tokens.expect_keyword(KW_RETURN)
+        if self.tokens.match_symbol(SYM_SEMICOLON):
+            return self.nodes.return_(None)
         value = self.parse_expression()
-        self.tokens.expect(SYMBOL, SYM_SEMICOLON)
-        return ReturnNode(value=value)
+        self.tokens.expect_symbol(SYM_SEMICOLON)
+        return self.nodes.return_(value)
 
     def _parse_require(self):
-        self.tokens.expect(KEYWORD, RULE_REQUIRE)
-        self.tokens.expect(SYMBOL, SYM_LPAREN)
+        self.tokens.expect_keyword(RULE_REQUIRE)
+        self.tokens.expect_symbol(SYM_LPAREN)
 
-        args = []
-        while not self._tok(SYMBOL, SYM_RPAREN):
+        args = self.nodes.sequence()
+        while not self.tokens.at_symbol(SYM_RPAREN):
             if args:
-                self.tokens.expect(SYMBOL, SYM_COMMA)
+                self.tokens.expect_symbol(SYM_COMMA)
             args.append(self.parse_expression())
 
-        self.tokens.expect(SYMBOL, SYM_RPAREN)
-        self.tokens.expect(SYMBOL, SYM_SEMICOLON)
+        self.tokens.expect_symbol(SYM_RPAREN)
+        self.tokens.expect_symbol(SYM_SEMICOLON)
 
-        return StatementNode(
-            RULE_EXPRESSION, expr=CallNode(RULE_REQUIRE, arguments=args)
+        return self.nodes.statement(
+            RULE_EXPRESSION, expr=self.nodes.call(RULE_REQUIRE, args)
         )
 
-    def _parse_assignment(self):
-        left = self.tokens.current().value
-        self.tokens.expect(IDENTIFIER)
+    def _parse_declaration(self):
+        # arc42: 5.3.9.12 Local Declarations
+        # `type [location] name [= value];` with elementary or (dotted)
+        # user-defined types, `address payable` and `[]` array suffixes.
+        # Result is a
+        # StatementNode("declaration") with var_type, location, name and
+        # value (None without initializer).
+        header = self.tokens.speculate(RULE_DECLARATION, self._declaration_header)
+        if header is None:
+            return None
+        var_type, location, name = header
+        value = None
+        if self.tokens.match(OPERATOR, OP_ASSIGN):
+            value = self.parse_expression()
+        self.tokens.expect_symbol(SYM_SEMICOLON)
+        return self.nodes.statement(
+            RULE_DECLARATION,
+            var_type=var_type,
+            location=location,
+            name=name,
+            value=value,
+        )
 
-        if not self._is_operator():
-            self._rewind()
+    def _declaration_header(self):
+        # Speculative: returns (type, location, name) if a declaration
+        # starts here and is followed by `=` or `;`, otherwise None.
+        var_type = self.tokens.speculate(RULE_PATH, self._name_path)
+        if var_type == KW_ADDRESS and self.tokens.match_keyword(KW_PAYABLE):
+            var_type += " " + KW_PAYABLE
+        while self.tokens.match_symbol(SYM_LBRACKET):
+            if not self.tokens.match_symbol(SYM_RBRACKET):
+                return None
+            var_type += SYM_LBRACKET + SYM_RBRACKET
+
+        location = self.tokens.match_keyword_in(KW_DATA_LOCATIONS)
+
+        if not self.tokens.at(IDENTIFIER):
             return None
+        name = self.tokens.advance().value
+        if self.tokens.at(OPERATOR, OP_ASSIGN):
+            return var_type, location, name
+        if self.tokens.at_symbol(SYM_SEMICOLON):
+            return var_type, location, name
+        return None
 
-        op = self.tokens.current().value
-        self.tokens.expect(OPERATOR)
+    def _parse_assignment(self):
+        # arc42: 5.3.9.13 Assignment
+        # An identifier followed by an operator; anything else leaves the
+        # cursor unchanged for the expression statement.
+        target = self.tokens.speculate(RULE_ASSIGNMENT, self._assignment_target)
+        if target is None:
+            return None
+        left, op = target
         right = self.parse_expression()
-        self.tokens.expect(SYMBOL, SYM_SEMICOLON)
+        self.tokens.expect_symbol(SYM_SEMICOLON)
 
-        return StatementNode(RULE_ASSIGNMENT, left=left, operator=op, right=right)
+        return self.nodes.statement(
+            RULE_ASSIGNMENT, left=left, operator=op, right=right
+        )
 
     def _parse_if(self):
         # arc42: 5.3.9.6 If Statement
         # Parses conditional control flow with optional else blocks.
         # Supports syntax: if (cond) { ... } else { ... }
-        self.tokens.expect(KEYWORD, RULE_IF)
-        self.tokens.expect(SYMBOL, SYM_LPAREN)
+        self.tokens.expect_keyword(RULE_IF)
+        self.tokens.expect_symbol(SYM_LPAREN)
         condition = self.parse_expression()
-        self.tokens.expect(SYMBOL, SYM_RPAREN)
+        self.tokens.expect_symbol(SYM_RPAREN)
 
-        self.tokens.expect(SYMBOL, SYM_LBRACE)
+        self.tokens.expect_symbol(SYM_LBRACE)
         then_block = self.parse()
-        self.tokens.expect(SYMBOL, SYM_RBRACE)
+        self.tokens.expect_symbol(SYM_RBRACE)
 
         else_block = None
-        if self._tok(KEYWORD, RULE_ELSE):
-            self.tokens.advance()
-            self.tokens.expect(SYMBOL, SYM_LBRACE)
+        if self.tokens.match_keyword(RULE_ELSE):
+            self.tokens.expect_symbol(SYM_LBRACE)
             else_block = self.parse()
-            self.tokens.expect(SYMBOL, SYM_RBRACE)
+            self.tokens.expect_symbol(SYM_RBRACE)
 
-        return IfNode(condition=condition, then_block=then_block, else_block=else_block)
+        return self.nodes.if_(condition, then_block, else_block)
 
     def _parse_emit(self):
         # arc42: 5.3.9.8 Emit Statement
@@ -173,37 +241,37 @@ class StatementRule:
         # comma-separated argument list in parentheses. The result is a
         # StatementNode with type "emit", including the event name
         # and arguments.
-        self.tokens.expect(KEYWORD, RULE_EMIT)
+        self.tokens.expect_keyword(RULE_EMIT)
         event_name = self.tokens.current().value
         self.tokens.expect(IDENTIFIER)
-        self.tokens.expect(SYMBOL, SYM_LPAREN)
+        self.tokens.expect_symbol(SYM_LPAREN)
 
-        args = []
-        while not self._tok(SYMBOL, SYM_RPAREN):
+        args = self.nodes.sequence()
+        while not self.tokens.at_symbol(SYM_RPAREN):
             if args:
-                self.tokens.expect(SYMBOL, SYM_COMMA)
+                self.tokens.expect_symbol(SYM_COMMA)
             args.append(self.parse_expression())
 
-        self.tokens.expect(SYMBOL, SYM_RPAREN)
-        self.tokens.expect(SYMBOL, SYM_SEMICOLON)
+        self.tokens.expect_symbol(SYM_RPAREN)
+        self.tokens.expect_symbol(SYM_SEMICOLON)
 
-        return StatementNode(RULE_EMIT, event=event_name, arguments=args)
+        return self.nodes.statement(RULE_EMIT, event=event_name, arguments=args)
 
     def _parse_while(self):
         # arc42: 5.3.9.9 While Statement
         # Parses Solidity while-loops of the form:
         #   while (condition) { ... }
         # Condition is an expression, body is a block of statements.
-        self.tokens.expect(KEYWORD, RULE_WHILE)
-        self.tokens.expect(SYMBOL, SYM_LPAREN)
+        self.tokens.expect_keyword(RULE_WHILE)
+        self.tokens.expect_symbol(SYM_LPAREN)
         condition = self.parse_expression()
-        self.tokens.expect(SYMBOL, SYM_RPAREN)
+        self.tokens.expect_symbol(SYM_RPAREN)
 
-        self.tokens.expect(SYMBOL, SYM_LBRACE)
+        self.tokens.expect_symbol(SYM_LBRACE)
         body = self.parse()
-        self.tokens.expect(SYMBOL, SYM_RBRACE)
+        self.tokens.expect_symbol(SYM_RBRACE)
 
-        return WhileNode(condition, body)
+        return self.nodes.while_(condition, body)
 
     def _parse_for(self):
         # arc42: 5.3.9.10 For Statement
@@ -211,34 +279,32 @@ class StatementRule:
         #   for ([init]; [condition]; [increment]) { ... }
         # Each section is optional. Condition and increment are expressions.
         # Body is a list of statements. Result is a ForNode.
-        self.tokens.expect(KEYWORD, RULE_FOR)
-        self.tokens.expect(SYMBOL, SYM_LPAREN)
+        self.tokens.expect_keyword(RULE_FOR)
+        self.tokens.expect_symbol(SYM_LPAREN)
 
         # --- Initializer (can be statement or empty) ---
         init = None
-        if not self._tok(SYMBOL, SYM_SEMICOLON):
+        if not self.tokens.match_symbol(SYM_SEMICOLON):
             init = self.parse_statement()
-        else:
-            self.tokens.expect(SYMBOL, SYM_SEMICOLON)
 
         # --- Condition ---
         condition = None
-        if not self._tok(SYMBOL, SYM_SEMICOLON):
+        if not self.tokens.at_symbol(SYM_SEMICOLON):
             condition = self.parse_expression()
-        self.tokens.expect(SYMBOL, SYM_SEMICOLON)
+        self.tokens.expect_symbol(SYM_SEMICOLON)
 
         # --- Increment (expression or nothing) ---
         increment = None
-        if not self._tok(SYMBOL, SYM_RPAREN):
+        if not self.tokens.at_symbol(SYM_RPAREN):
             increment = self.parse_expression()
-        self.tokens.expect(SYMBOL, SYM_RPAREN)
+        self.tokens.expect_symbol(SYM_RPAREN)
 
         # --- Body ---
-        self.tokens.expect(SYMBOL, SYM_LBRACE)
+        self.tokens.expect_symbol(SYM_LBRACE)
         body = self.parse()
-        self.tokens.expect(SYMBOL, SYM_RBRACE)
+        self.tokens.expect_symbol(SYM_RBRACE)
 
-        return ForNode(init=init, condition=condition, increment=increment, body=body)
+        return self.nodes.for_(init, condition, increment, body)
 
     def _parse_break(self):
         # arc42: 5.3.9.11 Break & Continue
@@ -247,14 +313,14 @@ class StatementRule:
         # - continue;
         # Each consists of a keyword followed by a semicolon.
         # Returned as StatementNode("break") or StatementNode("continue").
-        self.tokens.expect(KEYWORD, RULE_BREAK)
-        self.tokens.expect(SYMBOL, SYM_SEMICOLON)
-        return StatementNode(RULE_BREAK)
+        self.tokens.expect_keyword(RULE_BREAK)
+        self.tokens.expect_symbol(SYM_SEMICOLON)
+        return self.nodes.statement(RULE_BREAK)
 
     def _parse_continue(self):
-        self.tokens.expect(KEYWORD, RULE_CONTINUE)
-        self.tokens.expect(SYMBOL, SYM_SEMICOLON)
-        return StatementNode(RULE_CONTINUE)
+        self.tokens.expect_keyword(RULE_CONTINUE)
+        self.tokens.expect_symbol(SYM_SEMICOLON)
+        return self.nodes.statement(RULE_CONTINUE)
 
     def _parse_revert(self):
         return self._parse_builtin(RULE_REVERT)
@@ -264,54 +330,57 @@ class StatementRule:
 
     def _parse_expression_statement(self):
         expr = self.parse_expression()
-        self.tokens.expect(SYMBOL, SYM_SEMICOLON)
-        return StatementNode(RULE_EXPRESSION, expr=expr)
+        self.tokens.expect_symbol(SYM_SEMICOLON)
+        return self.nodes.statement(RULE_EXPRESSION, expr=expr)
 
     # TODO: Implement full expression parsing with precedence and binary
     #  operations
     def parse_expression(self):
         # arc42: 5.3.9.5 Expression Parser
-        parts = []
         if not self._starts_expression():
             msg = INVALID_EXPRESSION_START.format(token=self.tokens.current())
             raise Exception(msg)
 
-        parts.append(self.tokens.current().value)
-        self.tokens.advance()
-
-        while self.tokens.match(SYMBOL, SYM_DOT):
-            if self.tokens.current().type not in {IDENTIFIER, KEYWORD}:
-                raise Exception(EXPECTED_AFTER_DOT)
-            parts.append(self.tokens.current().value)
-            self.tokens.advance()
-
-        full_name = SYM_DOT.join(parts)
-        if not self.tokens.match(SYMBOL, SYM_LPAREN):
+        full_name = self.tokens.speculate(RULE_PATH, self._name_path)
+        if not self.tokens.match_symbol(SYM_LPAREN):
             return full_name
 
-        args = []
+        args = self.nodes.sequence()
         while True:
-            if self._tok(SYMBOL, SYM_RPAREN):
-                self.tokens.advance()
+            if self.tokens.match_symbol(SYM_RPAREN):
                 break
             if args:
-                self.tokens.expect(SYMBOL, SYM_COMMA)
+                self.tokens.expect_symbol(SYM_COMMA)
             args.append(self.parse_expression())
 
-        return CallNode(function=full_name, arguments=args)
-
-    def _tok(self, type_, value=None):
-        t = self.tokens.current()
-        return t and t.type == type_ and (value is None or t.value == value)
+        return self.nodes.call(full_name, args)
 
     def _is_operator(self):
-        return self.tokens.current().type == OPERATOR
+        return self.tokens.at(OPERATOR)
 
     def _starts_expression(self):
-        return self.tokens.current().type in {IDENTIFIER, KEYWORD}
+        return self.tokens.at(IDENTIFIER) or self.tokens.at(KEYWORD)
+
+    def _name_path(self):
+        # Speculative, shared by declarations, assignments and expressions:
+        # the current token and any `.member` parts, joined with dots. A
+        # dot without a following name is invalid in every alternative, so
+        # it raises instead of returning None.
+        parts = [self.tokens.current().value]
+        self.tokens.advance()
+        while self.tokens.match_symbol(SYM_DOT):
+            if not self._starts_expression():
+                raise Exception(EXPECTED_AFTER_DOT)
+            parts.append(self.tokens.current().value)
+            self.tokens.advance()
+        return SYM_DOT.join(parts)
 
-    def _rewind(self):
-        self.tokens.index -= 1
+    def _assignment_target(self):
+        # Speculative: returns (left, operator) and consumes both, or None.
+        left = self.tokens.speculate(RULE_PATH, self._name_path)
+        if not self._is_operator():
+            return None
+        return left, self.tokens.advance().value
 
     def _parse_builtin(self, name):
         # arc42: 5.3.9.7 Revert and Assert Statements
@@ -320,44 +389,43 @@ class StatementRule:
         # - assert(condition);
         # Syntax and structure are unified with require(...) and reused
         # through a shared method.
-        self.tokens.expect(KEYWORD, name)
-        self.tokens.expect(SYMBOL, SYM_LPAREN)
+        self.tokens.expect_keyword(name)
+        self.tokens.expect_symbol(SYM_LPAREN)
 
-        args = []
-        while not self._tok(SYMBOL, SYM_RPAREN):
+        args = self.nodes.sequence()
+        while not self.tokens.at_symbol(SYM_RPAREN):
             if args:
-                self.tokens.expect(SYMBOL, SYM_COMMA)
+                self.tokens.expect_symbol(SYM_COMMA)
             args.append(self.parse_expression())
 
-        self.tokens.expect(SYMBOL, SYM_RPAREN)
-        self.tokens.expect(SYMBOL, SYM_SEMICOLON)
+        self.tokens.expect_symbol(SYM_RPAREN)
+        self.tokens.expect_symbol(SYM_SEMICOLON)
 
-        return StatementNode(name, arguments=args)
+        return self.nodes.statement(name, arguments=args)
 
     def _is_require_call(self):
-        tok = self.tokens.current()
-        return tok.type == KEYWORD and tok.value == RULE_REQUIRE
+        return self.tokens.at_keyword(RULE_REQUIRE)
 
     def _is_if(self):
-        return self._tok(KEYWORD, RULE_IF)
+        return self.tokens.at_keyword(RULE_IF)
 
     def _is_revert(self):
-        return self._tok(KEYWORD, RULE_REVERT)
+        return self.tokens.at_keyword(RULE_REVERT)
 
     def _is_assert(self):
-        return self._tok(KEYWORD, RULE_ASSERT)
+        return self.tokens.at_keyword(RULE_ASSERT)
 
     def _is_emit(self):
-        return self._tok(KEYWORD, RULE_EMIT)
+        return self.tokens.at_keyword(RULE_EMIT)
 
     def _is_while(self):
-        return self._tok(KEYWORD, RULE_WHILE)
+        return self.tokens.at_keyword(RULE_WHILE)
 
     def _is_for(self):
-        return self._tok(KEYWORD, RULE_FOR)
+        return self.tokens.at_keyword(RULE_FOR)
 
     def _is_break(self):
-        return self._tok(KEYWORD, RULE_BREAK)
+        return self.tokens.at_keyword(RULE_BREAK)
 
     def _is_continue(self):
-        return self._tok(KEYWORD, RULE_CONTINUE)
+        return self.tokens.at_keyword(RULE_CONTINUE)
@@ -10,16 +10,16 @@ from solp.lexer.token_types import (
     KEYWORD,
     KW_VISIBILITY,
     SYM_SEMICOLON,
-    SYMBOL,
 )
-from solp.solidity_ast.nodes import VariableNode
+from solp.solidity_ast.factory import DEFAULT_NODE_FACTORY
 
 
 class VariableRule:
-    def __init__(self, tokens):
+    def __init__(self, tokens, nodes=None):
         # arc42: 5.3.8.1 Initialization
         # This rule does not need a dispatcher; parsing is self-contained.
         self.tokens = tokens
+        self.nodes = nodes if nodes is not None else DEFAULT_NODE_FACTORY
 
     def parse(self):
         # arc42: 5.3.8.2 Entry Point
@@ -27,16 +27,10 @@ class VariableRule:
         var_type = self.tokens.current().value
         self.tokens.expect(KEYWORD)
 
-        visibility = None
-        if (
-            self.tokens.current().type == KEYWORD
-            and self.tokens.current().value in KW_VISIBILITY
-        ):
-            visibility = self.tokens.current().value
-            self.tokens.advance()
+        visibility = self.tokens.match_keyword_in(KW_VISIBILITY)
 
         name = self.tokens.current().value
         self.tokens.expect(IDENTIFIER)
-        self.tokens.expect(SYMBOL, SYM_SEMICOLON)
+        self.tokens.expect_symbol(SYM_SEMICOLON)
 
-        return VariableNode(var_type=var_type, name=name, visibility=visibility)
+        return self.nodes.variable(var_type, name, visibility)
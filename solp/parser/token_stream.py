@@ -7,43 +7,103 @@
 # - Provide peekable access to the current and upcoming tokens
 # - Offer utility functions for advancing and consuming tokens
 # - Centralize matching and error reporting for expected patterns
-# - Prevent out-of-bounds access by returning None safely
+# - Terminate every stream with a sentinel EOF token instead of None
+# - Pull tokens lazily when constructed from an iterator instead of a list
+#
+# Sentinel: the buffer always ends with one EOF token (type EOF, empty
+# value) positioned at the last real token. The cursor never moves past it,
+# so current() and peek() are plain indexed reads that never return None
+# and rules test `tok.type == EOF` (or at_end()) instead of guarding against
+# None. For lazy streams the buffer always holds the current token; the EOF
+# token is appended when the source is exhausted.
+#
+# Hot paths: match_symbol(ch) / match_keyword(kw) and their expect_/at_
+# variants compare value and type of the current token directly, without
+# the generic optional-value handling of match(type_, value). Keyword sets
+# (visibilities, types, contract kinds) use at_keyword_in() and
+# match_keyword_in(), which return the matched keyword. Rules test tokens
+# only through these methods (or at()/match() for other token types).
+#
+# Speculation: mark() / reset(mark) save and restore the cursor, so a rule
+# can look arbitrarily far ahead and back out. speculate(rule, parse) adds a
+# packrat memo keyed by (rule, position): each speculative alternative runs
+# at most once per position, and later attempts replay the stored outcome
+# and end position, which keeps backtracking parses linear.
+#
+# The cursor (`index`), the lazy buffer and the memo are per-instance state
+# that rules move freely. A TokenStream, like the Parser and RuleDispatcher
+# around it, belongs to exactly one parse and must not be shared between
+# threads; the token list it wraps may be shared read-only.
+from solp.lexer.token import Token
+from solp.lexer.token_types import EOF, KEYWORD, SYM_EMPTY, SYMBOL
 
 
 class TokenStream:
     def __init__(self, tokens):
         # arc42: 5.3.1.1 Initialization
-        # The token list is stored, and the internal cursor
-        # is initialized to 0.
-        self.tokens = tokens
+        # A token list is copied with the EOF sentinel appended (the
+        # caller's list is left untouched). Any other iterable (e.g.
+        # Lexer.iter_tokens()) is buffered on demand as the cursor moves
+        # forward. The cursor is initialized to 0.
+        if isinstance(tokens, list):
+            self.tokens = tokens + [_eof(tokens[-1] if tokens else None)]
+            self._source = None
+        else:
+            self.tokens = []
+            self._source = iter(tokens)
+            self._fill(0)
         self.index = 0
+        self.memo = {}
 
     def peek(self, offset=0):
         # arc42: 5.3.1.2 Peek
-        # Returns the token at a given offset from the current index,
-        # or None if the offset would go out of bounds.
-        if self.index + offset < len(self.tokens):
-            return self.tokens[self.index + offset]
-        return None
+        # Returns the token at a given offset from the current index, or
+        # the EOF token if the offset reaches beyond the end.
+        position = self.index + offset
+        if position < len(self.tokens) or self._fill(position):
+            return self.tokens[position]
+        return self.tokens[-1]
+
+    def _fill(self, position):
+        # arc42: 5.3.1.2.1 Lazy Buffering
+        # Pulls tokens from the source iterator until `position` exists.
+        # Once the source is exhausted the EOF token is appended and False
+        # is returned.
+        if self._source is None:
+            return False
+        for tok in self._source:
+            self.tokens.append(tok)
+            if position < len(self.tokens):
+                return True
+        self._source = None
+        self.tokens.append(_eof(self.tokens[-1] if self.tokens else None))
+        return position < len(self.tokens)
 
     def current(self):
         # arc42: 5.3.1.3 Current
-        # Shortcut for self.peek(0), returns the current token.
-        return self.peek(0)
+        # Returns the current token; the EOF token at the end.
+        return self.tokens[self.index]
+
+    def at_end(self):
+        return self.tokens[self.index].type == EOF
 
     def advance(self):
         # arc42: 5.3.1.4 Advance
-        # Moves the cursor forward and returns the consumed token.
-        tok = self.current()
-        self.index += 1
+        # Moves the cursor forward and returns the consumed token. At the
+        # end the cursor stays on the EOF token.
+        tok = self.tokens[self.index]
+        if tok.type != EOF:
+            self.index += 1
+            if self.index == len(self.tokens):
+                self._fill(self.index)
         return tok
 
     def match(self, type_, value=None):
         # arc42: 5.3.1.5 Match
         # If the current token matches the expected type and value,
         # advances the stream and returns True. Otherwise returns False.
-        tok = self.current()
-        if tok and tok.type == type_ and (value is None or tok.value == value):
+        tok = self.tokens[self.index]
+        if tok.type == type_ and (value is None or tok.value == value):
             self.advance()
             return True
         return False
@@ -56,8 +116,102 @@ class TokenStream:
             return
         raise Exception(f"Expected {type_} {value or ''} " f"but got {self.current()}")
 
+    def match_symbol(self, symbol):
+        # arc42: 5.3.1.8 Specialized Matching
+        # Consumes the current token if it is the given symbol. The value
+        # is compared first: it is the more selective test, and an EOF or
+        # keyword token never has a symbol as value.
+        tok = self.tokens[self.index]
+        if tok.value == symbol and tok.type == SYMBOL:
+            self.index += 1
+            if self.index == len(self.tokens):
+                self._fill(self.index)
+            return True
+        return False
+
+    def match_keyword(self, keyword):
+        tok = self.tokens[self.index]
+        if tok.value == keyword and tok.type == KEYWORD:
+            self.index += 1
+            if self.index == len(self.tokens):
+                self._fill(self.index)
+            return True
+        return False
+
+    def expect_symbol(self, symbol):
+        if not self.match_symbol(symbol):
+            raise Exception(f"Expected {SYMBOL} {symbol} but got {self.current()}")
+
+    def expect_keyword(self, keyword):
+        if not self.match_keyword(keyword):
+            raise Exception(f"Expected {KEYWORD} {keyword} but got {self.current()}")
+
+    def at_symbol(self, symbol):
+        # Non-consuming variants of match_symbol() / match_keyword().
+        tok = self.tokens[self.index]
+        return tok.value == symbol and tok.type == SYMBOL
+
+    def at_keyword(self, keyword):
+        tok = self.tokens[self.index]
+        return tok.value == keyword and tok.type == KEYWORD
+
+    def at_keyword_in(self, keywords):
+        # Returns the current keyword if it is in `keywords`, else None.
+        tok = self.tokens[self.index]
+        if tok.type == KEYWORD and tok.value in keywords:
+            return tok.value
+        return None
+
+    def match_keyword_in(self, keywords):
+        # Consuming variant of at_keyword_in().
+        keyword = self.at_keyword_in(keywords)
+        if keyword is not None:
+            self.advance()
+        return keyword
+
+    def at(self, type_, value=None):
+        # Non-consuming variant of match().
+        tok = self.tokens[self.index]
+        return tok.type == type_ and (value is None or tok.value == value)
+
+    def mark(self):
+        # arc42: 5.3.1.9 Checkpoints
+        # Returns a checkpoint of the cursor for reset(). Tokens before the
+        # cursor stay buffered, so lazy streams can be reset as well.
+        return self.index
+
+    def reset(self, mark):
+        self.index = mark
+
+    def speculate(self, rule, parse):
+        # arc42: 5.3.1.10 Packrat Memo
+        # Runs `parse()` at the current position unless (rule, position)
+        # was tried before. `parse` returns None if its alternative does
+        # not apply; the cursor is then reset to the start. On success the
+        # cursor is left after the consumed tokens. Speculative parsers
+        # should not call the node factory: their result is shared by every
+        # attempt at the same position.
+        key = (rule, self.index)
+        entry = self.memo.get(key)
+        if entry is None:
+            start = self.mark()
+            result = parse()
+            if result is None:
+                self.reset(start)
+            entry = self.memo[key] = (result, self.index)
+        self.index = entry[1]
+        return entry[0]
+
     def last(self):
         # arc42: 5.3.1.7 Last
         # Returns the last consumed token, or None if no tokens have
         # been consumed yet.
         return self.tokens[self.index - 1] if self.index > 0 else None
+
+
+def _eof(last):
+    # The EOF token carries the position of the last real token, so errors
+    # at the end of the input are reported where the input stops.
+    if last is None:
+        return Token(EOF, SYM_EMPTY, None, None)
+    return Token(EOF, SYM_EMPTY, last.line, last.col)
@@ -0,0 +1,204 @@
+# arc42: 5.8 Project Loader
+# The project loader turns a set of root files into a parsed project. It
+# resolves `import` directives against the local filesystem, builds the
+# import dependency graph and parses every reachable file exactly once.
+#
+# Stages:
+# 1. Discovery: starting at the roots, each file is scanned with the fast
+#    header scanner (5.7) and its imports are resolved to absolute paths.
+# 2. Scheduling: files are parsed in topological order of the dependency
+#    graph. A file is submitted to the worker pool as soon as all files it
+#    imports have been parsed, so independent files are parsed concurrently.
+#    Import cycles (legal in Solidity) are broken by releasing the blocked
+#    files once nothing else can make progress.
+# 3. Result: a Project mapping each path to its SourceUnitNode.
+#
+# Workers receive only a path and read the file themselves, so nothing but
+# the resulting AST crosses a process boundary.
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from solp.lexer.header import scan_header
+from solp.solidity_parser import parse_source_unit
+
+RELATIVE_PREFIXES = ("./", "../")
+
+
+class Project:
+    # arc42: 5.8.1 Project
+    # - units: path -> SourceUnitNode for every successfully parsed file
+    # - dependencies: path -> list of resolved import paths
+    # - unresolved: path -> list of import strings that matched no file
+    # - errors: path -> error message for files that failed to parse
+    # - order: paths in the order they finished parsing (topological unless
+    #   a cycle had to be broken)
+    def __init__(self):
+        self.units = {}
+        self.dependencies = {}
+        self.unresolved = {}
+        self.errors = {}
+        self.order = []
+
+    def __getitem__(self, path):
+        return self.units[os.path.abspath(path)]
+
+    def __contains__(self, path):
+        return os.path.abspath(path) in self.units
+
+    def __len__(self):
+        return len(self.units)
+
+    def __iter__(self):
+        return iter(self.units)
+
+
+class ProjectLoader:
+    def __init__(self, remappings=None, base_path=None, max_workers=None):
+        # arc42: 5.8.2 Initialization
+        # Remappings use solc syntax (`prefix=target`) or a dict. Targets and
+        # non-relative imports are resolved against `base_path`, which
+        # defaults to the current working directory.
+        self.base_path = os.path.abspath(base_path or os.getcwd())
+        self.remappings = self._parse_remappings(remappings or {})
+        self.max_workers = max_workers
+
+    def load(self, roots, executor=None):
+        # arc42: 5.8.3 Entry Point
+        # Discovers and parses all files reachable from `roots`. A caller
+        # supplied executor is used as is; otherwise a process pool with
+        # `max_workers` workers is created for the duration of the load.
+        project = Project()
+        self.discover(roots, project)
+        if executor is not None:
+            self._schedule(project, executor)
+            return project
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            self._schedule(project, pool)
+        return project
+
+    def discover(self, roots, project):
+        # arc42: 5.8.4 Discovery
+        # Breadth-first walk over the import graph using scan_header().
+        # Unreadable files (missing, no permission, not UTF-8) are recorded
+        # in project.errors like parse failures and are not scheduled.
+        pending = deque(os.path.abspath(root) for root in roots)
+        while pending:
+            path = pending.popleft()
+            if path in project.dependencies or path in project.errors:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    header = scan_header(f.read())
+            except (OSError, UnicodeDecodeError) as exc:
+                project.errors[path] = str(exc)
+                continue
+            resolved = []
+            for import_path in header.imports:
+                target = self.resolve(import_path, path)
+                if target is None:
+                    project.unresolved.setdefault(path, []).append(import_path)
+                    continue
+                if target not in resolved:
+                    resolved.append(target)
+                pending.append(target)
+            project.dependencies[path] = resolved
+
+    def resolve(self, import_path, importer):
+        # arc42: 5.8.5 Import Resolution
+        # Relative imports are resolved against the importing file. Other
+        # imports are remapped by their longest matching prefix and resolved
+        # against the base path. Returns None if no file exists.
+        if import_path.startswith(RELATIVE_PREFIXES):
+            candidate = os.path.join(os.path.dirname(importer), import_path)
+        else:
+            candidate = self._remap(import_path)
+            if not os.path.isabs(candidate):
+                candidate = os.path.join(self.base_path, candidate)
+        candidate = os.path.normpath(candidate)
+        return candidate if os.path.isfile(candidate) else None
+
+    def _remap(self, import_path):
+        for prefix, target in self.remappings:
+            if import_path.startswith(prefix):
+                return target + import_path[len(prefix) :]
+        return import_path
+
+    def _parse_remappings(self, remappings):
+        if isinstance(remappings, dict):
+            items = remappings.items()
+        else:
+            items = [entry.split("=", 1) for entry in remappings]
+        return sorted(items, key=lambda item: len(item[0]), reverse=True)
+
+    def _schedule(self, project, executor):
+        # arc42: 5.8.6 Topological Scheduling
+        # Kahn's algorithm driven by future completion. `waiting` counts the
+        # unparsed dependencies of each file; `dependents` is the reverse
+        # edge list used to release files when a dependency finishes.
+        # Imports of files that could not be read are not waited for.
+        waiting = {}
+        dependents = {path: [] for path in project.dependencies}
+        for path, deps in project.dependencies.items():
+            deps = [dep for dep in deps if dep in dependents]
+            waiting[path] = len(deps)
+            for dep in deps:
+                dependents[dep].append(path)
+
+        running = {}
+        ready = [path for path, count in waiting.items() if count == 0]
+        while ready or running or waiting:
+            for path in ready:
+                del waiting[path]
+                running[executor.submit(_parse_file, path)] = path
+            ready = []
+
+            if not running:
+                # Only import cycles are left; release all blocked files.
+                ready = list(waiting)
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = running.pop(future)
+                self._collect(project, path, future)
+                for dependent in dependents[path]:
+                    if dependent in waiting:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0:
+                            ready.append(dependent)
+
+    def _collect(self, project, path, future):
+        unit, error = future.result()
+        if error is not None:
+            project.errors[path] = error
+        else:
+            project.units[path] = unit
+        project.order.append(path)
+
+
+def _parse_file(path):
+    # Runs inside a worker; returns (unit, error) so one broken file does
+    # not abort the whole project.
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return parse_source_unit(f.read()), None
+    except Exception as exc:
+        return None, str(exc)
+
+
+def load_project(
+    roots, remappings=None, base_path=None, max_workers=None, executor=None
+):
+    """
+    Resolves imports from the given root files and parses each file once.
+
+    :param roots: paths of the entry files
+    :param remappings: solc-style `prefix=target` strings or a dict
+    :param base_path: directory for non-relative imports (default: cwd)
+    :param max_workers: size of the default process pool
+    :param executor: optional concurrent.futures executor to use instead
+    :return: Project mapping absolute paths to SourceUnitNodes
+    """
+    loader = ProjectLoader(remappings, base_path, max_workers)
+    return loader.load(roots, executor)
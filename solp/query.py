@@ -0,0 +1,403 @@
+# arc42: 5.20 AST Queries
+# A small selector language over solp ASTs, compiled once into matcher
+# closures and evaluated for many queries in a single traversal.
+#
+# Grammar (CSS-like):
+#
+#   query      := step (combinator step)*
+#   combinator := " " (descendant) | ">" (child)
+#   step       := kind predicate*
+#   kind       := "*" | node kind, with or without the "Node" suffix
+#                 (Function, FunctionNode, Call, Statement, ...)
+#   predicate  := "[" attr "]"               attribute is truthy
+#               | "[!" attr "]"              attribute is falsy or missing
+#               | "[" attr op value "]"      op: = != ^= (prefix) *= (contains)
+#               | ":has(" query ")"          some descendant matches
+#               | ":not(" predicate+ ")"     the predicates do not all match
+#   value      := quoted string | word | true | false | null
+#
+# Example: Function[is_payable]:not(:has(Call[function=require]))
+#
+# Acceleration: a KindIndex computes, in one pass, a bit mask of the node
+# kinds present in every subtree. Traversals skip subtrees that contain
+# none of the kinds the remaining query steps need, and :has() only
+# descends into subtrees that contain the kind it looks for. Results of
+# :has() are memoized per node in the index.
+#
+# Thread safety: compiled queries are immutable and may be shared. The
+# module-level query cache and kind bit table are guarded (see _kind_bit,
+# compile_query); a KindIndex may be shared by threads, its :has() memo
+# only ever stores the same value for a key.
+import re
+import threading
+
+from solp.solidity_ast.serialize import node_kind
+from solp.solidity_ast.traversal import iter_child_nodes
+
+WILDCARD = "*"
+COMBINATOR_DESCENDANT = " "
+COMBINATOR_CHILD = ">"
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+      | (?P<op>!=|\^=|\*=|=)
+      | (?P<pseudo>:has\(|:not\()
+      | (?P<symbol>[\[\]()>!*])
+      | (?P<word>[A-Za-z_][\w.$]*|\d+)
+    )""",
+    re.VERBOSE,
+)
+_LITERALS = {"true": True, "false": False, "null": None}
+
+_kind_bits = {}
+_kind_bits_lock = threading.Lock()
+
+
+def _kind_bit(kind):
+    # New bits are derived from the table size, so assigning one must not
+    # interleave with another thread assigning a bit to a different kind.
+    bit = _kind_bits.get(kind)
+    if bit is None:
+        with _kind_bits_lock:
+            bit = _kind_bits.get(kind)
+            if bit is None:
+                bit = _kind_bits[kind] = 1 << len(_kind_bits)
+    return bit
+
+
+def _normalize_kind(kind):
+    return kind[: -len("Node")] if kind.endswith("Node") else kind
+
+
+class KindIndex:
+    def __init__(self, root):
+        # arc42: 5.20.1 Kind Index
+        # `masks` maps id(node) to the kinds of the node and all its
+        # descendants. Shared (hash-consed) subtrees are computed once.
+        self.root = root
+        self.masks = {}
+        self._has = {}
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            key = id(node)
+            if key in self.masks:
+                continue
+            children = list(iter_child_nodes(node))
+            if not expanded:
+                stack.append((node, True))
+                stack.extend(
+                    (child, False) for child in children if id(child) not in self.masks
+                )
+                continue
+            mask = _kind_bit(node_kind(node))
+            for child in children:
+                mask |= self.masks[id(child)]
+            self.masks[key] = mask
+
+    def mask(self, node):
+        return self.masks.get(id(node), -1)
+
+    def contains(self, node, kinds_mask):
+        return bool(self.mask(node) & kinds_mask)
+
+
+class Step:
+    def __init__(self, kind, predicates, combinator):
+        self.kind = kind
+        self.predicates = predicates
+        self.combinator = combinator
+        self.kind_mask = -1 if kind == WILDCARD else _kind_bit(kind)
+
+    def matches(self, node, index):
+        if self.kind != WILDCARD and node_kind(node) != self.kind:
+            return False
+        return all(predicate(node, index) for predicate in self.predicates)
+
+
+class Query:
+    def __init__(self, source, steps):
+        self.source = source
+        self.steps = steps
+        self.last = steps[-1]
+        # Kinds that must occur in a subtree for it to hold a match of
+        # the whole query or of its last step.
+        self.kind_mask = self.last.kind_mask
+
+    def matches(self, node, ancestors, index):
+        # Right-to-left matching: the last step against `node`, earlier
+        # steps against the ancestor path (nearest ancestor last).
+        if not self.last.matches(node, index):
+            return False
+        return _match_ancestors(
+            self.steps, len(self.steps) - 1, ancestors, len(ancestors), index
+        )
+
+    def select(self, root, index=None):
+        return run_queries(root, [self], index)[self.source]
+
+    def __repr__(self):
+        return f"Query({self.source!r})"
+
+
+def _match_ancestors(steps, position, ancestors, limit, index):
+    # steps[position] matched the node at ancestors[limit] (or the
+    # candidate); match steps[position - 1] according to the combinator.
+    if position == 0:
+        return True
+    step = steps[position - 1]
+    if steps[position].combinator == COMBINATOR_CHILD:
+        return (
+            limit > 0
+            and step.matches(ancestors[limit - 1], index)
+            and _match_ancestors(steps, position - 1, ancestors, limit - 1, index)
+        )
+    for at in range(limit - 1, -1, -1):
+        if step.matches(ancestors[at], index) and _match_ancestors(
+            steps, position - 1, ancestors, at, index
+        ):
+            return True
+    return False
+
+
+class _Parser:
+    # arc42: 5.20.2 Compilation
+    # Recursive descent over the token list; every predicate becomes a
+    # closure (node, index) -> bool.
+    def __init__(self, source):
+        self.source = source
+        self.tokens = []
+        position = 0
+        source = source.strip()
+        while position < len(source):
+            match = _TOKEN.match(source, position)
+            if match is None or match.end() == position:
+                raise Exception(f"Invalid query at {position}: {source!r}")
+            spaced = match.start(match.lastgroup) > position
+            self.tokens.append((match.lastgroup, match.group(match.lastgroup), spaced))
+            position = match.end()
+        self.index = 0
+
+    def peek(self, offset=0):
+        position = self.index + offset
+        return (
+            self.tokens[position]
+            if position < len(self.tokens)
+            else (None, None, False)
+        )
+
+    def expect(self, kind, value=None):
+        token = self.peek()
+        if token[0] != kind or (value is not None and token[1] != value):
+            raise Exception(f"Expected {value or kind} in query {self.source!r}")
+        self.index += 1
+        return token[1]
+
+    def parse(self):
+        query = self.query()
+        if self.index != len(self.tokens):
+            raise Exception(f"Unexpected {self.peek()[1]!r} in query {self.source!r}")
+        return query
+
+    def query(self):
+        steps = [self.step(COMBINATOR_DESCENDANT)]
+        while True:
+            kind, value, spaced = self.peek()
+            if kind == "symbol" and value == COMBINATOR_CHILD:
+                self.index += 1
+                steps.append(self.step(COMBINATOR_CHILD))
+            elif spaced and (kind == "word" or value == WILDCARD):
+                steps.append(self.step(COMBINATOR_DESCENDANT))
+            else:
+                return Query(self.source, steps)
+
+    def step(self, combinator):
+        kind, value, _ = self.peek()
+        if kind == "word" or value == WILDCARD:
+            self.index += 1
+            node = value if value == WILDCARD else _normalize_kind(value)
+        else:
+            raise Exception(f"Expected node kind in query {self.source!r}")
+        return Step(node, self.predicates(), combinator)
+
+    def predicates(self):
+        predicates = []
+        while True:
+            kind, value, spaced = self.peek()
+            if spaced:
+                return predicates
+            if kind == "symbol" and value == "[":
+                predicates.append(self.attribute())
+            elif kind == "pseudo":
+                predicates.append(self.pseudo())
+            else:
+                return predicates
+
+    def attribute(self):
+        self.expect("symbol", "[")
+        negate = self.peek()[:2] == ("symbol", "!")
+        if negate:
+            self.index += 1
+        name = self.expect("word")
+        if self.peek()[0] == "op" and not negate:
+            op = self.expect("op")
+            expected = self.literal()
+            self.expect("symbol", "]")
+            return _comparison(name, op, expected)
+        self.expect("symbol", "]")
+        if negate:
+            return lambda node, index: not getattr(node, name, None)
+        return lambda node, index: bool(getattr(node, name, None))
+
+    def literal(self):
+        kind, value, _ = self.peek()
+        self.index += 1
+        if kind == "string":
+            return value[1:-1]
+        if kind == "word":
+            return _LITERALS.get(value, value)
+        raise Exception(f"Expected value in query {self.source!r}")
+
+    def pseudo(self):
+        name = self.expect("pseudo")
+        if name == ":has(":
+            inner = self.query()
+            self.expect("symbol", ")")
+            return _has(inner)
+        predicates = self.predicates()
+        if not predicates:
+            raise Exception(f"Empty :not() in query {self.source!r}")
+        self.expect("symbol", ")")
+        return lambda node, index: not all(p(node, index) for p in predicates)
+
+
+def _text(value):
+    # Expression values may be CallNodes; compare them by callee name.
+    return value if isinstance(value, str) else getattr(value, "function", None)
+
+
+def _comparison(name, op, expected):
+    if op == "=":
+        if isinstance(expected, str):
+            return lambda node, index: _text(getattr(node, name, None)) == expected
+        return lambda node, index: getattr(node, name, None) == expected
+    if op == "!=":
+        if isinstance(expected, str):
+            return lambda node, index: _text(getattr(node, name, None)) != expected
+        return lambda node, index: getattr(node, name, None) != expected
+    if op == "^=":
+        expected = str(expected)
+
+        def prefix(node, index):
+            value = _text(getattr(node, name, None))
+            return isinstance(value, str) and value.startswith(expected)
+
+        return prefix
+    expected = str(expected)
+
+    def contains(node, index):
+        value = _text(getattr(node, name, None))
+        return isinstance(value, str) and expected in value
+
+    return contains
+
+
+def _has(inner):
+    def has(node, index):
+        key = (id(node), inner)
+        result = index._has.get(key)
+        if result is None:
+            result = index._has[key] = _search(node, inner, index)
+        return result
+
+    return has
+
+
+def _search(node, query, index):
+    # True if a proper descendant of `node` matches `query`, with the
+    # descendant's ancestors counted from below `node`.
+    for child in iter_child_nodes(node):
+        if index.contains(child, query.kind_mask):
+            for _ in _matches(child, [query], index, stop_at_first=True):
+                return True
+    return False
+
+
+def _matches(root, queries, index, stop_at_first=False):
+    # arc42: 5.20.3 Batch Evaluation
+    # Yields (query position, node) for all matches of all queries in one
+    # pre-order traversal. Queries are grouped by the kind of their last
+    # step; subtrees whose kind mask misses every needed kind are skipped.
+    by_kind = {}
+    wildcard = []
+    needed = 0
+    for position, query in enumerate(queries):
+        if query.last.kind == WILDCARD:
+            wildcard.append((position, query))
+        else:
+            by_kind.setdefault(query.last.kind, []).append((position, query))
+        needed |= query.kind_mask
+    ancestors = []
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        del ancestors[depth:]
+        if not index.mask(node) & needed:
+            continue
+        for position, query in by_kind.get(node_kind(node), []) + wildcard:
+            if query.matches(node, ancestors, index):
+                yield position, node
+                if stop_at_first:
+                    return
+        ancestors.append(node)
+        children = list(iter_child_nodes(node))
+        for child in reversed(children):
+            stack.append((child, depth + 1))
+
+
+_compiled = {}
+
+
+def compile_query(source):
+    """
+    Compiles a selector into a Query. Compiled queries are cached by text.
+
+    :param source: selector, e.g. "Function[is_payable]"
+    :return: Query
+    """
+    query = _compiled.get(source)
+    if query is None:
+        # setdefault is atomic: threads compiling the same source at once
+        # all return the Query that was stored first.
+        query = _compiled.setdefault(source, _Parser(source).parse())
+    return query
+
+
+def run_queries(root, queries, index=None):
+    """
+    Evaluates several queries in one traversal of an AST.
+
+    :param root: node to search (included in the search)
+    :param queries: selector strings or compiled Query objects
+    :param index: KindIndex of `root` (built if omitted)
+    :return: dict of query source -> matching nodes in pre-order
+    """
+    compiled = [q if isinstance(q, Query) else compile_query(q) for q in queries]
+    index = index if index is not None else KindIndex(root)
+    results = {query.source: [] for query in compiled}
+    for position, node in _matches(root, compiled, index):
+        results[compiled[position].source].append(node)
+    return results
+
+
+def select(root, source, index=None):
+    """
+    Returns all nodes below (and including) `root` matching a selector.
+
+    :param root: node to search
+    :param source: selector string
+    :param index: KindIndex of `root` (built if omitted)
+    :return: list of matching nodes in pre-order
+    """
+    return compile_query(source).select(root, index)
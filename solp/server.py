@@ -0,0 +1,362 @@
+# arc42: 5.14 Parse Server
+# `solp serve` keeps a warm Python process with solp imported and open
+# documents cached, so editors and CI steps pay neither interpreter startup
+# nor a full re-parse for every small edit.
+#
+# Protocol: newline-delimited JSON-RPC 2.0 over stdio or a Unix socket. Each
+# line holds one request or notification; each request gets one response
+# line. Document URIs are opaque keys.
+#
+# Methods:
+# - textDocument/didOpen     {uri, text, version?}               notification
+# - textDocument/didChange   {uri, contentChanges, version?}     notification
+# - textDocument/didClose    {uri}                               notification
+# - solp/parse               {uri} or {text} -> AST and diagnostics
+# - solp/outline             {uri} or {text} -> declarations and members
+# - solp/diagnostics         {uri} or {text} -> list of diagnostics
+# - shutdown / exit
+#
+# Content changes follow the LSP shape: either {"text": full} or
+# {"range": {"start": {line, character}, "end": {...}}, "text": new} with
+# zero-based positions.
+import json
+import os
+import socketserver
+import sys
+import threading
+
+from solp.lexer.header import scan_header
+from solp.lexer.interning import SymbolTable
+from solp.lexer.lexer import Lexer
+from solp.parser.parser import Parser
+from solp.solidity_ast.serialize import node_kind, to_dict
+
+JSONRPC_VERSION = "2.0"
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class Chunk:
+    # arc42: 5.14.1 Chunks
+    # A document is split at the top-level declaration boundaries reported
+    # by scan_header(). Every chunk (a declaration, or the directives and
+    # comments between declarations) is lexed and parsed on its own, so its
+    # tokens, nodes and spans are relative to the chunk's first line.
+    def __init__(self, text, symbols):
+        self.text = text
+        self.tokens = []
+        self.nodes = []
+        self.error = None
+        lexer = Lexer(text, symbols)
+        try:
+            self.tokens = lexer.tokenize()
+        except Exception as exc:
+            self.error = (str(exc), lexer.line, lexer.col)
+            return
+        parser = Parser(self.tokens)
+        try:
+            self.nodes = parser.parse_source_unit().children
+        except Exception as exc:
+            tok = parser.tokens.current()
+            line, col = (tok.line, tok.col) if tok.line is not None else (1, 1)
+            self.error = (str(exc), line, col)
+
+
+class Document:
+    def __init__(self, uri, text, version=None):
+        # arc42: 5.14.2 Documents
+        # `chunks` is a list of (start offset, first line, Chunk). Chunks are
+        # cached by text: after an edit only chunks whose text changed are
+        # parsed again; moved but unchanged chunks are reused as they are.
+        self.uri = uri
+        self.version = version
+        self.text = ""
+        self.chunks = []
+        self.symbols = SymbolTable()
+        self.reused = 0
+        self.parsed = 0
+        self.update(text)
+
+    def update(self, text):
+        cache = {chunk.text: chunk for _, _, chunk in self.chunks}
+        self.text = text
+        self.chunks = []
+        self.reused = self.parsed = 0
+        line = 0
+        previous = 0
+        for start, end in _chunk_ranges(text):
+            chunk_text = text[start:end]
+            line += text.count("\n", previous, start)
+            previous = start
+            if not chunk_text.strip():
+                continue
+            chunk = cache.get(chunk_text)
+            if chunk is None:
+                chunk = cache[chunk_text] = Chunk(chunk_text, self.symbols)
+                self.parsed += 1
+            else:
+                self.reused += 1
+            self.chunks.append((start, line, chunk))
+
+    def apply_changes(self, changes):
+        text = self.text
+        for change in changes:
+            if "range" not in change:
+                text = change["text"]
+                continue
+            starts = _line_starts(text)
+            start = _offset(starts, text, change["range"]["start"])
+            end = _offset(starts, text, change["range"]["end"])
+            text = text[:start] + change["text"] + text[end:]
+        self.update(text)
+
+    def diagnostics(self):
+        result = []
+        for start, line, chunk in self.chunks:
+            if chunk.error is None:
+                continue
+            message, error_line, col = chunk.error
+            if error_line == 1:
+                col += start - (self.text.rfind("\n", 0, start) + 1)
+            result.append({"message": message, "line": error_line + line, "col": col})
+        return result
+
+    def declarations(self):
+        # Yields (top-level node, line offset) pairs in source order.
+        for _, line, chunk in self.chunks:
+            for node in chunk.nodes:
+                yield node, line
+
+
+def _chunk_ranges(text):
+    # Declarations from the header scan plus the gaps between them.
+    position = 0
+    for _, _, start, end in scan_header(text).declarations:
+        if start > position:
+            yield position, start
+        yield start, end
+        position = end
+    if position < len(text):
+        yield position, len(text)
+
+
+def _line_starts(text):
+    starts = [0]
+    index = text.find("\n")
+    while index >= 0:
+        starts.append(index + 1)
+        index = text.find("\n", index + 1)
+    return starts
+
+
+def _offset(starts, text, position):
+    line = position["line"]
+    if line >= len(starts):
+        return len(text)
+    end = starts[line + 1] - 1 if line + 1 < len(starts) else len(text)
+    return min(starts[line] + position["character"], end)
+
+
+def _outline_entry(node, line_offset):
+    entry = {"node": node_kind(node)}
+    for field in ("name", "kind", "path"):
+        value = getattr(node, field, None)
+        if value is not None:
+            entry[field] = value
+    span = getattr(node, "span", None)
+    if span is not None:
+        entry["span"] = [span[0] + line_offset, span[1] + line_offset]
+    return entry
+
+
+class ParseServer:
+    def __init__(self):
+        # arc42: 5.14.3 Request Handling
+        # One server instance holds all open documents. Requests from
+        # several socket clients are serialized by a lock.
+        self.documents = {}
+        self.lock = threading.Lock()
+        self.running = True
+        self.methods = {
+            "initialize": self.initialize,
+            "textDocument/didOpen": self.did_open,
+            "textDocument/didChange": self.did_change,
+            "textDocument/didClose": self.did_close,
+            "solp/parse": self.parse,
+            "solp/outline": self.outline,
+            "solp/diagnostics": self.diagnostics,
+            "shutdown": self.shutdown,
+            "exit": self.exit,
+        }
+
+    def handle_line(self, line):
+        # Returns the response line, or None for notifications.
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return _encode(_error(None, PARSE_ERROR, "Parse error"))
+        if not isinstance(message, dict) or "method" not in message:
+            return _encode(_error(None, INVALID_REQUEST, "Invalid request"))
+        request_id = message.get("id")
+        try:
+            with self.lock:
+                result = self.dispatch(message["method"], message.get("params") or {})
+        except RpcError as exc:
+            response = _error(request_id, exc.code, exc.message)
+        except Exception as exc:
+            response = _error(request_id, INTERNAL_ERROR, str(exc))
+        else:
+            response = {"jsonrpc": JSONRPC_VERSION, "id": request_id, "result": result}
+        if "id" not in message:
+            return None
+        return _encode(response)
+
+    def dispatch(self, method, params):
+        handler = self.methods.get(method)
+        if handler is None:
+            raise RpcError(METHOD_NOT_FOUND, f"Method not found: {method}")
+        return handler(params)
+
+    def initialize(self, params):
+        return {"capabilities": sorted(self.methods)}
+
+    def did_open(self, params):
+        uri = _param(params, "uri")
+        self.documents[uri] = Document(
+            uri, _param(params, "text"), params.get("version")
+        )
+
+    def did_change(self, params):
+        document = self._document(params)
+        document.apply_changes(_param(params, "contentChanges"))
+        document.version = params.get("version", document.version)
+
+    def did_close(self, params):
+        self.documents.pop(_param(params, "uri"), None)
+
+    def parse(self, params):
+        document = self._document(params)
+        return {
+            "uri": document.uri,
+            "version": document.version,
+            "children": [to_dict(node, line) for node, line in document.declarations()],
+            "diagnostics": document.diagnostics(),
+            "reused": document.reused,
+            "parsed": document.parsed,
+        }
+
+    def outline(self, params):
+        result = []
+        for node, line in self._document(params).declarations():
+            entry = _outline_entry(node, line)
+            members = getattr(node, "members", None)
+            if members is not None:
+                entry["members"] = [_outline_entry(m, line) for m in members]
+            result.append(entry)
+        return result
+
+    def diagnostics(self, params):
+        return self._document(params).diagnostics()
+
+    def shutdown(self, params):
+        return None
+
+    def exit(self, params):
+        self.running = False
+
+    def _document(self, params):
+        # Open documents are looked up by URI; inline `text` is parsed into
+        # a throwaway document for one-shot clients.
+        if "text" in params and "uri" not in params:
+            return Document(None, params["text"])
+        uri = _param(params, "uri")
+        document = self.documents.get(uri)
+        if document is None:
+            raise RpcError(INVALID_PARAMS, f"Unknown document: {uri}")
+        return document
+
+
+def _param(params, name):
+    if name not in params:
+        raise RpcError(INVALID_PARAMS, f"Missing parameter: {name}")
+    return params[name]
+
+
+def _error(request_id, code, message):
+    return {
+        "jsonrpc": JSONRPC_VERSION,
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+def _encode(response):
+    return json.dumps(response, separators=(",", ":"))
+
+
+def serve_stdio(server=None, stdin=None, stdout=None):
+    """
+    Serves newline-delimited JSON-RPC on stdin/stdout until `exit`.
+
+    :param server: ParseServer instance (a new one is created if omitted)
+    :param stdin: input stream (defaults to sys.stdin)
+    :param stdout: output stream (defaults to sys.stdout)
+    """
+    server = server if server is not None else ParseServer()
+    stdin = stdin if stdin is not None else sys.stdin
+    stdout = stdout if stdout is not None else sys.stdout
+    for line in stdin:
+        if not line.strip():
+            continue
+        response = server.handle_line(line)
+        if response is not None:
+            stdout.write(response + "\n")
+            stdout.flush()
+        if not server.running:
+            break
+    return server
+
+
+def serve_socket(path, server=None):
+    """
+    Serves newline-delimited JSON-RPC on a Unix domain socket. Every client
+    connection is handled in its own thread; all clients share the open
+    documents. Returns after a client sends `exit`.
+
+    :param path: filesystem path of the socket
+    :param server: ParseServer instance (a new one is created if omitted)
+    """
+    server = server if server is not None else ParseServer()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                line = raw.decode("utf-8")
+                if not line.strip():
+                    continue
+                response = server.handle_line(line)
+                if response is not None:
+                    self.wfile.write((response + "\n").encode("utf-8"))
+                    self.wfile.flush()
+                if not server.running:
+                    threading.Thread(target=listener.shutdown).start()
+                    return
+
+    if os.path.exists(path):
+        os.unlink(path)
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as listener:
+        listener.daemon_threads = True
+        listener.serve_forever()
+    os.unlink(path)
+    return server
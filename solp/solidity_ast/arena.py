@@ -0,0 +1,396 @@
+# arc42: 5.4.5 Node Arena
+# A flat, position-independent encoding of AST nodes in integer tables, used
+# to hand ASTs from worker processes to the parent through
+# `multiprocessing.shared_memory` instead of pickling every node.
+#
+# Layout (all integers are native int32):
+# - header:  MAGIC, node, field, list, item, string and root counts, blob size
+# - nodes:   (class name string, first field, field count, span start, span end)
+# - fields:  (name string, value tag, value payload)
+# - lists:   (first item, item count)
+# - items:   (value tag, value payload)
+# - strings: offsets into the UTF-8 blob (count + 1 entries)
+# - roots:   node index of every encoded root
+# - blob:    UTF-8 bytes of all distinct strings
+#
+# Values are tagged: strings, booleans and None are stored inline, child
+# nodes as node indexes, lists and tuples as list indexes. A node object
+# that appears several times (e.g. shared by the hash-consing factory) is
+# encoded once and materialized once.
+#
+# ArenaView reads the tables through memoryview casts without copying.
+# NodeView offers attribute access on encoded nodes, and materialize()
+# rebuilds regular node objects on demand.
+import secrets
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+
+from solp.solidity_ast import nodes as node_classes
+from solp.solidity_ast.nodes import POSITION_FIELDS, Node
+
+MAGIC = 0x534F4C50
+HEADER_SIZE = 8
+NODE_WIDTH = 5
+FIELD_WIDTH = 3
+
+TAG_NONE = 0
+TAG_STR = 1
+TAG_FALSE = 2
+TAG_TRUE = 3
+TAG_NODE = 4
+TAG_LIST = 5
+TAG_TUPLE = 6
+
+# Span markers for nodes without a span attribute or with span None.
+NO_SPAN = -1
+EMPTY_SPAN = -2
+
+
+class ArenaEncoder:
+    def __init__(self):
+        # arc42: 5.4.5.1 Encoding
+        self.nodes = array("i")
+        self.fields = array("i")
+        self.lists = array("i")
+        self.items = array("i")
+        self.roots = array("i")
+        self.strings = {}
+        self.blob = bytearray()
+        self.offsets = array("i", [0])
+        self._encoded = {}
+        self._layouts = {}
+
+    def add_root(self, node):
+        # Encodes a tree and returns its root number.
+        self.roots.append(self._node(node))
+        return len(self.roots) - 1
+
+    def _string(self, value):
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+            self.blob += value.encode("utf-8")
+            self.offsets.append(len(self.blob))
+        return index
+
+    def _value(self, value):
+        cls = type(value)
+        if cls is str:
+            index = self.strings.get(value)
+            return TAG_STR, self._string(value) if index is None else index
+        if value is None:
+            return TAG_NONE, 0
+        if value is True:
+            return TAG_TRUE, 0
+        if value is False:
+            return TAG_FALSE, 0
+        if cls is list or cls is tuple:
+            encoded = [self._value(item) for item in value]
+            index = len(self.lists) >> 1
+            self.lists.extend((len(self.items) >> 1, len(encoded)))
+            items = self.items
+            for tag, payload in encoded:
+                items.extend((tag, payload))
+            return (TAG_TUPLE if cls is tuple else TAG_LIST), index
+        if isinstance(value, Node):
+            return TAG_NODE, self._node(value)
+        if isinstance(value, str):
+            return TAG_STR, self._string(value)
+        raise Exception(f"Cannot encode value of type {cls.__name__}")
+
+    def _layout(self, node, attributes):
+        # Field names (as string indexes) in Node.fields() order, cached per
+        # class and attribute set.
+        key = (type(node), attributes)
+        layout = self._layouts.get(key)
+        if layout is None:
+            names = sorted(
+                name
+                for name in attributes
+                if not name.startswith("_") and name not in POSITION_FIELDS
+            )
+            layout = self._layouts[key] = [(name, self._string(name)) for name in names]
+        return layout
+
+    def _node(self, node):
+        index = self._encoded.get(id(node))
+        if index is not None:
+            return index
+        attributes = node.__dict__
+        encoded = [
+            (name_index, *self._value(attributes[name]))
+            for name, name_index in self._layout(node, tuple(attributes))
+        ]
+        span = attributes.get("span", NO_SPAN)
+        if span is NO_SPAN:
+            start = end = NO_SPAN
+        elif span is None:
+            start = end = EMPTY_SPAN
+        else:
+            start, end = span
+        index = len(self.nodes) // NODE_WIDTH
+        self.nodes.extend(
+            (
+                self._string(type(node).__name__),
+                len(self.fields) // FIELD_WIDTH,
+                len(encoded),
+                start,
+                end,
+            )
+        )
+        fields = self.fields
+        for entry in encoded:
+            fields.extend(entry)
+        self._encoded[id(node)] = index
+        return index
+
+    def _tables(self):
+        header = array(
+            "i",
+            [
+                MAGIC,
+                len(self.nodes) // NODE_WIDTH,
+                len(self.fields) // FIELD_WIDTH,
+                len(self.lists) // 2,
+                len(self.items) // 2,
+                len(self.strings),
+                len(self.roots),
+                len(self.blob),
+            ],
+        )
+        return (
+            header,
+            self.nodes,
+            self.fields,
+            self.lists,
+            self.items,
+            self.offsets,
+            self.roots,
+        )
+
+    def size(self):
+        return sum(len(t) * t.itemsize for t in self._tables()) + len(self.blob)
+
+    def write(self, buffer):
+        # Writes the encoding into a writable buffer of at least size() bytes.
+        position = 0
+        target = memoryview(buffer)
+        for table in self._tables():
+            data = table.tobytes()
+            target[position : position + len(data)] = data
+            position += len(data)
+        target[position : position + len(self.blob)] = self.blob
+        target.release()
+
+    def to_bytes(self):
+        buffer = bytearray(self.size())
+        self.write(buffer)
+        return bytes(buffer)
+
+
+class ArenaView:
+    def __init__(self, buffer):
+        # arc42: 5.4.5.2 Zero-Copy View
+        # Casts the tables of an encoded buffer without copying. Strings
+        # are decoded on first access and cached. release() must be called
+        # before the underlying shared memory segment is closed.
+        self._buffer = memoryview(buffer)
+        ints = self._buffer[: HEADER_SIZE * 4].cast("i")
+        header = ints.tolist()
+        ints.release()
+        if header[0] != MAGIC:
+            raise Exception("Buffer does not contain a node arena")
+        _, nodes, fields, lists, items, strings, roots, blob = header
+        self._views = []
+        position = HEADER_SIZE * 4
+        tables = []
+        for count in (
+            nodes * NODE_WIDTH,
+            fields * FIELD_WIDTH,
+            lists * 2,
+            items * 2,
+            strings + 1,
+            roots,
+        ):
+            view = self._buffer[position : position + count * 4].cast("i")
+            self._views.append(view)
+            tables.append(view)
+            position += count * 4
+        self.nodes, self.fields, self.lists, self.items, self.offsets, self.roots = (
+            tables
+        )
+        self.blob = self._buffer[position : position + blob]
+        self._views.append(self.blob)
+        self._strings = {}
+        self._materialized = {}
+
+    def __len__(self):
+        return len(self.nodes) // NODE_WIDTH
+
+    def release(self):
+        for view in self._views:
+            view.release()
+        self._buffer.release()
+
+    def string(self, index):
+        value = self._strings.get(index)
+        if value is None:
+            start, end = self.offsets[index], self.offsets[index + 1]
+            value = self._strings[index] = bytes(self.blob[start:end]).decode("utf-8")
+        return value
+
+    def root(self, number):
+        return NodeView(self, self.roots[number])
+
+    def class_name(self, index):
+        return self.string(self.nodes[index * NODE_WIDTH])
+
+    def span(self, index):
+        start = self.nodes[index * NODE_WIDTH + 3]
+        end = self.nodes[index * NODE_WIDTH + 4]
+        if start == NO_SPAN:
+            return NO_SPAN
+        if start == EMPTY_SPAN:
+            return None
+        return start, end
+
+    def field_entries(self, index):
+        # Yields (name, tag, payload) of a node's fields.
+        base = index * NODE_WIDTH
+        first, count = self.nodes[base + 1], self.nodes[base + 2]
+        for i in range(first * FIELD_WIDTH, (first + count) * FIELD_WIDTH, FIELD_WIDTH):
+            yield self.string(self.fields[i]), self.fields[i + 1], self.fields[i + 2]
+
+    def value(self, tag, payload, materialize=False):
+        if tag == TAG_NONE:
+            return None
+        if tag == TAG_STR:
+            return self.string(payload)
+        if tag == TAG_TRUE:
+            return True
+        if tag == TAG_FALSE:
+            return False
+        if tag == TAG_NODE:
+            return self.materialize(payload) if materialize else NodeView(self, payload)
+        first, count = self.lists[payload * 2], self.lists[payload * 2 + 1]
+        values = [
+            self.value(self.items[i], self.items[i + 1], materialize)
+            for i in range(first * 2, (first + count) * 2, 2)
+        ]
+        return tuple(values) if tag == TAG_TUPLE else values
+
+    def materialize(self, index):
+        # arc42: 5.4.5.3 Materialization
+        # Rebuilds the node object (and its subtree) at `index`. Nodes are
+        # created without running their constructors; each index is built
+        # once, so shared subtrees stay shared.
+        node = self._materialized.get(index)
+        if node is not None:
+            return node
+        cls = getattr(node_classes, self.class_name(index))
+        node = cls.__new__(cls)
+        for name, tag, payload in self.field_entries(index):
+            node.__dict__[name] = self.value(tag, payload, materialize=True)
+        span = self.span(index)
+        if span is not NO_SPAN:
+            node.span = span
+        self._materialized[index] = node
+        return node
+
+
+class NodeView:
+    # Read-only proxy for one encoded node. Field access decodes only the
+    # requested value; child nodes are returned as NodeViews.
+    __slots__ = ("arena", "index")
+
+    def __init__(self, arena, index):
+        self.arena = arena
+        self.index = index
+
+    @property
+    def class_name(self):
+        return self.arena.class_name(self.index)
+
+    @property
+    def span(self):
+        span = self.arena.span(self.index)
+        return None if span is NO_SPAN else span
+
+    def __getattr__(self, name):
+        for field, tag, payload in self.arena.field_entries(self.index):
+            if field == name:
+                return self.arena.value(tag, payload)
+        raise AttributeError(name)
+
+    def fields(self):
+        for name, tag, payload in self.arena.field_entries(self.index):
+            yield name, self.arena.value(tag, payload)
+
+    def materialize(self):
+        return self.arena.materialize(self.index)
+
+    def __repr__(self):
+        return f"NodeView({self.class_name}, {self.index})"
+
+
+# arc42: 5.4.5.4 Shared Memory Segments
+# Workers write an arena into a new segment and return only its name. The
+# worker detaches from the segment without unlinking it and unregisters it
+# from its resource tracker, which would otherwise remove the segment when
+# the worker exits. The parent attaches by name and unlinks the segment
+# when it closes the SharedArena.
+def segment_name():
+    # A fresh segment name; chosen by the parent so it can remove segments
+    # whose worker result never arrives.
+    return f"solp_{secrets.token_hex(8)}"
+
+
+def write_shared(encoder, name=None):
+    """
+    Copies an encoded arena into a new shared memory segment.
+
+    :param encoder: ArenaEncoder with all roots added
+    :param name: segment name (default: chosen by the system)
+    :return: name of the segment
+    """
+    segment = shared_memory.SharedMemory(name, create=True, size=encoder.size())
+    try:
+        encoder.write(segment.buf)
+    except BaseException:
+        segment.close()
+        segment.unlink()
+        raise
+    segment.close()
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment.name
+
+
+def unlink_shared(name):
+    """
+    Removes a shared memory segment by name if it exists.
+
+    :param name: segment name
+    :return: True if a segment was removed
+    """
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    segment.close()
+    segment.unlink()
+    return True
+
+
+class SharedArena:
+    def __init__(self, name):
+        self.segment = shared_memory.SharedMemory(name=name)
+        self.view = ArenaView(self.segment.buf)
+
+    def root(self, number):
+        return self.view.root(number)
+
+    def close(self):
+        # Releases the view, detaches and removes the segment.
+        self.view.release()
+        self.segment.close()
+        self.segment.unlink()
@@ -0,0 +1,163 @@
+# arc42: 5.4.3 Structural Diff
+# `diff(old, new)` compares two ASTs (typically two versions of one file)
+# top-down and only descends into subtrees whose structural hashes differ.
+# Unchanged contracts, functions and statements are skipped after a single
+# digest comparison, so once both trees are hashed a diff costs time
+# proportional to the changed part of the tree.
+#
+# List fields (contract members, statement bodies, parameters) are aligned
+# in two ways:
+# - named nodes by (class, name), overloads by their occurrence among nodes
+#   of the same key
+# - unnamed items (statements, parameters, plain values) by content: the
+#   sequence of their structural hashes is matched with difflib, so equal
+#   items pair up even when others were inserted or deleted around them.
+#   Within a replaced run, items are paired by position; only what is left
+#   over is reported as added or removed.
+# Matched nodes whose own scalar fields differ are reported as modified.
+# Inserting one statement at the top of a body is a single change.
+from difflib import SequenceMatcher
+
+from solp.solidity_ast.nodes import Node
+from solp.solidity_ast.serialize import node_kind
+
+CHANGE_ADDED = "added"
+CHANGE_REMOVED = "removed"
+CHANGE_MODIFIED = "modified"
+
+
+class Change:
+    # `path` is a tuple of labels from the root to the changed node, such
+    # as ("Contract:Token", "Function:transfer", "body", 0).
+    def __init__(self, kind, path, old=None, new=None):
+        self.kind = kind
+        self.path = path
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return f"Change({self.kind}, {'/'.join(map(str, self.path))})"
+
+
+def label(node):
+    name = node_kind(node)
+    node_name = getattr(node, "name", None)
+    return f"{name}:{node_name}" if isinstance(node_name, str) else name
+
+
+def diff(old, new):
+    """
+    Lists the structural changes between two ASTs.
+
+    :param old: root node of the old version
+    :param new: root node of the new version
+    :return: list of Change objects, parents before their descendants
+    """
+    changes = []
+    _diff_node(old, new, (), changes)
+    return changes
+
+
+def _diff_node(old, new, path, changes):
+    if old.structural_hash() == new.structural_hash():
+        return
+    if type(old) is not type(new):
+        changes.append(Change(CHANGE_MODIFIED, path, old, new))
+        return
+
+    old_fields = dict(old.fields())
+    new_fields = dict(new.fields())
+    scalar_changed = False
+    nested = []
+    for name in sorted(set(old_fields) | set(new_fields)):
+        old_value, new_value = old_fields.get(name), new_fields.get(name)
+        if isinstance(old_value, Node) and isinstance(new_value, Node):
+            nested.append((name, old_value, new_value))
+        elif isinstance(old_value, list) and isinstance(new_value, list):
+            nested.append((name, old_value, new_value))
+        elif old_value != new_value:
+            scalar_changed = True
+
+    if scalar_changed:
+        changes.append(Change(CHANGE_MODIFIED, path, old, new))
+    for name, old_value, new_value in nested:
+        if isinstance(old_value, Node):
+            _diff_node(old_value, new_value, path + (name,), changes)
+        elif old_value != new_value or _has_nodes(old_value, new_value):
+            _diff_list(old_value, new_value, path + (name,), changes)
+
+
+def _has_nodes(old_items, new_items):
+    return any(isinstance(item, Node) for item in old_items + new_items)
+
+
+def _diff_list(old_items, new_items, path, changes):
+    old_keyed, old_unnamed = _keyed(old_items)
+    new_keyed, new_unnamed = _keyed(new_items)
+    for key, item in old_keyed.items():
+        if key not in new_keyed:
+            changes.append(Change(CHANGE_REMOVED, path + (_step(key),), old=item))
+    for key, item in new_keyed.items():
+        match = old_keyed.get(key)
+        if match is None:
+            changes.append(Change(CHANGE_ADDED, path + (_step(key),), new=item))
+        else:
+            _diff_item(match, item, path + (_step(key),), changes)
+    _diff_unnamed(old_unnamed, new_unnamed, path, changes)
+
+
+def _diff_unnamed(old_items, new_items, path, changes):
+    # old_items / new_items: lists of (index, item). Equal runs are skipped;
+    # replaced runs are paired by position.
+    matcher = SequenceMatcher(
+        None,
+        [_content(item) for _, item in old_items],
+        [_content(item) for _, item in new_items],
+        autojunk=False,
+    )
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        old_run, new_run = old_items[i1:i2], new_items[j1:j2]
+        for (_, old), (index, new) in zip(old_run, new_run):
+            _diff_item(old, new, path + (index,), changes)
+        for index, item in old_run[len(new_run) :]:
+            changes.append(Change(CHANGE_REMOVED, path + (index,), old=item))
+        for index, item in new_run[len(old_run) :]:
+            changes.append(Change(CHANGE_ADDED, path + (index,), new=item))
+
+
+def _diff_item(old, new, path, changes):
+    if isinstance(old, Node) and isinstance(new, Node):
+        _diff_node(old, new, path, changes)
+    elif old != new:
+        changes.append(Change(CHANGE_MODIFIED, path, old, new))
+
+
+def _content(item):
+    # Comparison key of an unnamed list item.
+    if isinstance(item, Node):
+        return item.structural_hash()
+    return repr(item)
+
+
+def _keyed(items):
+    # Splits a list into named nodes, keyed by (label, occurrence) in list
+    # order, and the remaining (index, item) pairs.
+    keyed = {}
+    unnamed = []
+    seen = {}
+    for index, item in enumerate(items):
+        base = label(item) if isinstance(item, Node) else None
+        if base is None or ":" not in base:
+            unnamed.append((index, item))
+            continue
+        occurrence = seen.get(base, 0)
+        seen[base] = occurrence + 1
+        keyed[(base, occurrence)] = item
+    return keyed, unnamed
+
+
+def _step(key):
+    base, occurrence = key
+    return base if occurrence == 0 else f"{base}#{occurrence}"
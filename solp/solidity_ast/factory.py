@@ -0,0 +1,257 @@
+# arc42: 5.5 Node Factory
+# Parser rules never call AST node constructors directly. Every node and
+# every node sequence (members, parameters, statements, arguments) is
+# requested from a node factory that is injected through the Parser and the
+# RuleDispatcher. The default NodeFactory builds the regular AST; other
+# factories can change what is built without touching the grammar rules.
+import threading
+import weakref
+
+from solp.solidity_ast.nodes import (
+    CallNode,
+    ConstructorNode,
+    ContractNode,
+    ForNode,
+    FunctionNode,
+    IfNode,
+    ImportNode,
+    PragmaNode,
+    ReturnNode,
+    SourceUnitNode,
+    StatementNode,
+    VariableNode,
+    WhileNode,
+)
+
+
+class NodeFactory:
+    def source_unit(self, children):
+        return SourceUnitNode(children)
+
+    def pragma(self, name, value):
+        return PragmaNode(name, value)
+
+    def import_(self, path, alias=None, symbols=None):
+        return ImportNode(path, alias=alias, symbols=symbols)
+
+    def contract(self, name, members, kind="contract", bases=None):
+        return ContractNode(name, members, kind=kind, bases=bases)
+
+    def variable(self, var_type, name, visibility=None):
+        return VariableNode(var_type=var_type, name=name, visibility=visibility)
+
+    def parameter(self, var_type, name):
+        return VariableNode(var_type, name)
+
+    def function(self, name, visibility, is_payable, parameters, returns, body):
+        return FunctionNode(
+            name=name,
+            parameters=parameters,
+            visibility=visibility,
+            is_payable=is_payable,
+            returns=returns,
+            body=body,
+        )
+
+    def constructor(self, parameters, visibility, body):
+        return ConstructorNode(parameters, visibility, body)
+
+    def statement(self, type_, **kwargs):
+        return StatementNode(type_, **kwargs)
+
+    def return_(self, value):
+        return ReturnNode(value=value)
+
+    def call(self, function, arguments):
+        return CallNode(function=function, arguments=arguments)
+
+    def if_(self, condition, then_block, else_block):
+        return IfNode(condition=condition, then_block=then_block, else_block=else_block)
+
+    def while_(self, condition, body):
+        return WhileNode(condition, body)
+
+    def for_(self, init, condition, increment, body):
+        return ForNode(init=init, condition=condition, increment=increment, body=body)
+
+    def sequence(self):
+        return []
+
+
+# arc42: 5.5.1 Recognizer Factory
+# Used by `solp.check()`. The grammar rules run unchanged, but no nodes are
+# allocated: every rule result is the shared ACCEPTED marker and every
+# sequence only counts its items. Rules still see truthy results and
+# non-empty sequences where they expect them (e.g. the comma check in
+# parameter lists), so recognition behaves exactly like parsing while memory
+# stays constant apart from the token buffer.
+class _Accepted:
+    __slots__ = ()
+
+    def __repr__(self):
+        return "ACCEPTED"
+
+
+ACCEPTED = _Accepted()
+
+
+class _CountingSequence:
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+    def append(self, item):
+        self.count += 1
+
+    def __len__(self):
+        return self.count
+
+
+class RecognizerNodeFactory(NodeFactory):
+    def source_unit(self, children):
+        return ACCEPTED
+
+    def pragma(self, name, value):
+        return ACCEPTED
+
+    def import_(self, path, alias=None, symbols=None):
+        return ACCEPTED
+
+    def contract(self, name, members, kind="contract", bases=None):
+        return ACCEPTED
+
+    def variable(self, var_type, name, visibility=None):
+        return ACCEPTED
+
+    def parameter(self, var_type, name):
+        return ACCEPTED
+
+    def function(self, name, visibility, is_payable, parameters, returns, body):
+        return ACCEPTED
+
+    def constructor(self, parameters, visibility, body):
+        return ACCEPTED
+
+    def statement(self, type_, **kwargs):
+        return ACCEPTED
+
+    def return_(self, value):
+        return ACCEPTED
+
+    def call(self, function, arguments):
+        return ACCEPTED
+
+    def if_(self, condition, then_block, else_block):
+        return ACCEPTED
+
+    def while_(self, condition, body):
+        return ACCEPTED
+
+    def for_(self, init, condition, increment, body):
+        return ACCEPTED
+
+    def sequence(self):
+        return _CountingSequence()
+
+
+# arc42: 5.5.2 Hash-Consing Factory
+# Across a corpus, and within one contract, the same parameters and
+# expressions (`msg.sender` calls, `require(...)` statements, identical
+# parameter lists) are built over and over. The HashConsingNodeFactory
+# allocates each structurally identical subtree once and returns the shared
+# instance for every further occurrence.
+#
+# Only nodes without a source span are shared: parameters, statements,
+# returns, calls and control-flow blocks. Declarations (contracts,
+# functions, constructors, state variables) receive their span after
+# construction and are always distinct objects.
+#
+# The intern table is a WeakValueDictionary, so entries disappear together
+# with the last AST that uses them. Keys are built from field values and
+# the identities of already interned children; a child is kept alive by
+# every node that contains it, so an identity in a live key is never reused.
+# Shared nodes must be treated as immutable, and per-occurrence data must
+# be kept in side tables keyed by path rather than by node identity.
+#
+# One factory may be shared by parsers in several threads: lookups are
+# lock-free, and a miss builds and stores the node under a lock, so every
+# thread receives the same instance for a key. The hits/misses statistics
+# are not locked and may undercount under concurrent use.
+class HashConsingNodeFactory(NodeFactory):
+    def __init__(self):
+        self.table = weakref.WeakValueDictionary()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.table)
+
+    def intern(self, key, build):
+        node = self.table.get(key)
+        if node is None:
+            with self._lock:
+                node = self.table.get(key)
+                if node is None:
+                    self.misses += 1
+                    node = self.table[key] = build()
+                    return node
+        self.hits += 1
+        return node
+
+    def parameter(self, var_type, name):
+        return self.intern(
+            ("parameter", var_type, name), lambda: VariableNode(var_type, name)
+        )
+
+    def statement(self, type_, **kwargs):
+        key = ("statement", type_) + tuple(
+            (name, _intern_key(value)) for name, value in sorted(kwargs.items())
+        )
+        return self.intern(key, lambda: StatementNode(type_, **kwargs))
+
+    def return_(self, value):
+        return self.intern(
+            ("return", _intern_key(value)), lambda: ReturnNode(value=value)
+        )
+
+    def call(self, function, arguments):
+        return self.intern(
+            ("call", _intern_key(function), _intern_key(arguments)),
+            lambda: CallNode(function=function, arguments=arguments),
+        )
+
+    def if_(self, condition, then_block, else_block):
+        key = ("if", _intern_key(condition), _intern_key(then_block))
+        return self.intern(
+            key + (_intern_key(else_block),),
+            lambda: IfNode(condition, then_block, else_block),
+        )
+
+    def while_(self, condition, body):
+        return self.intern(
+            ("while", _intern_key(condition), _intern_key(body)),
+            lambda: WhileNode(condition, body),
+        )
+
+    def for_(self, init, condition, increment, body):
+        key = ("for", _intern_key(init), _intern_key(condition))
+        return self.intern(
+            key + (_intern_key(increment), _intern_key(body)),
+            lambda: ForNode(init, condition, increment, body),
+        )
+
+
+def _intern_key(value):
+    # Strings and other scalars stand for themselves; nodes by identity
+    # (they are interned already); sequences by the keys of their items.
+    if isinstance(value, list):
+        return ("[",) + tuple(_intern_key(item) for item in value)
+    if isinstance(value, (str, int, type(None))):
+        return value
+    return ("#", id(value))
+
+
+DEFAULT_NODE_FACTORY = NodeFactory()
+RECOGNIZER_NODE_FACTORY = RecognizerNodeFactory()
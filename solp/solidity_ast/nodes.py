@@ -1,24 +1,129 @@
 # arc42: 5.4 AST Nodes
 # These represent the tree structure of Solidity source code after parsing.
+# Declaration nodes (contract, function, constructor, variable) carry a
+# `span` of (first line, last line) that is filled in by the RuleDispatcher.
+import hashlib
+import re
 from typing import Any
 
+from solp.lexer.definitions.keywords import KEYWORD_SET
+
+# Fields that never take part in structural comparison.
+POSITION_FIELDS = {"span"}
+# String fields that describe structure and are kept when identifiers are
+# ignored; every other string field is treated as (or as containing) names.
+STRUCTURAL_FIELDS = {"type", "kind", "visibility", "operator"}
+
+_WORD = re.compile(r"[^\W\d]\w*")
+_ELEMENTARY_TYPE = re.compile(r"(u?int|bytes|u?fixed)\d*(x\d+)?")
+_IDENTIFIER_PLACEHOLDER = "$id"
+
+
+def _abstract_identifiers(text):
+    # Replaces every identifier in a name or expression string, keeping
+    # keywords and elementary type names: "balances.add" -> "$id.$id".
+    def replace(match):
+        word = match.group()
+        if word in KEYWORD_SET or _ELEMENTARY_TYPE.fullmatch(word):
+            return word
+        return _IDENTIFIER_PLACEHOLDER
+
+    return _WORD.sub(replace, text)
+
+
+class Node:
+    # arc42: 5.4.1 Structural Hashes
+    # Every node exposes a Merkle-style structural hash: a blake2b digest of
+    # the node class and its fields, where child nodes contribute their own
+    # (cached) digests. Two subtrees are structurally identical exactly when
+    # their hashes are equal (up to digest collisions), independent of
+    # source positions. With `ignore_identifiers=True` names in
+    # declarations and expressions are abstracted, so alpha-renamed copies
+    # hash alike.
+    #
+    # Hashes are computed lazily, bottom-up, at most once per node and mode.
+    # Nodes are treated as immutable once parsed; only `span` is assigned
+    # later, and it is not part of the hash.
+    def fields(self):
+        # Yields (name, value) pairs of all structural fields in name order.
+        for name in sorted(vars(self)):
+            if not name.startswith("_") and name not in POSITION_FIELDS:
+                yield name, getattr(self, name)
+
+    def structural_hash(self, ignore_identifiers=False):
+        cache = self.__dict__.get("_hashes")
+        if cache is None:
+            cache = self._hashes = {}
+        digest = cache.get(ignore_identifiers)
+        if digest is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(type(self).__name__.encode())
+            for name, value in self.fields():
+                h.update(b"\x00" + name.encode() + b"=")
+                abstract = ignore_identifiers and name not in STRUCTURAL_FIELDS
+                _update_hash(h, value, ignore_identifiers, abstract)
+            digest = cache[ignore_identifiers] = h.digest()
+        return digest
+
+
+def _update_hash(h, value, ignore_identifiers, abstract):
+    if isinstance(value, Node):
+        h.update(b"N" + value.structural_hash(ignore_identifiers))
+    elif isinstance(value, (list, tuple)):
+        h.update(b"[%d" % len(value))
+        for item in value:
+            _update_hash(h, item, ignore_identifiers, abstract)
+        h.update(b"]")
+    elif isinstance(value, str):
+        if abstract:
+            value = _abstract_identifiers(value)
+        data = value.encode()
+        h.update(b"S%d:" % len(data) + data)
+    else:
+        h.update(b"V" + repr(value).encode())
+
+
+class SourceUnitNode(Node):
+    def __init__(self, children):
+        self.type = "SourceUnit"
+        self.children = children
+
+
+class PragmaNode(Node):
+    def __init__(self, name, value):
+        self.type = "Pragma"
+        self.name = name
+        self.value = value
+
+
+class ImportNode(Node):
+    def __init__(self, path, alias=None, symbols=None):
+        self.type = "Import"
+        self.path = path
+        self.alias = alias
+        self.symbols = symbols or []
+
 
-class ContractNode:
-    def __init__(self, name, members):
+class ContractNode(Node):
+    def __init__(self, name, members, kind="contract", bases=None, span=None):
         self.type = "Contract"
         self.name = name
         self.members = members
+        self.kind = kind
+        self.bases = bases or []
+        self.span = span
 
 
-class VariableNode:
-    def __init__(self, var_type, name, visibility=None):
+class VariableNode(Node):
+    def __init__(self, var_type, name, visibility=None, span=None):
         self.type = "Variable"
         self.var_type = var_type
         self.name = name
         self.visibility = visibility
+        self.span = span
 
 
-class FunctionNode:
+class FunctionNode(Node):
     def __init__(
         self,
         name,
@@ -27,6 +132,7 @@ class FunctionNode:
         parameters=None,
         returns=None,
         body=None,
+        span=None,
     ):
         self.type = "Function"
         self.name = name
@@ -35,9 +141,10 @@ class FunctionNode:
         self.parameters = parameters or []
         self.returns = returns or []
         self.body = body or []
+        self.span = span
 
 
-class StatementNode:
+class StatementNode(Node):
     type: str
     expr: Any
 
@@ -47,40 +154,41 @@ class StatementNode:
             setattr(self, k, v)
 
 
-class ReturnNode:
+class ReturnNode(Node):
     def __init__(self, value=None):
         self.type = "Return"
         self.value = value
 
 
-class CallNode:
+class CallNode(Node):
     def __init__(self, function, arguments):
         self.type = "Call"
         self.function = function
         self.arguments = arguments
 
 
-class IfNode:
+class IfNode(Node):
     def __init__(self, condition, then_block, else_block=None):
         self.condition = condition
         self.then_block = then_block
         self.else_block = else_block
 
 
-class ConstructorNode:
-    def __init__(self, parameters, visibility, body):
+class ConstructorNode(Node):
+    def __init__(self, parameters, visibility, body, span=None):
         self.parameters = parameters
         self.visibility = visibility
         self.body = body
+        self.span = span
 
 
-class WhileNode:
+class WhileNode(Node):
     def __init__(self, condition, body):
         self.condition = condition
         self.body = body
 
 
-class ForNode:
+class ForNode(Node):
     def __init__(self, init, condition, increment, body):
         self.init = init
         self.condition = condition
@@ -0,0 +1,25 @@
+# arc42: 5.4.4 Serialization
+# Converts AST nodes into plain dicts and lists for JSON output. Every node
+# becomes {"node": <kind>, <field>: <value>, ...}; spans are emitted as
+# [first, last] lists and can be shifted by a line offset when the node was
+# parsed from a fragment of a larger file.
+from solp.solidity_ast.nodes import Node
+
+
+def node_kind(node):
+    name = type(node).__name__
+    return name[: -len("Node")] if name.endswith("Node") else name
+
+
+def to_dict(value, line_offset=0):
+    if isinstance(value, Node):
+        data = {"node": node_kind(value)}
+        for name, field in value.fields():
+            data[name] = to_dict(field, line_offset)
+        span = getattr(value, "span", None)
+        if span is not None:
+            data["span"] = [span[0] + line_offset, span[1] + line_offset]
+        return data
+    if isinstance(value, (list, tuple)):
+        return [to_dict(item, line_offset) for item in value]
+    return value
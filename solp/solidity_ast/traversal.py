@@ -0,0 +1,25 @@
+# arc42: 5.4.2 Traversal
+# Generic helpers over the fields of AST nodes (see Node.fields()). Child
+# nodes may appear directly in a field or inside a list field; strings and
+# other scalar values are skipped.
+from solp.solidity_ast.nodes import Node
+
+
+def iter_child_nodes(node):
+    # Yields the direct child nodes in field order.
+    for _, value in node.fields():
+        if isinstance(value, Node):
+            yield value
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                if isinstance(item, Node):
+                    yield item
+
+
+def walk(node):
+    # Yields the node and all its descendants in pre-order.
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(list(iter_child_nodes(current))))
@@ -4,17 +4,99 @@
 # transparency, and full testability.
 from solp.lexer.lexer import Lexer
 from solp.parser.parser import Parser
+from solp.solidity_ast.factory import RECOGNIZER_NODE_FACTORY
+from solp.utils.diagnostics import Diagnostic
 
 
-def parse_contract(source_code: str):
+def parse_contract(source_code: str, nodes=None, symbols=None):
     """
     Parses Solidity source code into an AST ContractNode.
 
     :param source_code: Solidity source code as string
+    :param nodes: optional node factory (see solp.solidity_ast.factory)
+    :param symbols: optional SymbolTable shared across parses
     :return: ContractNode representing the parsed AST
     :raises: ParseError if the source code cannot be parsed
     """
-    tokens = Lexer(source_code).tokenize()
-    parser = Parser(tokens)
+    tokens = Lexer(source_code, symbols).tokenize()
+    parser = Parser(tokens, nodes)
 
     return parser.parse()
+
+
+# readme: Source Units
+# `parse_source_unit(source)` parses a complete Solidity file: pragma and
+# import directives plus any number of contracts, interfaces and libraries.
+# `iter_declarations(source)` yields the same top-level nodes one by one as
+# soon as each is parsed, lexing the file lazily along the way.
+def parse_source_unit(source_code: str, nodes=None, symbols=None):
+    """
+    Parses a complete Solidity file into a SourceUnitNode.
+
+    :param source_code: Solidity source code as string
+    :param nodes: optional node factory (see solp.solidity_ast.factory)
+    :param symbols: optional SymbolTable shared across parses
+    :return: SourceUnitNode with pragma, import and contract nodes
+    """
+    tokens = Lexer(source_code, symbols).tokenize()
+    parser = Parser(tokens, nodes)
+
+    return parser.parse_source_unit()
+
+
+def iter_declarations(source_code: str, symbols=None):
+    """
+    Yields the top-level nodes of a Solidity file as they are parsed.
+
+    :param source_code: Solidity source code as string
+    :param symbols: optional SymbolTable shared across parses
+    :return: generator of PragmaNode, ImportNode and ContractNode objects
+    """
+    parser = Parser(Lexer(source_code, symbols).iter_tokens())
+
+    yield from parser.iter_declarations()
+
+
+# readme: Syntax Check
+# `solp.check(source)` validates a complete file without building an AST. It
+# runs the same grammar rules as `parse_source_unit` (pragma and import
+# directives and any number of contracts), but with node construction turned
+# off, and returns `None` on success or a `Diagnostic` (message, line, col)
+# describing the first error. Tokens left after the last declaration are
+# reported as an error.
+def check(source_code: str):
+    """
+    Validates Solidity source code without building an AST.
+
+    :param source_code: Solidity source code as string
+    :return: None if the source is accepted, otherwise the first Diagnostic
+    """
+    lexer = Lexer(source_code)
+    try:
+        tokens = lexer.tokenize()
+    except Exception as exc:
+        return Diagnostic(str(exc), lexer.line, lexer.col)
+
+    parser = Parser(tokens, nodes=RECOGNIZER_NODE_FACTORY)
+    try:
+        parser.parse_source_unit()
+        if not parser.tokens.at_end():
+            raise Exception(f"Unexpected token {parser.tokens.current()}")
+    except Exception as exc:
+        # At the end of the input the EOF token carries the position of the
+        # last token; it has none if there were no tokens at all.
+        tok = parser.tokens.current()
+        if tok.line is None:
+            return Diagnostic(str(exc))
+        return Diagnostic(str(exc), tok.line, tok.col)
+    return None
+
+
+# readme: Thread Safety
+# The parsing functions may be called from several threads at once, also on
+# free-threaded CPython builds. Every call creates its own Lexer, Parser and
+# token stream; module-level tables (keywords, operators, symbols) are
+# immutable. Objects that are meant to be shared are safe to share: a
+# SymbolTable passed as `symbols`, a HashConsingNodeFactory passed as
+# `nodes`, and compiled queries (`solp.query`). Lexer, Parser and TokenStream
+# instances themselves keep cursor state and belong to a single thread.
@@ -0,0 +1,167 @@
+# arc42: 5.12 Corpus Token Statistics
+# Token-kind histograms, keyword frequencies and token n-gram counts over
+# integer-encoded token arrays (see 5.2.14 Array Export). All counting is
+# done with NumPy: the vocabulary ids of each n-gram window are packed into
+# one int64 code (`a * V**2 + b * V + c`) and counted with `np.unique`.
+# Only the distinct n-grams are decoded back into Python keys.
+#
+# Keys are vocabulary independent: a unigram is a (type, value) pair and an
+# n-gram is a tuple of such pairs. Results from worker processes that used
+# different vocabularies can therefore be merged by simple addition, and
+# they equal what a plain Python loop over Lexer.tokenize() would count.
+# N-grams never cross file boundaries.
+from collections import Counter
+
+from solp.lexer.arrays import KIND_IDS, KIND_NAMES, require_numpy
+from solp.lexer.definitions.keywords import KEYWORDS
+from solp.lexer.token_types import KEYWORD
+
+NGRAM_ORDERS = (1, 2, 3)
+INT64_LIMIT = 2**63
+
+
+def _rows(arrays):
+    # Returns (ids, kinds, counts) as 2-D matrices for single-file and batch
+    # TokenArrays alike.
+    if arrays.ids.ndim == 1:
+        return arrays.ids.reshape(1, -1), arrays.kinds.reshape(1, -1), arrays.counts
+    return arrays.ids, arrays.kinds, arrays.counts
+
+
+def count_ngrams(arrays, n, vocabulary):
+    """
+    Counts token n-grams of one file or batch.
+
+    :param arrays: TokenArrays from to_arrays() or to_arrays_batch()
+    :param n: n-gram order
+    :param vocabulary: Vocabulary the arrays were encoded with
+    :return: Counter mapping tuples of (type, value) pairs to counts
+    """
+    np = require_numpy()
+    ids, _, counts = _rows(arrays)
+    width = ids.shape[1] - n + 1
+    if width <= 0:
+        return Counter()
+
+    # A window starting at column j is valid if it ends before the file's
+    # token count; padding never takes part in an n-gram.
+    valid = np.arange(width)[None, :] + n <= counts[:, None]
+    columns = [ids[:, k : k + width][valid].astype(np.int64) for k in range(n)]
+
+    size = len(vocabulary)
+    if size**n < INT64_LIMIT:
+        codes = columns[0]
+        for column in columns[1:]:
+            codes = codes * size + column
+        unique, totals = np.unique(codes, return_counts=True)
+        decoded = (_unpack(code, n, size) for code in unique.tolist())
+    else:
+        unique, totals = np.unique(
+            np.stack(columns, axis=1), axis=0, return_counts=True
+        )
+        decoded = (tuple(row) for row in unique.tolist())
+
+    lookup = vocabulary.lookup
+    result = Counter()
+    for key, total in zip(decoded, totals.tolist()):
+        result[tuple(lookup(i) for i in key) if n > 1 else lookup(key[0])] = total
+    return result
+
+
+def _unpack(code, n, size):
+    key = []
+    for _ in range(n):
+        code, token_id = divmod(code, size)
+        key.append(token_id)
+    return tuple(reversed(key))
+
+
+def feature_vectors(arrays, vocabulary):
+    """
+    Builds one feature row per file: the token-kind histogram followed by
+    the frequency of every keyword in KEYWORDS order.
+
+    :param arrays: TokenArrays from to_arrays() or to_arrays_batch()
+    :param vocabulary: Vocabulary the arrays were encoded with
+    :return: int64 matrix of shape (files, len(KIND_IDS) + len(KEYWORDS))
+    """
+    np = require_numpy()
+    ids, kinds, counts = _rows(arrays)
+    files = ids.shape[0]
+    valid = np.arange(ids.shape[1])[None, :] < counts[:, None]
+    row_index = np.broadcast_to(np.arange(files)[:, None], ids.shape)[valid]
+
+    kind_slots = len(KIND_IDS) + 1
+    histogram = np.bincount(
+        row_index * kind_slots + kinds[valid], minlength=files * kind_slots
+    ).reshape(files, kind_slots)[:, 1:]
+
+    # Map vocabulary ids to keyword columns (-1 for non-keywords).
+    keyword_column = np.full(len(vocabulary), -1, dtype=np.int64)
+    for column, keyword in enumerate(KEYWORDS):
+        token_id = vocabulary.ids.get((KEYWORD, keyword))
+        if token_id is not None:
+            keyword_column[token_id] = column
+    columns = keyword_column[ids[valid]]
+    is_keyword = columns >= 0
+    keyword_counts = np.bincount(
+        row_index[is_keyword] * len(KEYWORDS) + columns[is_keyword],
+        minlength=files * len(KEYWORDS),
+    ).reshape(files, len(KEYWORDS))
+
+    return np.concatenate([histogram, keyword_counts], axis=1)
+
+
+class TokenStats:
+    # arc42: 5.12.1 Mergeable Statistics
+    # Accumulates kind histograms and 1- to 3-gram counts over many files.
+    # Instances are plain Counters underneath, so they pickle cheaply and
+    # merge() combines partial results from worker processes.
+    def __init__(self):
+        self.files = 0
+        self.tokens = 0
+        self.kinds = Counter()
+        self.ngrams = {n: Counter() for n in NGRAM_ORDERS}
+
+    def add(self, arrays, vocabulary):
+        np = require_numpy()
+        _, kinds, counts = _rows(arrays)
+        self.files += len(counts)
+        self.tokens += int(counts.sum())
+        valid = np.arange(kinds.shape[1])[None, :] < counts[:, None]
+        kind_totals = np.bincount(kinds[valid], minlength=len(KIND_IDS) + 1)
+        for kind_id, total in enumerate(kind_totals.tolist()[1:], start=1):
+            if total:
+                self.kinds[KIND_NAMES[kind_id]] += total
+        for n in NGRAM_ORDERS:
+            self.ngrams[n].update(count_ngrams(arrays, n, vocabulary))
+        return self
+
+    def merge(self, other):
+        self.files += other.files
+        self.tokens += other.tokens
+        self.kinds.update(other.kinds)
+        for n in NGRAM_ORDERS:
+            self.ngrams[n].update(other.ngrams[n])
+        return self
+
+    @property
+    def unigrams(self):
+        return self.ngrams[1]
+
+    @property
+    def bigrams(self):
+        return self.ngrams[2]
+
+    @property
+    def trigrams(self):
+        return self.ngrams[3]
+
+    def keyword_frequencies(self):
+        return Counter(
+            {
+                value: total
+                for (kind, value), total in self.unigrams.items()
+                if kind == KEYWORD
+            }
+        )
@@ -0,0 +1,12 @@
+# arc42: 5.6 Diagnostics
+# A Diagnostic describes why a source was rejected. It carries the error
+# message and, where known, the line and column of the offending token.
+# Positions follow the Token convention used throughout the lexer.
+class Diagnostic:
+    def __init__(self, message, line=None, col=None):
+        self.message = message
+        self.line = line
+        self.col = col
+
+    def __repr__(self):
+        return f"Diagnostic({self.message!r}, line={self.line}, col={self.col})"
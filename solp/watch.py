@@ -0,0 +1,166 @@
+# arc42: 5.9 Workspace Watcher
+# Long-running sessions keep a WorkspaceIndex of every `.sol` file below a
+# root directory: path -> (mtime_ns, size, content hash). Each poll walks the
+# tree with plain `os.scandir` (no OS-specific notification APIs) and only
+# touches file contents when the stat signature changed:
+# - same mtime and size: the file is skipped without being opened
+# - changed stat, same content hash: only the stat signature is updated
+# - changed content: the file is re-lexed and re-parsed
+# Every effective change produces a ChangeEvent carrying the new AST. The
+# index can be saved to and loaded from a JSON file so a restarted session
+# does not re-parse an unchanged workspace.
+import hashlib
+import json
+import os
+import time
+
+from solp.solidity_parser import parse_source_unit
+
+SOURCE_SUFFIX = ".sol"
+
+EVENT_ADDED = "added"
+EVENT_MODIFIED = "modified"
+EVENT_REMOVED = "removed"
+
+
+class ChangeEvent:
+    def __init__(self, kind, path, unit=None, error=None):
+        self.kind = kind
+        self.path = path
+        self.unit = unit
+        self.error = error
+
+    def __repr__(self):
+        return f"ChangeEvent({self.kind}, {self.path!r})"
+
+
+class WorkspaceIndex:
+    def __init__(self, root, entries=None):
+        # arc42: 5.9.1 Initialization
+        # `entries` maps absolute paths to (mtime_ns, size, digest) tuples.
+        # `units` holds the latest AST of every file parsed in this session.
+        # `dirty` is set whenever `entries` changes (including stat-only
+        # updates that produce no event) and cleared by save().
+        self.root = os.path.abspath(root)
+        self.entries = entries or {}
+        self.units = {}
+        self.dirty = False
+
+    def scan(self):
+        # arc42: 5.9.2 Poll
+        # Compares the current tree with the index and returns the list of
+        # change events in path order. A file that vanishes between the
+        # directory walk and the read (delete, atomic save via rename) is
+        # treated as absent for this poll.
+        events = []
+        seen = set()
+        for path, stat in self._walk():
+            seen.add(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            entry = self.entries.get(path)
+            if entry is not None and entry[:2] == signature:
+                continue
+            try:
+                event = self._refresh(path, signature, entry)
+            except OSError:
+                seen.discard(path)
+                continue
+            self.dirty = True
+            if event is not None:
+                events.append(event)
+
+        for path in sorted(set(self.entries) - seen):
+            del self.entries[path]
+            self.units.pop(path, None)
+            self.dirty = True
+            events.append(ChangeEvent(EVENT_REMOVED, path))
+        events.sort(key=lambda event: event.path)
+        return events
+
+    def _refresh(self, path, signature, entry):
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        self.entries[path] = (signature[0], signature[1], digest)
+        if entry is not None and entry[2] == digest:
+            return None
+
+        kind = EVENT_ADDED if entry is None else EVENT_MODIFIED
+        try:
+            unit = parse_source_unit(content.decode("utf-8"))
+        except Exception as exc:
+            self.units.pop(path, None)
+            return ChangeEvent(kind, path, error=str(exc))
+        self.units[path] = unit
+        return ChangeEvent(kind, path, unit=unit)
+
+    def _walk(self):
+        # arc42: 5.9.3 Directory Walk
+        # Iterative os.scandir traversal; DirEntry.stat() reuses the data
+        # already fetched by scandir where the platform provides it. An
+        # entry or directory that cannot be read is skipped on its own, so
+        # the rest of its directory is still reported.
+        stack = [self.root]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith(SOURCE_SUFFIX):
+                            yield entry.path, entry.stat()
+                    except OSError:
+                        continue
+
+    def save(self, index_path):
+        # arc42: 5.9.4 Persistence
+        # Writes the stat/hash index (not the ASTs) as JSON.
+        data = {"root": self.root, "entries": self.entries}
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, index_path, root):
+        # Returns an empty index if the file is missing or was written for a
+        # different root.
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(root)
+        if data.get("root") != os.path.abspath(root):
+            return cls(root)
+        entries = {path: tuple(entry) for path, entry in data["entries"].items()}
+        return cls(root, entries)
+
+
+def watch(root, callback, interval=0.5, index_path=None, stop=None):
+    """
+    Polls a directory tree and reports changed Solidity files.
+
+    :param root: directory to watch
+    :param callback: called with each ChangeEvent
+    :param interval: seconds between polls
+    :param index_path: optional JSON file persisting the index across runs
+    :param stop: optional threading.Event that ends the loop when set
+    :return: the WorkspaceIndex after the last poll
+    """
+    if index_path:
+        index = WorkspaceIndex.load(index_path, root)
+    else:
+        index = WorkspaceIndex(root)
+    while True:
+        events = index.scan()
+        for event in events:
+            callback(event)
+        if index_path and index.dirty:
+            index.save(index_path)
+        if stop is None:
+            time.sleep(interval)
+        elif stop.wait(interval):
+            return index
@@ -0,0 +1,275 @@
+# testdoc: Purpose
+# To test the binder: identifier uses in function bodies must resolve to the
+# innermost declaration (parameter, state variable, function, inherited
+# member, contract or import), keywords must be skipped, and rebinding one
+# edited function must update only its uses and the references that depend
+# on its name.
+
+# testdoc: Method
+# A small source unit with a base contract, imports and nested blocks is
+# parsed and bound. Uses are checked per function by name and declaration
+# kind; edits are simulated by parsing a changed copy of one function and
+# passing the old and new node to rebind().
+from solp.binder import (
+    DECL_CONTRACT,
+    DECL_FUNCTION,
+    DECL_IMPORT,
+    DECL_LOCAL,
+    DECL_PARAMETER,
+    DECL_STATE,
+    SCOPE_BLOCK,
+    SCOPE_DECLARATION,
+    bind,
+)
+from solp.solidity_ast.factory import HashConsingNodeFactory
+from solp.solidity_parser import parse_contract, parse_source_unit
+
+SOURCE = """import {Token as T} from "./Token.sol";
+contract Base {
+    uint total;
+    function add(uint amount) public {
+        total = amount;
+    }
+}
+contract Vault is Base {
+    uint owner;
+    constructor(uint start) public {
+        total = start;
+    }
+    function deposit(uint amount) public payable {
+        require(msg.value);
+        if (amount) {
+            add(amount);
+        } else {
+            revert(T);
+        }
+        emit Deposited(owner, amount);
+    }
+    function helper(uint total) public {
+        owner = total;
+    }
+}
+"""
+
+
+def _uses(bindings, function):
+    return [
+        (use.name, use.declaration and use.declaration.kind)
+        for use in bindings.uses_in(function)
+    ]
+
+
+def _members(unit, name):
+    contract = next(
+        node for node in unit.children if getattr(node, "name", None) == name
+    )
+    return {
+        getattr(member, "name", "constructor"): member for member in contract.members
+    }
+
+
+# testdoc: Uses resolve to parameters, state variables, functions and imports
+def test_uses_resolve_to_declarations():
+    unit = parse_source_unit(SOURCE)
+    bindings = bind(unit)
+    deposit = _members(unit, "Vault")["deposit"]
+    assert _uses(bindings, deposit) == [
+        ("amount", DECL_PARAMETER),
+        ("add", DECL_FUNCTION),
+        ("amount", DECL_PARAMETER),
+        ("T", DECL_IMPORT),
+        ("Deposited", None),
+        ("owner", DECL_STATE),
+        ("amount", DECL_PARAMETER),
+    ]
+
+
+# testdoc: Keywords such as msg and require are not treated as names
+def test_keywords_are_skipped():
+    unit = parse_source_unit(SOURCE)
+    bindings = bind(unit)
+    names = {use.name for uses in bindings.function_uses.values() for use in uses}
+    assert not names & {"msg", "require", "revert"}
+
+
+# testdoc: Members of base contracts are found after the contract's own scope
+def test_inherited_members_resolve_to_base():
+    unit = parse_source_unit(SOURCE)
+    bindings = bind(unit)
+    members = _members(unit, "Vault")
+    base = _members(unit, "Base")
+    total = bindings.uses_in(members["constructor"])[0]
+    assert total.declaration.kind == DECL_STATE
+    assert total.declaration.node is base["total"]
+    add = bindings.uses_in(members["deposit"])[1]
+    assert add.declaration.node is base["add"]
+
+
+# testdoc: A parameter shadows a state variable of the same name
+def test_parameter_shadows_state_variable():
+    unit = parse_source_unit(SOURCE)
+    bindings = bind(unit)
+    helper = _members(unit, "Vault")["helper"]
+    assert _uses(bindings, helper) == [
+        ("owner", DECL_STATE),
+        ("total", DECL_PARAMETER),
+    ]
+
+
+# testdoc: If branches are bound in their own block scopes
+def test_branches_get_block_scopes():
+    unit = parse_source_unit(SOURCE)
+    bindings = bind(unit)
+    deposit = _members(unit, "Vault")["deposit"]
+    uses = bindings.uses_in(deposit)
+    assert uses[1].scope.kind == SCOPE_BLOCK
+    assert uses[3].scope.kind == SCOPE_BLOCK
+    assert uses[1].scope is not uses[3].scope
+    assert uses[1].scope.parent is bindings.scope_of(deposit)
+
+
+# testdoc: A local declaration is visible only after it, to the block end
+def test_local_declarations():
+    unit = parse_source_unit("""contract A {
+        uint x;
+        function f(uint a) public {
+            g(x);
+            uint x = x;
+            h(x);
+            if (a) { uint a = x; } else { k(a); }
+            for (uint i = a; i; i) { m(i); }
+        }
+    }""")
+    bindings = bind(unit)
+    function = unit.children[0].members[1]
+    assert _uses(bindings, function) == [
+        ("g", None),
+        ("x", DECL_STATE),
+        ("x", DECL_STATE),
+        ("h", None),
+        ("x", DECL_LOCAL),
+        ("a", DECL_PARAMETER),
+        ("x", DECL_LOCAL),
+        ("k", None),
+        ("a", DECL_PARAMETER),
+        ("a", DECL_PARAMETER),
+        ("i", DECL_LOCAL),
+        ("i", DECL_LOCAL),
+        ("m", None),
+        ("i", DECL_LOCAL),
+    ]
+    local = bindings.uses_in(function)[4]
+    assert local.scope.kind == SCOPE_DECLARATION
+    assert local.declaration.node is function.body[1]
+
+
+# testdoc: Contracts are declared in the source unit scope
+def test_contracts_are_declared():
+    bindings = bind(parse_source_unit(SOURCE))
+    assert bindings.scope.symbols["Vault"].kind == DECL_CONTRACT
+    assert bindings.scope.lookup("Base").kind == DECL_CONTRACT
+
+
+# testdoc: The reference index lists every use of a declaration
+def test_references_index():
+    unit = parse_source_unit(SOURCE)
+    bindings = bind(unit)
+    owner = bindings.contract_scopes[unit.children[2]].symbols["owner"]
+    assert [use.node.type for use in bindings.references(owner)] == [
+        "emit",
+        "assignment",
+    ]
+    assert [use.name for use in bindings.unresolved()] == ["Deposited"]
+
+
+# testdoc: Overloaded functions share one declaration
+def test_overloads_share_declaration():
+    unit = parse_source_unit(
+        "contract C { function f(uint a) public { }"
+        " function f(uint a, uint b) public { } }"
+    )
+    bindings = bind(unit)
+    declaration = bindings.contract_scopes[unit.children[0]].symbols["f"]
+    assert len(declaration.overloads) == 2
+
+
+# testdoc: Rebinding an edited function replaces only its own uses
+def test_rebind_replaces_function_uses():
+    unit = parse_source_unit(SOURCE)
+    bindings = bind(unit)
+    members = _members(unit, "Vault")
+    other = list(bindings.uses_in(members["deposit"]))
+    edited = parse_contract(
+        "contract X { function helper(uint value) public"
+        " { owner = value; total = value; } }"
+    ).members[0]
+    vault = unit.children[2]
+    vault.members[vault.members.index(members["helper"])] = edited
+    bindings.rebind(members["helper"], edited)
+    assert _uses(bindings, edited) == [
+        ("owner", DECL_STATE),
+        ("value", DECL_PARAMETER),
+        ("total", DECL_STATE),
+        ("value", DECL_PARAMETER),
+    ]
+    assert members["helper"] not in bindings.function_uses
+    assert bindings.uses_in(members["deposit"]) == other
+    total = bindings.contract_scopes[unit.children[1]].symbols["total"]
+    assert edited.body[1] in {use.node for use in bindings.references(total)}
+
+
+# testdoc: Renaming a function re-resolves the uses of the old and new name
+def test_rebind_renamed_function_updates_callers():
+    unit = parse_source_unit(
+        "contract C { function a() public { b(); } function b() public { } }"
+    )
+    bindings = bind(unit)
+    a, b = unit.children[0].members
+    call = bindings.uses_in(a)[0]
+    assert call.declaration.kind == DECL_FUNCTION
+
+    renamed = parse_contract("contract X { function c() public { } }").members[0]
+    bindings.rebind(b, renamed)
+    assert call.declaration is None
+    assert bindings.unresolved() == [call]
+
+    restored = parse_contract("contract X { function b() public { } }").members[0]
+    bindings.rebind(renamed, restored)
+    assert call.declaration.node is restored
+    assert bindings.unresolved() == []
+
+
+# testdoc: A rebound function shadows inherited and imported declarations
+def test_rebind_shadowing_function():
+    unit = parse_source_unit(SOURCE)
+    bindings = bind(unit)
+    vault = _members(unit, "Vault")
+    start = bindings.uses_in(vault["constructor"])[0]
+    (imported,) = [u for u in bindings.uses_in(vault["deposit"]) if u.name == "T"]
+    assert (start.name, start.declaration.kind) == ("total", DECL_STATE)
+    assert (imported.name, imported.declaration.kind) == ("T", DECL_IMPORT)
+
+    shadow = parse_contract("contract X { function total() public { } }").members[0]
+    bindings.rebind(vault["helper"], shadow)
+    assert start.declaration.node is shadow
+
+    base = _members(unit, "Base")
+    derived = parse_contract("contract X { function T() public { } }").members[0]
+    bindings.rebind(base["add"], derived)
+    assert imported.declaration.node is derived
+    assert imported in bindings.references(imported.declaration)
+
+
+# testdoc: Binding works on ASTs with shared (hash-consed) nodes
+def test_bind_hash_consed_tree():
+    source = (
+        "contract C { uint x; function f(uint a) public { x = a; }"
+        " function g(uint a) public { x = a; } }"
+    )
+    unit = parse_source_unit(source, nodes=HashConsingNodeFactory())
+    f, g = unit.children[0].members[1:]
+    assert f.body[0] is g.body[0]
+    bindings = bind(unit)
+    assert bindings.uses_in(f)[1].declaration.node is f.parameters[0]
+    assert bindings.uses_in(g)[1].declaration.node is g.parameters[0]
+    assert bindings.uses_in(f)[1].scope is not bindings.uses_in(g)[1].scope
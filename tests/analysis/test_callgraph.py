@@ -0,0 +1,147 @@
+# testdoc: Purpose
+# To test the call graph: call sites must resolve to the called functions
+# (including inherited ones, `this.` and `super.` calls and overloads by
+# argument count), transitive queries must follow cycles, and updating one
+# re-parsed function must change only its outgoing edges and the call
+# sites that name it.
+
+# testdoc: Method
+# Small source units are parsed, bound and turned into call graphs. Direct
+# callees, callers and transitive closures are compared with the expected
+# function names; updates replace a function by a freshly parsed version.
+from solp.callgraph import build_call_graph
+from solp.solidity_parser import parse_contract, parse_source_unit
+
+SOURCE = """contract Base {
+    function audit() public { }
+    function log(uint a) public { audit(); }
+}
+contract Vault is Base {
+    function deposit(uint a) public { check(a); this.store(a); }
+    function check(uint a) public { require(a); log(a); }
+    function store(uint a) public { token.transfer(a); super.log(a); }
+    function loop(uint a) public { again(a); }
+    function again(uint a) public { loop(a); }
+}
+"""
+
+
+def _graph(source=SOURCE):
+    unit = parse_source_unit(source)
+    functions = {}
+    for contract in unit.children:
+        for member in contract.members:
+            functions[f"{contract.name}.{member.name}"] = member
+    return unit, build_call_graph(unit), functions
+
+
+def _names(functions, nodes):
+    lookup = {id(node): name for name, node in functions.items()}
+    return sorted(lookup[id(node)] for node in nodes)
+
+
+# testdoc: Direct calls resolve to own and inherited functions
+def test_direct_callees():
+    _, graph, functions = _graph()
+    assert _names(functions, graph.callees(functions["Vault.deposit"])) == [
+        "Vault.check",
+        "Vault.store",
+    ]
+    assert _names(functions, graph.callees(functions["Vault.check"])) == ["Base.log"]
+    assert _names(functions, graph.callees(functions["Vault.store"])) == ["Base.log"]
+
+
+# testdoc: Builtins and calls on other contracts are kept as external sites
+def test_external_calls():
+    _, graph, functions = _graph()
+    assert [site.name for site in graph.external[functions["Vault.check"]]] == [
+        "require"
+    ]
+    assert [site.name for site in graph.external[functions["Vault.store"]]] == [
+        "token.transfer"
+    ]
+
+
+# testdoc: Callers are found through the callee name index
+def test_callers():
+    _, graph, functions = _graph()
+    assert _names(functions, graph.callers(functions["Base.log"])) == [
+        "Vault.check",
+        "Vault.store",
+    ]
+
+
+# testdoc: Transitive closures follow chains and cycles
+def test_transitive_closure():
+    _, graph, functions = _graph()
+    assert _names(functions, graph.reachable(functions["Vault.deposit"])) == [
+        "Base.audit",
+        "Base.log",
+        "Vault.check",
+        "Vault.store",
+    ]
+    assert graph.calls(functions["Vault.loop"], functions["Vault.loop"])
+    assert not graph.calls(functions["Base.audit"], functions["Vault.deposit"])
+
+
+# testdoc: Transitive closures are memoized
+def test_closure_is_memoized():
+    _, graph, functions = _graph()
+    first = graph.reachable(functions["Vault.deposit"])
+    assert graph.reachable(functions["Vault.deposit"]) is first
+
+
+# testdoc: Overloads are narrowed by argument count
+def test_overloads_by_argument_count():
+    _, graph, functions = _graph(
+        "contract C { function f(uint a) public { }"
+        " function f(uint a, uint b) public { }"
+        " function g(uint a) public { f(a, a); } }"
+    )
+    targets = graph.callees(functions["C.g"])
+    assert len(targets) == 1
+    assert len(targets[0].parameters) == 2
+
+
+# testdoc: Updating a function replaces only its outgoing edges
+def test_update_function_replaces_edges():
+    unit, graph, functions = _graph()
+    deposit = functions["Vault.deposit"]
+    closure_of_loop = graph.reachable(functions["Vault.loop"])
+    graph.reachable(deposit)
+    sites_of_check = graph.call_sites(functions["Vault.check"])
+
+    edited = parse_contract(
+        "contract X { function deposit(uint a) public { again(a); } }"
+    ).members[0]
+    vault = unit.children[1]
+    vault.members[vault.members.index(deposit)] = edited
+    graph.update_function(deposit, edited)
+
+    assert deposit not in graph.sites
+    assert _names(functions, graph.callees(edited)) == ["Vault.again"]
+    assert graph.call_sites(functions["Vault.check"]) is sites_of_check
+    assert graph.reachable(functions["Vault.loop"]) is closure_of_loop
+    assert _names(functions, graph.reachable(edited)) == ["Vault.again", "Vault.loop"]
+
+
+# testdoc: Renaming a function re-resolves the call sites that name it
+def test_update_renamed_function():
+    unit, graph, functions = _graph()
+    check = functions["Vault.check"]
+    deposit = functions["Vault.deposit"]
+    assert graph.calls(deposit, functions["Base.audit"])
+
+    renamed = parse_contract(
+        "contract X { function verify(uint a) public { } }"
+    ).members[0]
+    graph.update_function(check, renamed)
+    assert _names(functions, graph.callees(deposit)) == ["Vault.store"]
+    assert graph.callers(renamed) == []
+
+    restored = parse_contract(
+        "contract X { function check(uint a) public { } }"
+    ).members[0]
+    graph.update_function(renamed, restored)
+    assert restored in graph.callees(deposit)
+    assert graph.callers(restored) == [deposit]
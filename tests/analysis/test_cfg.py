@@ -0,0 +1,153 @@
+# testdoc: Purpose
+# To test control-flow graph construction: branches, loops, break, continue,
+# return and revert must produce the expected basic blocks and edges, dead
+# code must be reported as unreachable, and dominator queries must match
+# the structure of the source.
+
+# testdoc: Method
+# Small functions are parsed and lowered with build_cfg(). Block contents,
+# successor and predecessor lists are compared with hand-derived graphs;
+# dominators are checked against known relations and, on random graphs,
+# against a brute-force computation.
+import random
+
+from solp.cfg import ENTRY, EXIT, NO_BLOCK, ControlFlowGraph, build_cfg
+from solp.solidity_ast.nodes import ForNode, IfNode, ReturnNode, WhileNode
+from solp.solidity_parser import parse_contract
+
+
+def _cfg(body):
+    contract = parse_contract(
+        f"contract C {{ function f(uint a) public {{ {body} }} }}"
+    )
+    return build_cfg(contract.members[0])
+
+
+def _successors(cfg):
+    return [list(cfg.successors(block)) for block in range(len(cfg))]
+
+
+# testdoc: Straight-line code is one block between entry and exit
+def test_straight_line_code():
+    cfg = _cfg("x = a; y = x; g(y);")
+    assert len(cfg.blocks[ENTRY]) == 3
+    assert _successors(cfg) == [[EXIT], []]
+    assert list(cfg.predecessors(EXIT)) == [ENTRY]
+
+
+# testdoc: If/else branches join in a common block
+def test_if_else_joins():
+    cfg = _cfg("if (a) { x = a; } else { y = a; } z = a;")
+    assert isinstance(cfg.blocks[ENTRY][-1], IfNode)
+    # then: 2, join: 3 (created after the then branch), else: 4
+    assert _successors(cfg) == [[2, 4], [], [3], [EXIT], [3]]
+    assert cfg.dominates(ENTRY, 3)
+    assert not cfg.dominates(2, 3)
+
+
+# testdoc: An if without else falls through to the join block
+def test_if_without_else():
+    cfg = _cfg("if (a) { x = a; } z = a;")
+    assert _successors(cfg) == [[2, 3], [], [3], [EXIT]]
+
+
+# testdoc: While loops get a header with back edge, break and continue edges
+def test_while_loop_with_break_and_continue():
+    cfg = _cfg("while (a) { if (b) { break; } continue; } z = a;")
+    header = 2
+    assert isinstance(cfg.blocks[header][0], WhileNode)
+    body, after = cfg.successors(header)
+    assert isinstance(cfg.blocks[body][0], IfNode)
+    breaking, continuing = cfg.successors(body)
+    assert list(cfg.successors(breaking)) == [after]
+    assert list(cfg.successors(continuing)) == [header]
+    assert sorted(cfg.predecessors(header)) == [ENTRY, continuing]
+    assert cfg.dominates(header, after)
+
+
+# testdoc: For loops continue at the increment block
+def test_for_loop_increment_block():
+    cfg = _cfg("for (i = a; i; i) { continue; }")
+    assert len(cfg.blocks[ENTRY]) == 1
+    header = cfg.successors(ENTRY)[0]
+    assert isinstance(cfg.blocks[header][0], ForNode)
+    body, after = cfg.successors(header)
+    increment = cfg.successors(body)[0]
+    assert cfg.blocks[increment] == ["i"]
+    assert list(cfg.successors(increment)) == [header]
+    assert list(cfg.successors(after)) == [EXIT]
+
+
+# testdoc: A for loop without condition only leaves through break
+def test_for_loop_without_condition():
+    cfg = _cfg("for (;;) { break; }")
+    header = cfg.successors(ENTRY)[0]
+    assert len(cfg.successors(header)) == 1
+
+
+# testdoc: Code after return or revert is unreachable
+def test_dead_code_after_return_and_revert():
+    cfg = _cfg("if (a) { return a; x = a; } revert(a); y = a;")
+    dead = cfg.unreachable_blocks()
+    assert len(dead) == 2
+    assert all(not cfg.is_reachable(block) for block in dead)
+    assert all(cfg.dominators()[block] == NO_BLOCK for block in dead)
+    returning = [
+        b for b, s in enumerate(cfg.blocks) if s and isinstance(s[0], ReturnNode)
+    ]
+    assert list(cfg.successors(returning[0])) == [EXIT]
+
+
+# testdoc: Adjacency is stored in compact integer arrays
+def test_adjacency_arrays():
+    cfg = _cfg("while (a) { x = a; } y = a;")
+    assert cfg.successor_offsets.typecode == "i"
+    assert len(cfg.successor_offsets) == len(cfg) + 1
+    assert len(cfg.successors_of) == len(cfg.predecessors_of) == cfg.edge_count()
+
+
+def _brute_force_dominators(count, edges):
+    successors = [[] for _ in range(count)]
+    for a, b in edges:
+        successors[a].append(b)
+
+    def reach(skip):
+        seen = set() if skip == ENTRY else {ENTRY}
+        stack = list(seen)
+        while stack:
+            for target in successors[stack.pop()]:
+                if target != skip and target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return seen
+
+    reachable = reach(None)
+    dominators = {
+        b: {a for a in range(count) if a == b or b not in reach(a)} for b in reachable
+    }
+    idom = [NO_BLOCK] * count
+    for block in reachable:
+        strict = dominators[block] - {block}
+        idom[block] = max(strict, key=lambda a: len(dominators[a])) if strict else block
+    return idom
+
+
+# testdoc: Dominators of random graphs match a brute-force computation
+def test_dominators_match_brute_force():
+    rng = random.Random(7)
+    for _ in range(200):
+        count = rng.randint(2, 10)
+        edges = [
+            (rng.randrange(count), rng.randrange(count))
+            for _ in range(rng.randint(1, 20))
+        ]
+        cfg = ControlFlowGraph(None, [[] for _ in range(count)], edges)
+        assert list(cfg.dominators()) == _brute_force_dominators(count, edges)
+
+
+# testdoc: Long functions are lowered without recursion limits
+def test_long_function():
+    cfg = _cfg("if (a) { x = a; } while (a) { y = a; } " * 2000)
+    assert len(cfg) > 8000
+    assert cfg.is_reachable(EXIT)
+    assert cfg.dominators()[EXIT] != NO_BLOCK
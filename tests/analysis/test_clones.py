@@ -0,0 +1,106 @@
+# testdoc: Purpose
+# To test token clone detection: renamed copies must be found as clone pairs
+# with correct token spans and lines, unrelated code must not match, and
+# files added incrementally must be compared with all earlier files.
+
+# testdoc: Method
+# Small sources with known copied regions are added with a short window.
+# Reported spans are checked against the normalized token streams, and a
+# directory scan is compared with adding the same files one by one.
+from solp.clones import CloneDetector, detect_clones
+from solp.lexer.lexer import Lexer
+
+ORIGINAL = """contract A {
+    function pay(address to) public payable {
+        require(msg.value);
+        emit Paid(to, msg.value);
+    }
+}
+"""
+
+RENAMED = """contract B {
+    uint total;
+    function send(address dest) public payable {
+        require(msg.value);
+        emit Sent(dest, msg.value);
+    }
+}
+"""
+
+UNRELATED = "pragma solidity ^0.8.0; import './A.sol';"
+
+
+# testdoc: A renamed copy is reported as one maximal clone pair
+def test_renamed_copy_is_reported():
+    detector = CloneDetector(window=10)
+    assert detector.add_file("A.sol", ORIGINAL) == []
+    pairs = detector.add_file("B.sol", RENAMED)
+    assert len(pairs) == 1
+    pair = pairs[0]
+    assert (pair.path_a, pair.path_b) == ("A.sol", "B.sol")
+    # `function ... }` of A (tokens 3..30) equals tokens 6..33 of B
+    assert pair.span_a == (3, 31)
+    assert pair.span_b == (6, 34)
+    assert pair.lines_a == (2, 6)
+    assert pair.lines_b == (3, 7)
+    assert pair.length == 28
+
+
+# testdoc: The tokens inside a reported span are equal after normalization
+def test_reported_spans_match_normalized_tokens():
+    detector = CloneDetector(window=10)
+    detector.add_file("A.sol", ORIGINAL)
+    pair = detector.add_file("B.sol", RENAMED)[0]
+    a = detector.normalize(Lexer(ORIGINAL).tokenize())
+    b = detector.normalize(Lexer(RENAMED).tokenize())
+    assert a[slice(*pair.span_a)] == b[slice(*pair.span_b)]
+
+
+# testdoc: Code shorter than the window or without common windows is ignored
+def test_unrelated_code_is_not_reported():
+    detector = CloneDetector(window=10)
+    detector.add_file("A.sol", ORIGINAL)
+    assert detector.add_file("C.sol", UNRELATED) == []
+    assert detector.add_file("D.sol", "contract D {}") == []
+
+
+# testdoc: Repeated code within one file is reported without overlaps
+def test_clone_within_one_file():
+    body = "function f(uint a) public { emit E(a); }"
+    detector = CloneDetector(window=8)
+    pairs = detector.add_file("A.sol", f"contract A {{ {body} {body} }}")
+    assert len(pairs) == 1
+    pair = pairs[0]
+    assert pair.path_a == pair.path_b == "A.sol"
+    assert pair.span_a[1] <= pair.span_b[0]
+    assert pair.length == 15
+
+
+# testdoc: A file added later is compared with every earlier file
+def test_incremental_addition_accumulates_pairs():
+    detector = CloneDetector(window=10)
+    detector.add_file("A.sol", ORIGINAL)
+    detector.add_file("B.sol", RENAMED)
+    pairs = detector.add_file("C.sol", ORIGINAL)
+    assert sorted(pair.path_a for pair in pairs) == ["A.sol", "B.sol"]
+    assert len(detector.pairs) == 3
+
+
+# testdoc: The bucket cap bounds the occurrences indexed per hash
+def test_bucket_cap_limits_index_size():
+    detector = CloneDetector(window=5, max_bucket=2)
+    for i in range(5):
+        detector.add_file(f"{i}.sol", ORIGINAL)
+    assert max(len(bucket) for bucket in detector.index.values()) == 2
+
+
+# testdoc: Scanning a directory equals adding its files in path order
+def test_detect_clones_in_directory(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "A.sol").write_text(ORIGINAL)
+    (tmp_path / "B.sol").write_text(RENAMED)
+    (tmp_path / "notes.txt").write_text(ORIGINAL)
+    pairs = detect_clones(str(tmp_path), window=10)
+    assert len(pairs) == 1
+    assert pairs[0].path_a == str(tmp_path / "B.sol")
+    assert pairs[0].path_b == str(tmp_path / "a" / "A.sol")
@@ -0,0 +1,195 @@
+# testdoc: Purpose
+# To test streaming metrics: statement counts, cyclomatic complexity,
+# nesting depth, calls and fan-out must be computed while parsing without
+# an AST, records must be written as CSV or JSON lines, and summaries of
+# separate files must merge into the summary of the whole corpus.
+
+# testdoc: Method
+# Functions with known metrics are parsed through the MetricsNodeFactory.
+# The results are cross-checked against a walk over the regular AST of the
+# same source; corpus runs use temporary files, a thread pool stands in
+# for worker processes.
+import csv
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from solp.metrics import (
+    FORMAT_JSONL,
+    MetricsSummary,
+    MetricsWriter,
+    corpus_metrics,
+    file_metrics,
+    iter_source_files,
+    source_metrics,
+)
+from solp.solidity_ast.nodes import CallNode, ForNode, IfNode, WhileNode
+from solp.solidity_ast.traversal import iter_child_nodes
+from solp.solidity_parser import parse_source_unit
+
+SOURCE = """contract Vault {
+    uint balance;
+    constructor(uint start) public {
+        balance = start;
+    }
+    function pay(uint amount) public payable {
+        require(msg.value);
+        if (amount) {
+            while (balance) {
+                log(amount);
+                log(balance);
+                audit(amount);
+            }
+        } else {
+            return amount;
+        }
+    }
+}
+contract Loop {
+    function run() public {
+        for (i = x; i; i) {
+            if (x) { break; }
+        }
+    }
+}
+"""
+
+
+def _collect(source=SOURCE, path=None):
+    records = []
+    source_metrics(source, records.append, path)
+    return records
+
+
+def _ast_metrics(function):
+    # Reference values from the regular AST.
+    statements = decisions = calls = 0
+    callees = set()
+
+    def depth(block):
+        deepest = 0
+        for statement in block or []:
+            if isinstance(statement, IfNode):
+                inner = max(depth(statement.then_block), depth(statement.else_block))
+                deepest = max(deepest, inner + 1)
+            elif isinstance(statement, (WhileNode, ForNode)):
+                deepest = max(deepest, depth(statement.body) + 1)
+        return deepest
+
+    stack = list(function.body)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, CallNode):
+            calls += 1
+            callees.add(node.function)
+        else:
+            statements += 1
+            decisions += isinstance(node, (IfNode, WhileNode, ForNode))
+        stack.extend(iter_child_nodes(node))
+    return statements, decisions + 1, depth(function.body), calls, len(callees)
+
+
+# testdoc: Metrics of each function are computed while parsing
+def test_function_metrics():
+    constructor, pay, run = _collect()
+    assert (constructor.contract, constructor.name) == ("Vault", "constructor")
+    assert (constructor.statements, constructor.cyclomatic) == (1, 1)
+    assert (pay.contract, pay.name, pay.span) == ("Vault", "pay", (6, 17))
+    assert (pay.statements, pay.cyclomatic, pay.max_depth) == (7, 3, 2)
+    assert (pay.calls, pay.fan_out) == (4, 3)
+    assert (run.contract, run.statements, run.cyclomatic, run.max_depth) == (
+        "Loop",
+        4,
+        3,
+        2,
+    )
+
+
+# testdoc: Streaming metrics agree with a walk over the regular AST
+def test_metrics_match_ast_walk():
+    functions = [
+        member
+        for contract in parse_source_unit(SOURCE).children
+        for member in contract.members
+        if hasattr(member, "body")
+    ]
+    for record, function in zip(_collect(), functions):
+        assert (
+            record.statements,
+            record.cyclomatic,
+            record.max_depth,
+            record.calls,
+            record.fan_out,
+        ) == _ast_metrics(function)
+
+
+# testdoc: Records are written as CSV with header or as JSON lines
+def test_writers():
+    stream = io.StringIO()
+    writer = MetricsWriter(stream)
+    for record in _collect(path="a.sol"):
+        writer.write(record)
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert [row["function"] for row in rows] == ["constructor", "pay", "run"]
+    assert rows[1]["cyclomatic"] == "3"
+
+    stream = io.StringIO()
+    writer = MetricsWriter(stream, FORMAT_JSONL)
+    for record in _collect(path="a.sol"):
+        writer.write(record)
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines[1]["path"] == "a.sol"
+    assert lines[1]["first_line"] == 6
+
+
+# testdoc: Merged per-file summaries equal the summary of all records
+def test_summary_merge():
+    records = _collect()
+    whole = MetricsSummary()
+    for record in records:
+        whole.add(record)
+    left, right = MetricsSummary(), MetricsSummary()
+    left.add(records[0])
+    for record in records[1:]:
+        right.add(record)
+    assert left.merge(right).as_dict() == whole.as_dict()
+    assert whole.histogram == {1: 1, 3: 2}
+
+
+# testdoc: Functions without body have depth 0 instead of failing
+def test_bodyless_functions():
+    records = _collect(
+        "interface I { function f() external; }\n"
+        "contract C { function g() public; function h() public { k(x); } }"
+    )
+    assert [(r.contract, r.name, r.max_depth) for r in records] == [
+        ("I", "f", 0),
+        ("C", "g", 0),
+        ("C", "h", 0),
+    ]
+    assert records[2].calls == 1
+
+
+# testdoc: Corpus runs stream records and report broken files
+def test_corpus_metrics(tmp_path):
+    (tmp_path / "a.sol").write_text(SOURCE)
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.sol").write_text(SOURCE)
+    (tmp_path / "broken.sol").write_text("contract {")
+    paths = list(iter_source_files(str(tmp_path)))
+    assert [p.rsplit("/", 1)[1] for p in paths] == ["a.sol", "broken.sol", "b.sol"]
+
+    stream = io.StringIO()
+    errors = []
+    serial = corpus_metrics(
+        paths,
+        MetricsWriter(stream, FORMAT_JSONL),
+        on_error=lambda path, message: errors.append(path),
+    )
+    assert errors == [paths[1]]
+    with ThreadPoolExecutor(2) as executor:
+        parallel = corpus_metrics(paths, executor=executor)
+    assert serial.as_dict() == parallel.as_dict()
+    assert (serial.files, serial.errors, serial.functions) == (3, 1, 6)
+    assert len(stream.getvalue().splitlines()) == 6
+    assert file_metrics(paths[1])[2] is not None
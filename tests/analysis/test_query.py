@@ -0,0 +1,135 @@
+# testdoc: Purpose
+# To test the AST query language: selectors with kinds, attribute
+# predicates, child and descendant combinators, :has() and :not() must
+# select the expected nodes, batches of queries must give the same results
+# as single queries, and the kind index must describe every subtree.
+
+# testdoc: Method
+# A small contract with payable and non-payable functions, branches and
+# calls is parsed once. Selected nodes are compared by name or statement
+# type; invalid selectors must raise.
+import pytest
+
+from solp.query import KindIndex, compile_query, run_queries, select
+from solp.solidity_ast.factory import HashConsingNodeFactory
+from solp.solidity_parser import parse_source_unit
+
+SOURCE = """contract Vault {
+    uint balance;
+    function deposit(uint amount) public payable {
+        require(msg.value);
+        balance = amount;
+    }
+    function sweep(uint amount) public payable {
+        balance = amount;
+        if (amount) { token.transfer(amount); }
+    }
+    function report(uint amount) public {
+        emit Report(amount);
+    }
+}
+"""
+
+
+@pytest.fixture(scope="module")
+def unit():
+    return parse_source_unit(SOURCE)
+
+
+def _names(nodes):
+    return [getattr(node, "name", None) or node.type for node in nodes]
+
+
+# testdoc: Kinds and truthy attributes select nodes
+def test_kind_and_attribute(unit):
+    assert _names(select(unit, "Function[is_payable]")) == ["deposit", "sweep"]
+    assert _names(select(unit, "FunctionNode[!is_payable]")) == ["report"]
+    assert _names(select(unit, "Variable")) == ["balance", "amount", "amount", "amount"]
+
+
+# testdoc: Comparison operators match strings and literals
+def test_comparisons(unit):
+    assert _names(select(unit, "Function[name=sweep]")) == ["sweep"]
+    assert _names(select(unit, "Function[name!='sweep'][is_payable=true]")) == [
+        "deposit"
+    ]
+    assert _names(select(unit, "Call[function^=token.]")) == ["Call"]
+    assert _names(select(unit, 'Call[function*="transf"]')) == ["Call"]
+    assert _names(select(unit, "Statement[expr=require]")) == ["expression"]
+
+
+# testdoc: Child and descendant combinators follow the tree structure
+def test_combinators(unit):
+    assert _names(select(unit, "Function > Statement")) == [
+        "expression",
+        "assignment",
+        "assignment",
+        "emit",
+    ]
+    assert len(select(unit, "Function > Call")) == 0
+    assert len(select(unit, "Function Call")) == 2
+    assert (
+        len(select(unit, "Contract If > Statement Call[function=token.transfer]")) == 1
+    )
+
+
+# testdoc: :has() and :not() express structural patterns
+def test_has_and_not(unit):
+    query = "Function[is_payable]:not(:has(Call[function=require]))"
+    assert _names(select(unit, query)) == ["sweep"]
+    assert _names(select(unit, "Function:has(If)")) == ["sweep"]
+    assert _names(select(unit, "Function:not([is_payable])")) == ["report"]
+
+
+# testdoc: A batch of queries returns the same nodes as single queries
+def test_batch_matches_single_queries(unit):
+    queries = ["Function[is_payable]", "Call", "Statement[type=emit]", "*[name]"]
+    results = run_queries(unit, queries)
+    for query in queries:
+        assert results[query] == select(unit, query)
+
+
+# testdoc: Compiled queries are cached by their source text
+def test_compiled_queries_are_cached():
+    assert compile_query("Function[name=x]") is compile_query("Function[name=x]")
+
+
+# testdoc: The kind index records the kinds in every subtree
+def test_kind_index(unit):
+    index = KindIndex(unit)
+    contract = unit.children[0]
+    deposit, sweep, report = contract.members[1:]
+    call = compile_query("Call").kind_mask
+    condition = compile_query("If").kind_mask
+    assert index.contains(deposit, call)
+    assert not index.contains(deposit, condition)
+    assert index.contains(sweep, condition)
+    assert not index.contains(report, call)
+
+
+# testdoc: :has() results are memoized in the index
+def test_has_is_memoized(unit):
+    index = KindIndex(unit)
+    select(unit, "Function:has(Call)", index)
+    cached = dict(index._has)
+    assert len(cached) == 3
+    select(unit, "Function:has(Call)", index)
+    assert index._has == cached
+
+
+# testdoc: Queries work on hash-consed trees with shared subtrees
+def test_hash_consed_tree():
+    unit = parse_source_unit(SOURCE, nodes=HashConsingNodeFactory())
+    assert _names(select(unit, "Function:has(Statement[type=assignment])")) == [
+        "deposit",
+        "sweep",
+    ]
+
+
+# testdoc: Invalid selectors raise an error
+@pytest.mark.parametrize(
+    "source", ["", "Function[", "Function[name=]", "[x]", ":not()"]
+)
+def test_invalid_selectors(source):
+    with pytest.raises(Exception):
+        compile_query(source)
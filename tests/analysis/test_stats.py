@@ -0,0 +1,72 @@
+# testdoc: Purpose
+# To test the vectorized corpus statistics: n-gram counts, kind histograms,
+# keyword frequencies and per-file feature vectors must equal the counts of
+# a naive Python loop over Lexer.tokenize().
+
+# testdoc: Method
+# Several sources are encoded as single-file and batch arrays. Results are
+# compared with Counters built from Token objects; partial results built
+# with separate vocabularies are merged as worker processes would.
+from collections import Counter
+
+import pytest
+
+from solp.lexer import Vocabulary, to_arrays, to_arrays_batch
+from solp.lexer.definitions.keywords import KEYWORDS
+from solp.lexer.lexer import Lexer
+from solp.stats import TokenStats, count_ngrams, feature_vectors
+
+np = pytest.importorskip("numpy")
+
+SOURCES = [
+    "contract A { uint x; function f() public { x += y; x += y; } }",
+    "contract B { address public owner; function g(uint a) public payable { "
+    "require(a); emit E(a, a); } }",
+    "uint",
+    "",
+]
+
+
+def naive_ngrams(sources, n):
+    counts = Counter()
+    for source in sources:
+        pairs = [(tok.type, tok.value) for tok in Lexer(source).tokenize()]
+        for i in range(len(pairs) - n + 1):
+            counts[pairs[i] if n == 1 else tuple(pairs[i : i + n])] += 1
+    return counts
+
+
+@pytest.mark.parametrize("n", [1, 2, 3])
+def test_ngram_counts_match_naive_loop(n):
+    # testdoc: Batch n-gram counts equal a loop over Lexer tokens
+    vocabulary = Vocabulary()
+    batch = to_arrays_batch(SOURCES, vocabulary)
+    assert count_ngrams(batch, n, vocabulary) == naive_ngrams(SOURCES, n)
+
+
+def test_merge_of_worker_results_with_separate_vocabularies():
+    # testdoc: Merged partial stats equal stats over the whole corpus
+    partial = []
+    for chunk in (SOURCES[:1], SOURCES[1:]):
+        vocabulary = Vocabulary()
+        partial.append(TokenStats().add(to_arrays_batch(chunk, vocabulary), vocabulary))
+    merged = partial[0].merge(partial[1])
+
+    assert merged.files == len(SOURCES)
+    assert merged.trigrams == naive_ngrams(SOURCES, 3)
+    assert merged.bigrams == naive_ngrams(SOURCES, 2)
+    kinds = Counter(tok.type for s in SOURCES for tok in Lexer(s).tokenize())
+    assert merged.kinds == kinds
+    assert merged.keyword_frequencies()["function"] == 2
+
+
+def test_feature_vectors_per_file():
+    # testdoc: Feature rows hold the kind histogram and keyword counts per file
+    vocabulary = Vocabulary()
+    batch = to_arrays_batch(SOURCES, vocabulary)
+    features = feature_vectors(batch, vocabulary)
+    assert features.shape == (len(SOURCES), 6 + len(KEYWORDS))
+    single = feature_vectors(to_arrays(SOURCES[1], vocabulary), vocabulary)
+    assert features[1].tolist() == single[0].tolist()
+    assert features[1, 6 + KEYWORDS.index("payable")] == 1
+    assert features[3].sum() == 0
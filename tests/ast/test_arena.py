@@ -0,0 +1,196 @@
+# testdoc: Purpose
+# To test the flat node arena and the shared memory transport: encoded ASTs
+# must be readable through zero-copy views, materialize into structurally
+# identical trees and be removed once the parent closes the segments.
+
+# testdoc: Method
+# Parsed source units are encoded, viewed and materialized; structural
+# hashes and spans are compared with the original. Batches are parsed with
+# the shared memory transport in thread and process pools, and segment
+# names are checked to be gone after close() and after a failing worker.
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import pytest
+
+from solp import parse_source_unit
+from solp.batch import TRANSPORT_SHARED_MEMORY, parse_batch
+from solp.solidity_ast.arena import (
+    ArenaEncoder,
+    ArenaView,
+    SharedArena,
+    write_shared,
+)
+from solp.solidity_ast.factory import HashConsingNodeFactory
+from solp.solidity_ast.nodes import ContractNode, StatementNode
+
+SOURCE = """pragma solidity ^0.8.0;
+import {A as B} from "./A.sol";
+abstract contract Token is Base {
+    uint total;
+    constructor() public { total = x; }
+    function mint(uint amount) public payable {
+        if (amount) { emit Minted(amount); } else { revert(); }
+        for (; i; i) { total += amount; }
+    }
+}
+"""
+
+
+def encode(*units):
+    encoder = ArenaEncoder()
+    for unit in units:
+        encoder.add_root(unit)
+    return encoder
+
+
+# testdoc: A materialized tree is structurally identical to the original
+def test_roundtrip_preserves_structure():
+    unit = parse_source_unit(SOURCE)
+    view = ArenaView(encode(unit).to_bytes())
+    copy = view.root(0).materialize()
+    assert copy.structural_hash() == unit.structural_hash()
+    token = copy.children[2]
+    assert isinstance(token, ContractNode)
+    assert token.span == (3, 10)
+    assert token.members[1].span == (5, 5)
+    assert copy.children[1].symbols == [("A", "B")]
+    assert not hasattr(token.members[2].body[0], "span")
+    view.release()
+
+
+# testdoc: Node views read fields lazily without materializing
+def test_node_view_access():
+    view = ArenaView(encode(parse_source_unit(SOURCE)).to_bytes())
+    token = view.root(0).children[2]
+    assert token.class_name == "ContractNode"
+    assert (token.name, token.kind, token.bases, token.span) == (
+        "Token",
+        "contract",
+        ["Base"],
+        (3, 10),
+    )
+    mint = token.members[2]
+    assert mint.is_payable is True
+    assert mint.parameters[0].var_type == "uint"
+    assert mint.body[0].else_block[0].class_name == "StatementNode"
+    with pytest.raises(AttributeError):
+        mint.missing
+    assert view._materialized == {}
+    view.release()
+
+
+# testdoc: Several roots share one arena; shared subtrees stay shared
+def test_shared_subtrees_are_encoded_once():
+    factory = HashConsingNodeFactory()
+    a = parse_source_unit("contract A { function f() public { g(x); } }", factory)
+    b = parse_source_unit("contract B { function f() public { g(x); } }", factory)
+    encoder = encode(a, b)
+    view = ArenaView(encoder.to_bytes())
+    first = view.root(0).materialize().children[0].members[0].body[0]
+    second = view.root(1).materialize().children[0].members[0].body[0]
+    assert isinstance(first, StatementNode)
+    assert first is second
+    assert len(view) < 2 * len(ArenaView(encode(a).to_bytes()))
+    view.release()
+
+
+# testdoc: Unsupported field values are rejected
+def test_unknown_value_type_is_rejected():
+    unit = parse_source_unit("contract A { }")
+    unit.children[0].extra = 1.5
+    with pytest.raises(Exception):
+        encode(unit)
+
+
+# testdoc: A shared memory segment is readable by name and removed on close
+def test_shared_segment_lifecycle():
+    name = write_shared(encode(parse_source_unit(SOURCE)))
+    arena = SharedArena(name)
+    assert arena.root(0).children[2].name == "Token"
+    arena.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def write_corpus(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"C{i}.sol"
+        path.write_text(SOURCE.replace("Token", f"Token{i}"))
+        paths.append(str(path))
+    broken = tmp_path / "broken.sol"
+    broken.write_text("contract B { function f( }")
+    return paths + [str(broken)]
+
+
+# testdoc: Batch parsing returns views backed by shared memory segments
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_batch_shared_memory_transport(tmp_path, pool):
+    paths = write_corpus(tmp_path, 6)
+    expected = parse_source_unit(SOURCE.replace("Token", "Token3")).structural_hash()
+    if pool == "thread":
+        with ThreadPoolExecutor(2) as executor:
+            result = parse_batch(
+                paths,
+                max_workers=2,
+                executor=executor,
+                chunk_cost=1,
+                transport=TRANSPORT_SHARED_MEMORY,
+            )
+    else:
+        result = parse_batch(
+            paths, max_workers=2, chunk_cost=1, transport=TRANSPORT_SHARED_MEMORY
+        )
+    with result:
+        names = [arena.segment.name for arena in result.arenas]
+        assert len(names) == 7
+        assert list(result.errors) == [paths[-1]]
+        assert result.units[paths[3]].children[2].name == "Token3"
+        unit = result.units[paths[3]].materialize()
+    assert unit.structural_hash() == expected
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+class FailingExecutor(ThreadPoolExecutor):
+    # The third chunk writes its segment, then its worker fails.
+    def __init__(self):
+        super().__init__(2)
+        self.names = []
+
+    def submit(self, fn, *args):
+        self.names.append(args[2])
+        if len(self.names) != 3:
+            return super().submit(fn, *args)
+
+        def fail(*args):
+            fn(*args)
+            raise RuntimeError("worker died")
+
+        return super().submit(fail, *args)
+
+
+# testdoc: A failing worker leaves no shared memory segments behind
+def test_batch_failure_removes_segments(tmp_path):
+    paths = write_corpus(tmp_path, 8)
+    executor = FailingExecutor()
+    with executor, pytest.raises(RuntimeError):
+        parse_batch(
+            paths,
+            max_workers=2,
+            executor=executor,
+            chunk_cost=1,
+            transport=TRANSPORT_SHARED_MEMORY,
+        )
+    assert len(executor.names) >= 3
+    for name in executor.names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+# testdoc: Unknown transports are rejected
+def test_unknown_transport(tmp_path):
+    with pytest.raises(Exception):
+        parse_batch(write_corpus(tmp_path, 1), transport="carrier-pigeon")
@@ -0,0 +1,69 @@
+# testdoc: Purpose
+# To test the hash-consing node factory: structurally identical statements,
+# calls and parameters must be shared instances, declarations must stay
+# distinct, and the resulting AST must equal the one of the default factory.
+
+# testdoc: Method
+# Sources with repeated expressions are parsed with a HashConsingNodeFactory
+# and object identities are compared. Structural hashes are compared with a
+# parse through the default factory; the weak intern table is checked after
+# the ASTs are released.
+import gc
+
+from solp import parse_source_unit
+from solp.solidity_ast.factory import HashConsingNodeFactory
+
+SOURCE = """contract A {
+    function f(address to, uint amount) public { require(msg.sender); g(to); }
+    function h(address to, uint amount) public { require(msg.sender); g(to); }
+}
+"""
+
+
+# testdoc: Identical statements and parameters within one file are shared
+def test_identical_subtrees_are_shared():
+    factory = HashConsingNodeFactory()
+    f, h = parse_source_unit(SOURCE, factory).children[0].members
+    assert f is not h
+    assert f.parameters[0] is h.parameters[0]
+    assert f.body[0] is h.body[0]
+    assert f.body[1].expr is h.body[1].expr
+    assert f.body[0] is not f.body[1]
+    assert factory.hits == 6
+
+
+# testdoc: Sharing works across files parsed with the same factory
+def test_subtrees_are_shared_across_files():
+    factory = HashConsingNodeFactory()
+    a = parse_source_unit(SOURCE, factory)
+    b = parse_source_unit(SOURCE.replace("contract A", "contract B"), factory)
+    assert a.children[0] is not b.children[0]
+    assert a.children[0].members[0].body is not b.children[0].members[0].body
+    assert a.children[0].members[0].body[0] is b.children[0].members[0].body[0]
+    assert b.children[0].span == (1, 4)
+
+
+# testdoc: Different subtrees are never merged
+def test_different_subtrees_stay_distinct():
+    factory = HashConsingNodeFactory()
+    unit = parse_source_unit(
+        "contract A { function f(uint a) public { g(a); g(b); h(a); } }", factory
+    )
+    body = unit.children[0].members[0].body
+    assert len({id(statement) for statement in body}) == 3
+
+
+# testdoc: The shared AST is structurally equal to the default AST
+def test_shared_ast_equals_default_ast():
+    shared = parse_source_unit(SOURCE, HashConsingNodeFactory())
+    assert shared.structural_hash() == parse_source_unit(SOURCE).structural_hash()
+
+
+# testdoc: The intern table does not keep released ASTs alive
+def test_intern_table_is_weak():
+    factory = HashConsingNodeFactory()
+    unit = parse_source_unit(SOURCE, factory)
+    assert len(factory) > 0
+    del unit
+    gc.collect()
+    assert len(factory) == 0
@@ -0,0 +1,146 @@
+# testdoc: Purpose
+# To test structural hashes and the structural diff: identical subtrees must
+# hash alike regardless of position, renamed copies only when identifiers
+# are ignored, and diff() must report exactly the changed declarations and
+# statements, aligning unnamed items by content.
+
+# testdoc: Method
+# Sources are parsed with parse_source_unit() and the hashes of contracts,
+# functions and statements are compared. Diffs between two versions of a
+# source are checked by change kind and path; hash caching is checked by
+# counting child hash computations.
+from solp import parse_source_unit
+from solp.solidity_ast.diff import (
+    CHANGE_ADDED,
+    CHANGE_MODIFIED,
+    CHANGE_REMOVED,
+    diff,
+)
+from solp.solidity_ast.nodes import Node, StatementNode
+from solp.solidity_ast.traversal import iter_child_nodes, walk
+
+VERSION_1 = """contract Token {
+    uint total;
+    function mint(uint amount) public { total += amount; emit Minted(amount); }
+    function burn(uint amount) public { total -= amount; }
+}
+contract Vault { function pay() public payable { deposit(msg.value); } }
+"""
+
+VERSION_2 = """contract Token {
+    uint total;
+    function mint(uint amount) public { total += amount; emit Issued(amount); }
+    function withdraw() public { total = balance; }
+}
+contract Vault { function pay() public payable { deposit(msg.value); } }
+"""
+
+
+def hashes(source, ignore_identifiers=False):
+    unit = parse_source_unit(source)
+    return [c.structural_hash(ignore_identifiers) for c in unit.children]
+
+
+# testdoc: Identical subtrees hash alike independent of their position
+def test_identical_subtrees_have_equal_hashes():
+    unit = parse_source_unit(
+        "contract A { function f() public { g(x); } }\n\n"
+        "contract B { function f() public { g(x); } }"
+    )
+    a, b = unit.children
+    assert a.span != b.span
+    assert a.members[0].structural_hash() == b.members[0].structural_hash()
+    assert a.structural_hash() != b.structural_hash()
+
+
+# testdoc: Any change of name, operator or visibility changes the hash
+def test_changes_alter_hash():
+    base = hashes("contract A { function f() public { x += y; } }")
+    for changed in [
+        "contract A { function f() public { x -= y; } }",
+        "contract A { function f() external { x += y; } }",
+        "contract A { function g() public { x += y; } }",
+        "contract A { function f() public payable { x += y; } }",
+    ]:
+        assert hashes(changed) != base
+
+
+# testdoc: Renamed copies hash alike only when identifiers are ignored
+def test_ignore_identifiers():
+    original = "contract A { uint256 x; function f(uint a) public { x = a.b; } }"
+    renamed = "contract B { uint256 y; function g(uint c) public { y = c.d; } }"
+    retyped = "contract B { bool y; function g(uint c) public { y = c.d; } }"
+    assert hashes(original) != hashes(renamed)
+    assert hashes(original, True) == hashes(renamed, True)
+    assert hashes(original, True) != hashes(retyped, True)
+
+
+# testdoc: Hashes are cached per node and mode
+def test_hash_is_cached(monkeypatch):
+    unit = parse_source_unit(VERSION_1)
+    first = unit.structural_hash()
+    calls = []
+    original = Node.fields
+    monkeypatch.setattr(
+        Node, "fields", lambda self: calls.append(self) or original(self)
+    )
+    assert unit.structural_hash() == first
+    assert calls == []
+    unit.structural_hash(ignore_identifiers=True)
+    assert calls
+
+
+# testdoc: Traversal visits all nodes in pre-order
+def test_walk_visits_all_nodes():
+    unit = parse_source_unit(VERSION_1)
+    nodes = list(walk(unit))
+    assert nodes[0] is unit
+    assert list(iter_child_nodes(unit)) == unit.children
+    assert sum(isinstance(node, StatementNode) for node in nodes) == 4
+
+
+# testdoc: diff() reports modified, added and removed declarations
+def test_diff_reports_changed_declarations():
+    changes = diff(parse_source_unit(VERSION_1), parse_source_unit(VERSION_2))
+    summary = [(c.kind, c.path) for c in changes]
+    members = ("children", "Contract:Token", "members")
+    assert summary == [
+        (CHANGE_REMOVED, members + ("Function:burn",)),
+        (CHANGE_MODIFIED, members + ("Function:mint", "body", 1)),
+        (CHANGE_ADDED, members + ("Function:withdraw",)),
+    ]
+    assert changes[1].old.event == "Minted"
+    assert changes[1].new.event == "Issued"
+
+
+# testdoc: diff() does not descend into subtrees with equal hashes
+def test_diff_skips_unchanged_subtrees(monkeypatch):
+    old, new = parse_source_unit(VERSION_1), parse_source_unit(VERSION_2)
+    vault = old.children[1]
+    visited = []
+    original = Node.fields
+    monkeypatch.setattr(
+        Node, "fields", lambda self: visited.append(self) or original(self)
+    )
+    old.structural_hash()
+    new.structural_hash()
+    visited.clear()
+    diff(old, new)
+    assert not any(node in visited for node in walk(vault))
+    assert diff(old, old) == []
+
+
+def _body_diff(old_body, new_body):
+    old = parse_source_unit(f"contract A {{ function f() public {{ {old_body} }} }}")
+    new = parse_source_unit(f"contract A {{ function f() public {{ {new_body} }} }}")
+    return [(c.kind, c.path[-1]) for c in diff(old, new)]
+
+
+# testdoc: Inserting or editing one statement in a long body is one change
+def test_diff_aligns_statements_by_content():
+    body = " ".join(f"x{i} = a;" for i in range(50))
+    assert _body_diff(body, "g(a); " + body) == [(CHANGE_ADDED, 0)]
+    assert _body_diff(body, body.replace("x25 = a;", "")) == [(CHANGE_REMOVED, 25)]
+    edited = body.replace("x25 = a;", "x25 = b;")
+    assert _body_diff(body, edited) == [(CHANGE_MODIFIED, 25)]
+    assert _body_diff("x = a; y = b;", "y = b; x = a;") != []
@@ -0,0 +1,82 @@
+# testdoc: Purpose
+# To test the fast file header scanner that extracts pragmas, import paths
+# and top-level declaration names without running the lexer or parser.
+
+# testdoc: Method
+# Sources with comments, strings and nested bodies are scanned. Results are
+# compared with the expected header and, where the full grammar supports the
+# input, with the output of `parse_source_unit()`.
+from solp import parse_source_unit
+from solp.lexer.header import FileHeader, scan_header
+
+SOURCE = """
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+import "./Token.sol";
+import {A, B as C} from './Access.sol';
+import * as Lib from "./Lib.sol";
+
+/* contract Hidden { } */
+interface IVault {
+    function deposit(uint amount) external;
+}
+
+abstract contract Base is IVault {
+    function f() public {
+        emit Log("contract Fake { }");
+        if (x) { y = z; }
+    }
+}
+
+library Math { }
+"""
+
+
+def test_scan_header_fields():
+    # testdoc: Pragmas, imports and declarations are extracted in order
+    header = scan_header(SOURCE)
+    assert isinstance(header, FileHeader)
+    assert header.pragmas == [("solidity", "^0.8.0")]
+    assert header.imports == ["./Token.sol", "./Access.sol", "./Lib.sol"]
+    assert [(kind, name) for kind, name, _, _ in header.declarations] == [
+        ("interface", "IVault"),
+        ("contract", "Base"),
+        ("library", "Math"),
+    ]
+
+
+def test_scan_header_ignores_comments_and_strings():
+    # testdoc: Declarations inside comments or string literals are skipped
+    names = [name for _, name, _, _ in scan_header(SOURCE).declarations]
+    assert "Hidden" not in names
+    assert "Fake" not in names
+
+
+def test_declaration_spans_cover_whole_declaration():
+    # testdoc: Spans start at `abstract`/kind keyword and end after the body
+    for kind, name, start, end in scan_header(SOURCE).declarations:
+        text = SOURCE[start:end]
+        assert name in text
+        assert text.endswith("}")
+    _, _, start, _ = scan_header(SOURCE).declarations[1]
+    assert SOURCE[start:].startswith("abstract contract Base")
+
+
+def test_scan_header_matches_parser():
+    # testdoc: Declaration names agree with parse_source_unit()
+    code = """
+    pragma solidity >=0.8.0 <0.9.0;
+    contract A { uint x; }
+    contract B { function f() public { g(x); } }
+    """
+    header = scan_header(code)
+    unit = parse_source_unit(code)
+    parsed = [c.name for c in unit.children if c.type == "Contract"]
+    assert [name for _, name, _, _ in header.declarations] == parsed
+    assert header.pragmas == [("solidity", ">=0.8.0 <0.9.0")]
+
+
+def test_scan_header_tolerates_unterminated_input():
+    # testdoc: Unbalanced braces or comments end the scan without errors
+    header = scan_header("pragma solidity ^0.8.0;\ncontract A { function f() { /*")
+    assert header.declarations[0][:2] == ("contract", "A")
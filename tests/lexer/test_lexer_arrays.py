@@ -0,0 +1,85 @@
+# testdoc: Purpose
+# To test the NumPy token export: `to_arrays()` and `to_arrays_batch()` must
+# encode exactly the tokens produced by Lexer.tokenize(), with a stable,
+# persistable vocabulary.
+
+# testdoc: Method
+# Array rows are decoded through the vocabulary and compared with the
+# (type, value) pairs of Lexer.tokenize(). Start offsets and lengths are
+# checked against the source text. Tests are skipped if NumPy is missing.
+import pytest
+
+from solp.lexer import Vocabulary, to_arrays, to_arrays_batch
+from solp.lexer.arrays import KIND_IDS
+from solp.lexer.lexer import Lexer
+
+np = pytest.importorskip("numpy")
+
+SOURCE = """
+contract Token {
+    // owner of the contract
+    address public owner;
+    /* supply */ uint total;
+    function f(uint a) public payable returns (bool) {
+        emit Log("it's \\"quoted\\"", 'x\\'y');
+        total += a ** 2;
+        require(a >= 10 && !paused);
+        return true;
+    }
+}
+"""
+
+
+def lexer_pairs(source):
+    return [(tok.type, tok.value) for tok in Lexer(source).tokenize()]
+
+
+def test_to_arrays_matches_lexer():
+    # testdoc: Decoded kinds and values equal the Lexer token stream
+    vocabulary = Vocabulary()
+    arrays = to_arrays(SOURCE, vocabulary)
+    decoded = [vocabulary.lookup(i) for i in arrays.ids.tolist()]
+    assert decoded == lexer_pairs(SOURCE)
+    assert [KIND_IDS[kind] for kind, _ in decoded] == arrays.kinds.tolist()
+
+
+def test_offsets_and_lengths_point_into_source():
+    # testdoc: start/length slices reproduce the raw token text
+    arrays = to_arrays("uint x = y;")
+    pieces = [
+        "uint x = y;"[s : s + n]
+        for s, n in zip(arrays.starts.tolist(), arrays.lengths.tolist())
+    ]
+    assert pieces == ["uint", "x", "=", "y", ";"]
+
+
+def test_batch_padding_and_shared_vocabulary():
+    # testdoc: Batch rows are padded with 0 and share one vocabulary
+    vocabulary = Vocabulary()
+    batch = to_arrays_batch(["uint x;", "uint y = x;", ""], vocabulary)
+    assert batch.ids.shape == (3, 5)
+    assert batch.counts.tolist() == [3, 5, 0]
+    assert batch.ids[0, 0] == batch.ids[1, 0]
+    assert batch.kinds[0, 3:].tolist() == [0, 0]
+    assert batch.ids[2].tolist() == [0] * 5
+
+    truncated = to_arrays_batch(["uint y = x;"], vocabulary, max_tokens=2)
+    assert truncated.ids.shape == (1, 2)
+    assert truncated.counts.tolist() == [2]
+
+
+def test_vocabulary_persistence(tmp_path):
+    # testdoc: A saved and reloaded vocabulary yields identical ids
+    vocabulary = Vocabulary()
+    first = to_arrays(SOURCE, vocabulary)
+    path = str(tmp_path / "vocab.json")
+    vocabulary.save(path)
+    frozen = Vocabulary.load(path, frozen=True)
+    assert to_arrays(SOURCE, frozen).ids.tolist() == first.ids.tolist()
+    assert to_arrays("unseenName", frozen).ids.tolist() == [0]
+
+
+def test_unexpected_character():
+    # testdoc: Characters the lexer rejects are rejected as well
+    with pytest.raises(Exception, match="Unexpected character"):
+        to_arrays("uint x = #;")
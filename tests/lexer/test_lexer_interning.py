@@ -0,0 +1,56 @@
+# testdoc: Purpose
+# To test identifier and keyword interning: repeated names must be one
+# string object per symbol table, keywords must be the canonical constants
+# and the AST must reference the interned strings.
+
+# testdoc: Method
+# Sources are lexed with fresh and shared SymbolTables. Token values are
+# sliced out of larger strings so that equal values are distinct objects
+# unless the lexer interns them; identities are compared with `is`.
+from solp import parse_source_unit
+from solp.lexer import SymbolTable
+from solp.lexer.interning import CANONICAL_KEYWORDS
+from solp.lexer.lexer import Lexer
+from solp.parser.rules.statement import RULE_IF
+
+
+def values(source, symbols=None):
+    return [tok.value for tok in Lexer(source, symbols).tokenize()]
+
+
+# testdoc: Repeated identifiers within one lexer are the same object
+def test_identifiers_are_interned_per_lexer():
+    a = values("balance_x = balance_x + balance_x;")
+    assert a[0] is a[2] is a[4]
+
+
+# testdoc: A shared symbol table interns names across lexers
+def test_shared_table_interns_across_sources():
+    symbols = SymbolTable()
+    a = values("owner_name = 1;", symbols)
+    b = values("return owner_name;", symbols)
+    assert a[0] is b[1]
+    assert "owner_name" in symbols
+    assert len(symbols) == 1
+    assert values("owner_name;")[0] is not a[0]
+
+
+# testdoc: Keywords are returned as canonical constant strings
+def test_keywords_are_canonical_constants():
+    tokens = Lexer("if (x) { return; }").tokenize()
+    assert tokens[0].value is CANONICAL_KEYWORDS["if"]
+    assert tokens[0].value is RULE_IF
+    assert tokens[5].value is CANONICAL_KEYWORDS["return"]
+
+
+# testdoc: AST names reference the interned identifier strings
+def test_ast_names_share_interned_strings():
+    symbols = SymbolTable()
+    a = parse_source_unit(
+        "contract A { uint total; function f() public { g(total); } }",
+        symbols=symbols,
+    )
+    b = parse_source_unit("contract B { uint total; }", symbols=symbols)
+    total_a = a.children[0].members[0].name
+    assert total_a is b.children[0].members[0].name
+    assert a.children[0].members[1].body[0].expr.arguments[0] is total_a
@@ -21,8 +21,9 @@ class MockToken:
 
 
 class MockTokenStream:
+    # Like TokenStream, the mock ends with an EOF sentinel token.
     def __init__(self, tokens):
-        self.tokens = tokens
+        self.tokens = tokens + [MockToken("EOF", "")]
         self.index = 0
 
     def current(self):
@@ -42,6 +43,45 @@ class MockTokenStream:
             return True
         return False
 
+    def match_symbol(self, symbol):
+        return self.match("SYMBOL", symbol)
+
+    def match_keyword(self, keyword):
+        return self.match("KEYWORD", keyword)
+
+    def expect_symbol(self, symbol):
+        self.expect("SYMBOL", symbol)
+
+    def expect_keyword(self, keyword):
+        self.expect("KEYWORD", keyword)
+
+    def at_symbol(self, symbol):
+        tok = self.current()
+        return tok.type == "SYMBOL" and tok.value == symbol
+
+    def at_keyword(self, keyword):
+        tok = self.current()
+        return tok.type == "KEYWORD" and tok.value == keyword
+
+    def at_end(self):
+        return self.current().type == "EOF"
+
+    def at(self, type_, value=None):
+        tok = self.current()
+        return tok.type == type_ and (value is None or tok.value == value)
+
+    def at_keyword_in(self, keywords):
+        tok = self.current()
+        if tok.type == "KEYWORD" and tok.value in keywords:
+            return tok.value
+        return None
+
+    def match_keyword_in(self, keywords):
+        keyword = self.at_keyword_in(keywords)
+        if keyword is not None:
+            self.advance()
+        return keyword
+
     def advance(self):
         self.index += 1
 
@@ -34,6 +34,16 @@ class MockTokenStream:
     def advance(self):
         self.index += 1
 
+    def expect_symbol(self, symbol):
+        self.expect("SYMBOL", symbol)
+
+    def match_keyword_in(self, keywords):
+        tok = self.current()
+        if tok.type == "KEYWORD" and tok.value in keywords:
+            self.advance()
+            return tok.value
+        return None
+
 
 def test_parse_variable_no_visibility():
     # testdoc: Should parse a variable without visibility modifier
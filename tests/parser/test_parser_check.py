@@ -0,0 +1,96 @@
+# testdoc: Purpose
+# To test the recognizer-only `check()` entry point, which validates source
+# code with the regular grammar rules but without building AST nodes.
+
+# testdoc: Method
+# Valid and invalid contracts are passed to `check()`. Accepted input must
+# return None; rejected input must return the first Diagnostic with a
+# position. The RecognizerNodeFactory is also driven through the Parser
+# directly to verify that no AST nodes are produced.
+from solp import check
+from solp.lexer.lexer import Lexer
+from solp.parser.parser import Parser
+from solp.solidity_ast.factory import ACCEPTED, RECOGNIZER_NODE_FACTORY
+from solp.utils.diagnostics import Diagnostic
+
+VALID = """
+contract Wallet {
+    uint balance;
+    address public owner;
+
+    constructor(address initial) public {
+        owner = initial;
+    }
+
+    function deposit(uint amount, address to) public payable returns (bool) {
+        require(amount);
+        balance += msg.value;
+        if (amount) {
+            emit Deposited(to, amount);
+        } else {
+            revert(amount);
+        }
+        while (amount) {
+            break;
+        }
+        notify(to);
+        return true;
+    }
+}
+"""
+
+
+def test_check_accepts_valid_contract():
+    # testdoc: A contract accepted by parse_contract is accepted by check
+    assert check(VALID) is None
+
+
+def test_check_reports_first_parse_error():
+    # testdoc: A missing semicolon is reported with the offending token position
+    code = "contract A {\n    function f() public {\n        x = y\n    }\n}"
+    diagnostic = check(code)
+    assert isinstance(diagnostic, Diagnostic)
+    assert "Expected SYMBOL ;" in diagnostic.message
+    assert diagnostic.line == 4
+
+
+def test_check_reports_lexer_error():
+    # testdoc: Lexer errors are reported as diagnostics instead of raised
+    diagnostic = check("contract A { # }")
+    assert isinstance(diagnostic, Diagnostic)
+    assert "Unexpected character" in diagnostic.message
+    assert diagnostic.line == 1
+
+
+def test_check_reports_unexpected_eof():
+    # testdoc: Truncated input yields a diagnostic at the last token
+    diagnostic = check("contract A { function f() public {")
+    assert isinstance(diagnostic, Diagnostic)
+    assert "EOF" in diagnostic.message
+
+
+def test_check_reports_trailing_tokens():
+    # testdoc: Tokens after the last declaration are reported where they start
+    diagnostic = check("contract A { }\n}")
+    assert "Unexpected token" in diagnostic.message
+    assert (diagnostic.line, diagnostic.col) == (2, 1)
+    diagnostic = check("contract A { } contract B { function f( }")
+    assert diagnostic is not None
+
+
+def test_check_accepts_directives_and_several_contracts():
+    # testdoc: Pragma and import headers and several contracts are accepted
+    code = 'pragma solidity ^0.8.0;\nimport "./B.sol";\n' + VALID + "contract C { }"
+    assert check(code) is None
+
+
+def test_recognizer_factory_builds_no_nodes():
+    # testdoc: With the recognizer factory the parser returns only ACCEPTED
+    tokens = Lexer(VALID).tokenize()
+    result = Parser(tokens, nodes=RECOGNIZER_NODE_FACTORY).parse()
+    assert result is ACCEPTED
+
+
+def test_expression_statement_starting_with_identifier():
+    # testdoc: `foo(x);` is parsed as expression statement instead of looping
+    assert check("contract A { function f() public { foo(x); } }") is None
@@ -0,0 +1,111 @@
+# testdoc: Purpose
+# To test local variable declarations in function bodies: elementary,
+# dotted and array types with an optional data location and initializer
+# must parse as declarations, while statements that start the same way but
+# are expressions or assignments must still parse as such, and the name
+# path shared by all alternatives must be parsed only once per position.
+
+# testdoc: Method
+# Function bodies are parsed from source and the statement nodes are
+# checked by type and fields. The packrat memo is checked by counting how
+# often the shared name path is requested and how often it is parsed.
+from solp.lexer.token_types import RULE_PATH
+from solp.parser.rules.statement import StatementRule
+from solp.parser.token_stream import TokenStream
+from solp.solidity_ast.nodes import ForNode
+from solp.solidity_parser import parse_source_unit
+
+
+def _body(statements):
+    unit = parse_source_unit(
+        "contract A { function f() public { " + statements + " } }"
+    )
+    return unit.children[0].members[0].body
+
+
+# testdoc: Declarations with type, data location and initializer
+def test_declarations():
+    plain, dotted, array = _body(
+        "uint x = a; Foo.Bar memory b = make(a); uint256[] storage list;"
+    )
+    assert plain.type == "declaration"
+    assert (plain.var_type, plain.location, plain.name) == ("uint", None, "x")
+    assert plain.value == "a"
+    assert (dotted.var_type, dotted.location, dotted.name) == (
+        "Foo.Bar",
+        "memory",
+        "b",
+    )
+    assert dotted.value.function == "make"
+    assert (array.var_type, array.location, array.name) == (
+        "uint256[]",
+        "storage",
+        "list",
+    )
+    assert array.value is None
+
+
+# testdoc: Expressions and assignments are not taken for declarations
+def test_declaration_fallbacks():
+    call, assignment, member = _body("Foo.Bar(a); x = a; foo.bar;")
+    assert call.type == "expression"
+    assert call.expr.function == "Foo.Bar"
+    assert (assignment.type, assignment.left, assignment.right) == (
+        "assignment",
+        "x",
+        "a",
+    )
+    assert member.type == "expression"
+
+
+# testdoc: A for-loop header may declare its loop variable
+def test_for_init_declaration():
+    (loop,) = _body("for (uint i = n; i; i) { x = i; }")
+    assert isinstance(loop, ForNode)
+    assert (loop.init.type, loop.init.name) == ("declaration", "i")
+
+
+# testdoc: All elementary type keywords and address payable declare locals
+def test_elementary_type_declarations():
+    body = _body(
+        "int x = y; bytes memory b; address payable a = b;"
+        " byte c; fixed f; ufixed u; uint8 small; bytes32 h = k;"
+    )
+    assert [(s.type, s.var_type, s.location, s.name) for s in body] == [
+        ("declaration", "int", None, "x"),
+        ("declaration", "bytes", "memory", "b"),
+        ("declaration", "address payable", None, "a"),
+        ("declaration", "byte", None, "c"),
+        ("declaration", "fixed", None, "f"),
+        ("declaration", "ufixed", None, "u"),
+        ("declaration", "uint8", None, "small"),
+        ("declaration", "bytes32", None, "h"),
+    ]
+    assert body[2].value == "b"
+
+
+# testdoc: Name paths are parsed once per position across all alternatives
+def test_name_path_memo(monkeypatch):
+    executed = []
+    attempts = []
+    name_path = StatementRule._name_path
+    speculate = TokenStream.speculate
+
+    def counting_path(self):
+        executed.append(self.tokens.index)
+        return name_path(self)
+
+    def counting_speculate(self, rule, parse):
+        if rule == RULE_PATH:
+            attempts.append(self.index)
+        return speculate(self, rule, parse)
+
+    monkeypatch.setattr(StatementRule, "_name_path", counting_path)
+    monkeypatch.setattr(TokenStream, "speculate", counting_speculate)
+    body = _body("token.owner(x); a.b = c; " * 100)
+    assert len(body) == 200
+    # Every statement start is tried as declaration, assignment and (for
+    # the calls) expression, but its path is parsed only once.
+    assert len(executed) == len(set(executed)) == len(set(attempts))
+    assert len(attempts) == len(executed) + 300
+    assert body[1].left == "a.b"
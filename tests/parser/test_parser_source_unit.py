@@ -0,0 +1,115 @@
+# testdoc: Purpose
+# To test parsing of complete Solidity files into a SourceUnitNode, including
+# pragma and import directives and several contract, interface and library
+# declarations.
+
+# testdoc: Method
+# Multi-declaration sources are parsed with `parse_source_unit()` and the
+# streaming `iter_declarations()`. The streaming test verifies that the
+# first declaration is yielded before the lexer has reached the end of the
+# file.
+import pytest
+
+from solp import iter_declarations, parse_source_unit
+from solp.lexer.lexer import Lexer
+from solp.parser.parser import Parser
+from solp.solidity_ast.nodes import (
+    ContractNode,
+    ImportNode,
+    PragmaNode,
+    SourceUnitNode,
+)
+
+SOURCE = """
+pragma solidity >=0.8.0 <0.9.0;
+pragma abicoder v2;
+import "./Token.sol";
+import "./Math.sol" as M;
+import * as Lib from "./Lib.sol";
+import {Ownable, Context as Ctx} from "./Access.sol";
+
+interface IVault {
+    function deposit(uint amount) external;
+}
+
+library SafeMath {
+    function add(uint a, uint b) internal returns (uint) {
+        return a;
+    }
+}
+
+abstract contract Base {
+    uint total;
+}
+
+contract Vault is Base, IVault {
+    function deposit(uint amount) external {
+        total += amount;
+    }
+}
+"""
+
+
+def test_parse_source_unit_collects_all_declarations():
+    # testdoc: Every directive and declaration becomes a child in file order
+    unit = parse_source_unit(SOURCE)
+    assert isinstance(unit, SourceUnitNode)
+    kinds = [type(child) for child in unit.children]
+    assert kinds == [PragmaNode] * 2 + [ImportNode] * 4 + [ContractNode] * 4
+
+
+def test_pragma_values():
+    # testdoc: Pragma values keep version operators attached to their numbers
+    pragmas = parse_source_unit(SOURCE).children[:2]
+    assert (pragmas[0].name, pragmas[0].value) == ("solidity", ">=0.8.0 <0.9.0")
+    assert (pragmas[1].name, pragmas[1].value) == ("abicoder", "v2")
+
+
+def test_import_forms():
+    # testdoc: All four import forms record path, alias and symbols
+    imports = parse_source_unit(SOURCE).children[2:6]
+    assert [i.path for i in imports] == [
+        "./Token.sol",
+        "./Math.sol",
+        "./Lib.sol",
+        "./Access.sol",
+    ]
+    assert [i.alias for i in imports] == [None, "M", "Lib", None]
+    assert imports[3].symbols == [("Ownable", None), ("Context", "Ctx")]
+
+
+def test_declaration_kinds_and_bases():
+    # testdoc: Interfaces, libraries and inheritance lists are recorded
+    contracts = parse_source_unit(SOURCE).children[6:]
+    assert [(c.kind, c.name) for c in contracts] == [
+        ("interface", "IVault"),
+        ("library", "SafeMath"),
+        ("contract", "Base"),
+        ("contract", "Vault"),
+    ]
+    assert contracts[3].bases == ["Base", "IVault"]
+    assert contracts[0].members[0].body == []
+
+
+def test_iter_declarations_streams_before_end_of_file():
+    # testdoc: The first contract is yielded before the lexer reaches EOF
+    lexer = Lexer(SOURCE)
+    declarations = Parser(lexer.iter_tokens()).iter_declarations()
+    for node in declarations:
+        if isinstance(node, ContractNode):
+            break
+    assert node.name == "IVault"
+    assert lexer.position < len(SOURCE)
+
+
+def test_iter_declarations_matches_parse_source_unit():
+    # testdoc: Streaming and collecting parses yield the same top-level names
+    streamed = [getattr(n, "name", None) for n in iter_declarations(SOURCE)]
+    collected = [getattr(n, "name", None) for n in parse_source_unit(SOURCE).children]
+    assert streamed == collected
+
+
+def test_unexpected_top_level_token():
+    # testdoc: Statements outside a declaration are rejected
+    with pytest.raises(Exception, match="source unit level"):
+        parse_source_unit("x = y;")
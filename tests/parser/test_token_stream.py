@@ -0,0 +1,137 @@
+# testdoc: Purpose
+# To test the TokenStream contract: every stream ends with an EOF sentinel
+# positioned at the last token, the cursor never moves past it, no method
+# returns None for a position, and the specialized symbol/keyword methods
+# behave like the generic match/expect for lists and lazy iterators.
+# Checkpoints must restore the cursor, and speculate() must run each
+# alternative at most once per position.
+
+# testdoc: Method
+# Streams are built from real lexer output, once as a list and once from
+# Lexer.iter_tokens(); a counting iterator checks that lazy streams pull
+# tokens only on demand.
+import pytest
+
+from solp.lexer.lexer import Lexer
+from solp.lexer.token_types import EOF, IDENTIFIER, KEYWORD, SYMBOL
+from solp.parser.token_stream import TokenStream
+
+SOURCE = "contract A {\n  uint x;\n}"
+
+
+def _streams():
+    tokens = Lexer(SOURCE).tokenize()
+    return [TokenStream(tokens), TokenStream(Lexer(SOURCE).iter_tokens())]
+
+
+# testdoc: The stream ends with an EOF token at the last token's position
+@pytest.mark.parametrize("stream", _streams(), ids=["list", "lazy"])
+def test_eof_sentinel(stream):
+    consumed = []
+    while not stream.at_end():
+        consumed.append(stream.advance().value)
+    assert consumed == ["contract", "A", "{", "uint", "x", ";", "}"]
+    eof = stream.current()
+    assert (eof.type, eof.value, eof.line, eof.col) == (EOF, "", 3, 1)
+    assert stream.advance() is eof
+    assert stream.current() is eof
+    assert stream.peek(5) is eof
+    assert stream.last().value == "}"
+
+
+# testdoc: Specialized methods check type and value like match/expect
+@pytest.mark.parametrize("stream", _streams(), ids=["list", "lazy"])
+def test_specialized_matching(stream):
+    assert not stream.match_symbol("contract")
+    assert stream.at_keyword("contract")
+    assert stream.match_keyword("contract")
+    assert not stream.match_keyword("A")
+    assert stream.match(IDENTIFIER, "A")
+    assert stream.at_symbol("{")
+    stream.expect_symbol("{")
+    stream.expect_keyword("uint")
+    with pytest.raises(Exception, match="Expected SYMBOL ;"):
+        stream.expect_symbol(";")
+    with pytest.raises(Exception, match="Expected KEYWORD uint"):
+        stream.expect_keyword("uint")
+    assert stream.match(IDENTIFIER) and stream.match(SYMBOL, ";")
+    assert stream.match_symbol("}")
+    assert stream.at_end() and not stream.match_symbol("}")
+    assert not stream.match(KEYWORD)
+
+
+# testdoc: An empty stream holds only an EOF token without position
+def test_empty_stream():
+    for stream in (TokenStream([]), TokenStream(iter([]))):
+        assert stream.at_end()
+        assert stream.current().line is None
+        assert stream.last() is None
+
+
+# testdoc: List input is not modified; lazy input is pulled on demand
+def test_input_handling():
+    tokens = Lexer(SOURCE).tokenize()
+    TokenStream(tokens)
+    assert len(tokens) == 7
+
+    pulled = []
+
+    def source():
+        for tok in Lexer(SOURCE).iter_tokens():
+            pulled.append(tok)
+            yield tok
+
+    stream = TokenStream(source())
+    assert len(pulled) == 1
+    stream.match_keyword("contract")
+    stream.advance()
+    assert len(pulled) == 3
+    assert stream.peek(1).value == "uint"
+    assert len(pulled) == 4
+
+
+# testdoc: reset() returns the cursor to a mark, also on lazy streams
+@pytest.mark.parametrize("stream", _streams(), ids=["list", "lazy"])
+def test_mark_and_reset(stream):
+    stream.advance()
+    start = stream.mark()
+    for _ in range(4):
+        stream.advance()
+    stream.reset(start)
+    assert stream.current().value == "A"
+
+
+# testdoc: Speculation is memoized per rule and position
+def test_speculate_memo():
+    stream = TokenStream(Lexer(SOURCE).tokenize())
+    calls = []
+
+    def name():
+        calls.append(stream.index)
+        stream.advance()
+        tok = stream.advance()
+        return tok.value if tok.type == IDENTIFIER else None
+
+    assert stream.speculate("name", name) == "A"
+    assert stream.current().value == "{"
+    stream.reset(0)
+    assert stream.speculate("name", name) == "A"
+    assert stream.index == 2
+    assert stream.speculate("name", name) is None
+    assert stream.index == 2
+    assert stream.speculate("name", name) is None
+    assert stream.speculate("other", name) is None
+    assert calls == [0, 2, 2]
+
+
+# testdoc: Keyword-set and generic non-consuming matching
+@pytest.mark.parametrize("stream", _streams(), ids=["list", "lazy"])
+def test_keyword_sets_and_at(stream):
+    kinds = {"contract", "library"}
+    assert stream.at_keyword_in({"library"}) is None
+    assert stream.at_keyword_in(kinds) == "contract"
+    assert stream.match_keyword_in(kinds) == "contract"
+    assert stream.match_keyword_in(kinds) is None
+    assert stream.at(IDENTIFIER, "A") and stream.at(IDENTIFIER)
+    assert not stream.at(IDENTIFIER, "B")
+    assert stream.current().value == "A"
@@ -0,0 +1,136 @@
+# testdoc: Purpose
+# To test the asyncio API: parsing must run in an executor, results must
+# carry per-file latency and errors, concurrency must stay bounded and
+# cancelling a consumer must cancel queued work.
+
+# testdoc: Method
+# Coroutines are driven with asyncio.run(). Files are written to a temporary
+# directory; a thread pool whose parse function is instrumented records the
+# maximum number of files parsed at the same time.
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from solp import aio
+
+VALID = "contract A { function f() public { g(x); } }"
+
+
+def write_files(tmp_path, count, text=VALID):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"C{i}.sol"
+        path.write_text(text.replace("contract A", f"contract C{i}"))
+        paths.append(str(path))
+    return paths
+
+
+# testdoc: parse() returns the source unit of a string
+def test_parse_source():
+    unit = asyncio.run(aio.parse(VALID))
+    assert unit.children[0].name == "A"
+
+
+# testdoc: parse() runs in the given executor, off the event loop thread
+def test_parse_runs_in_executor():
+    with ThreadPoolExecutor(1, thread_name_prefix="solp-parse") as executor:
+
+        async def main():
+            loop_thread = threading.current_thread().name
+            unit = await aio.parse(VALID, executor)
+            return loop_thread, unit
+
+        loop_thread, unit = asyncio.run(main())
+    assert loop_thread == "MainThread"
+    assert unit.children[0].name == "A"
+
+
+# testdoc: parse_many() returns results in input order with latency
+def test_parse_many_results(tmp_path):
+    paths = write_files(tmp_path, 5)
+    broken = tmp_path / "broken.sol"
+    broken.write_text("contract B { function f( }")
+    paths.insert(2, str(broken))
+    paths.append(str(tmp_path / "missing.sol"))
+
+    results = asyncio.run(aio.parse_many(paths, concurrency=3))
+    assert [result.path for result in results] == paths
+    assert results[0].unit.children[0].name == "C0"
+    assert results[2].unit is None and results[2].error
+    assert results[-1].error and results[-1].parse_time == 0
+    assert all(result.latency > 0 for result in results)
+
+
+# testdoc: No more than `concurrency` files are in flight at once
+def test_concurrency_is_bounded(tmp_path, monkeypatch):
+    active = []
+    peak = []
+    lock = threading.Lock()
+    original = aio.parse_source_unit
+
+    def slow_parse(source):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.pop()
+        return original(source)
+
+    monkeypatch.setattr(aio, "parse_source_unit", slow_parse)
+    with ThreadPoolExecutor(8) as executor:
+        results = asyncio.run(
+            aio.parse_many(write_files(tmp_path, 12), concurrency=2, executor=executor)
+        )
+    assert len(results) == 12
+    assert max(peak) <= 2
+
+
+# testdoc: Paths are consumed lazily, only as results are requested
+def test_iter_parse_applies_back_pressure(tmp_path):
+    paths = write_files(tmp_path, 10)
+    consumed = []
+
+    def lazy_paths():
+        for path in paths:
+            consumed.append(path)
+            yield path
+
+    async def main():
+        results = aio.iter_parse(lazy_paths(), concurrency=2)
+        first = await results.__anext__()
+        await results.aclose()
+        return first
+
+    first = asyncio.run(main())
+    assert first.error is None
+    assert len(consumed) <= 3
+
+
+# testdoc: Cancelling the consumer cancels work that has not started
+def test_cancellation_stops_queued_work(tmp_path, monkeypatch):
+    started = []
+    original = aio.parse_source_unit
+
+    def slow_parse(source):
+        started.append(source)
+        time.sleep(0.05)
+        return original(source)
+
+    monkeypatch.setattr(aio, "parse_source_unit", slow_parse)
+
+    async def main(executor):
+        task = asyncio.ensure_future(
+            aio.parse_many(write_files(tmp_path, 20), concurrency=4, executor=executor)
+        )
+        await asyncio.sleep(0.02)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with ThreadPoolExecutor(1) as executor:
+        asyncio.run(main(executor))
+    assert len(started) < 4
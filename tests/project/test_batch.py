@@ -0,0 +1,89 @@
+# testdoc: Purpose
+# To test size-aware batch scheduling: expensive files must be planned
+# first and alone, small files grouped, every file parsed exactly once and
+# the utilization report must account for all worker time.
+
+# testdoc: Method
+# Chunk plans are checked on synthetic cost tables. Batches of temporary
+# files are parsed with thread and process pools; the submission order is
+# recorded by wrapping the executor.
+from concurrent.futures import ThreadPoolExecutor
+
+from solp.batch import file_size, parse_batch, plan_chunks, token_estimate
+
+CONTRACT = "contract C{i} {{ function f() public {{ g(x); }} }}\n"
+
+
+def write_corpus(tmp_path, sizes):
+    paths = []
+    for name, count in sizes.items():
+        path = tmp_path / f"{name}.sol"
+        path.write_text("".join(CONTRACT.format(i=i) for i in range(count)))
+        paths.append(str(path))
+    return paths
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    def __init__(self, workers):
+        super().__init__(workers)
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append(args[0])
+        return super().submit(fn, *args)
+
+
+# testdoc: Large files form their own chunks and are planned first
+def test_plan_orders_large_files_first():
+    costs = {"big": 100, "a": 5, "b": 4, "huge": 300, "c": 3, "d": 2, "e": 1}
+    chunks = plan_chunks(costs, workers=2, chunk_cost=8)
+    assert chunks[0] == (300, ["huge"])
+    assert chunks[1] == (100, ["big"])
+    assert chunks[2:] == [(9, ["a", "b"]), (6, ["c", "d", "e"])]
+
+
+# testdoc: The default chunk target yields several chunks per worker
+def test_default_chunk_target():
+    costs = {f"f{i}": 10 for i in range(100)}
+    chunks = plan_chunks(costs, workers=2)
+    assert 8 <= len(chunks) <= 32
+    assert sorted(p for _, paths in chunks for p in paths) == sorted(costs)
+
+
+# testdoc: Every file is parsed once and large files are submitted first
+def test_parse_batch_with_thread_pool(tmp_path):
+    paths = write_corpus(tmp_path, {"s1": 1, "s2": 2, "s3": 1, "large": 40})
+    broken = tmp_path / "broken.sol"
+    broken.write_text("contract B { function f( }")
+    paths.append(str(broken))
+
+    executor = RecordingExecutor(2)
+    with executor:
+        result = parse_batch(paths, max_workers=2, executor=executor, chunk_cost=200)
+    assert executor.submitted[0] == [str(tmp_path / "large.sol")]
+    assert set(result.units) | set(result.errors) == set(paths)
+    assert list(result.errors) == [str(broken)]
+    assert len(result.units[paths[3]].children) == 40
+
+
+# testdoc: The report accounts for busy time and chunks of every worker
+def test_report_utilization(tmp_path):
+    paths = write_corpus(tmp_path, {f"f{i}": 3 for i in range(12)})
+    with ThreadPoolExecutor(3) as executor:
+        result = parse_batch(paths, max_workers=3, executor=executor, chunk_cost=1)
+    report = result.report
+    assert sum(report.chunks.values()) == 12
+    assert report.total_busy > 0
+    assert 0 < report.efficiency
+    assert all(0 <= share <= 1 for share in report.utilization().values())
+    assert "efficiency" in str(report)
+
+
+# testdoc: The default process pool and the token estimate work end to end
+def test_parse_batch_with_process_pool(tmp_path):
+    paths = write_corpus(tmp_path, {"a": 2, "b": 5})
+    assert token_estimate(paths[1]) > token_estimate(paths[0])
+    assert file_size(paths[1]) > file_size(paths[0])
+    result = parse_batch(paths, max_workers=2, cost=token_estimate)
+    assert len(result.units[paths[1]].children) == 5
+    assert result.errors == {}
@@ -0,0 +1,176 @@
+# testdoc: Purpose
+# To test the JSON-RPC parse server: documents must stay open between
+# requests, incremental edits must only re-parse the changed declaration,
+# and parse, outline and diagnostics results must use absolute positions.
+
+# testdoc: Method
+# Request lines are passed to ParseServer.handle_line() and the JSON
+# responses are decoded. The stdio loop is driven with in-memory streams and
+# the Unix socket transport with a real client connection.
+import io
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from solp.server import (
+    INVALID_PARAMS,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    ParseServer,
+    serve_socket,
+    serve_stdio,
+)
+
+SOURCE = """pragma solidity ^0.8.0;
+contract A {
+    function f() public { g(x); }
+}
+contract B {
+    function h() public { k(y); }
+}
+"""
+
+
+def message(method, params=None, request_id=1):
+    data = {"jsonrpc": "2.0", "method": method, "params": params or {}}
+    if request_id is not None:
+        data["id"] = request_id
+    return json.dumps(data)
+
+
+def call(server, method, params=None):
+    response = json.loads(server.handle_line(message(method, params)))
+    assert response["id"] == 1
+    return response.get("result", response.get("error"))
+
+
+def opened(text=SOURCE):
+    server = ParseServer()
+    notification = message("textDocument/didOpen", {"uri": "a.sol", "text": text}, None)
+    assert server.handle_line(notification) is None
+    return server
+
+
+def edit(line, start, end, text):
+    return {
+        "range": {
+            "start": {"line": line, "character": start},
+            "end": {"line": line, "character": end},
+        },
+        "text": text,
+    }
+
+
+# testdoc: The outline lists declarations and members with absolute spans
+def test_outline_of_open_document():
+    outline = call(opened(), "solp/outline", {"uri": "a.sol"})
+    assert outline[0] == {"node": "Pragma", "name": "solidity"}
+    assert outline[1]["name"] == "A"
+    assert outline[1]["span"] == [2, 4]
+    assert outline[2]["span"] == [5, 7]
+    assert outline[2]["members"] == [{"node": "Function", "name": "h", "span": [6, 6]}]
+
+
+# testdoc: An edit re-parses only the declaration whose text changed
+def test_incremental_change_reuses_unchanged_declarations():
+    server = opened()
+    server.handle_line(
+        message(
+            "textDocument/didChange",
+            {"uri": "a.sol", "contentChanges": [edit(5, 28, 29, "z")], "version": 2},
+            None,
+        )
+    )
+    result = call(server, "solp/parse", {"uri": "a.sol"})
+    assert (result["parsed"], result["reused"]) == (1, 2)
+    assert result["version"] == 2
+    call_node = result["children"][2]["members"][0]["body"][0]["expr"]
+    assert call_node["arguments"] == ["z"]
+    assert server.documents["a.sol"].text == SOURCE.replace("k(y)", "k(z)")
+
+
+# testdoc: Inserted lines shift the spans of reused declarations
+def test_spans_follow_inserted_lines():
+    server = opened()
+    changes = [edit(1, 0, 0, "// comment\n\n")]
+    server.handle_line(
+        message("textDocument/didChange", {"uri": "a.sol", "contentChanges": changes})
+    )
+    outline = call(server, "solp/outline", {"uri": "a.sol"})
+    assert outline[1]["span"] == [4, 6]
+    assert outline[2]["members"][0]["span"] == [8, 8]
+
+
+# testdoc: Diagnostics report absolute lines and columns of the first error
+def test_diagnostics_use_document_positions():
+    server = opened(SOURCE + "contract C { function k( }\n")
+    diagnostics = call(server, "solp/diagnostics", {"uri": "a.sol"})
+    assert len(diagnostics) == 1
+    assert (diagnostics[0]["line"], diagnostics[0]["col"]) == (8, 26)
+    assert call(server, "solp/diagnostics", {"text": SOURCE}) == []
+
+
+# testdoc: Protocol errors are reported as JSON-RPC error objects
+def test_protocol_errors():
+    server = ParseServer()
+    assert call(server, "solp/unknown")["code"] == METHOD_NOT_FOUND
+    assert call(server, "solp/parse", {"uri": "missing"})["code"] == INVALID_PARAMS
+    assert json.loads(server.handle_line("{"))["error"]["code"] == PARSE_ERROR
+
+
+# testdoc: The stdio loop answers requests line by line until exit
+def test_stdio_transport():
+    lines = [
+        message("textDocument/didOpen", {"uri": "a.sol", "text": SOURCE}, None),
+        message("solp/outline", {"uri": "a.sol"}),
+        message("exit", request_id=None),
+        message("solp/outline", {"uri": "a.sol"}),
+    ]
+    stdout = io.StringIO()
+    serve_stdio(ParseServer(), io.StringIO("\n".join(lines) + "\n"), stdout)
+    responses = stdout.getvalue().splitlines()
+    assert len(responses) == 1
+    assert len(json.loads(responses[0])["result"]) == 3
+
+
+# testdoc: Socket clients share the open documents of one server
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets only")
+def test_socket_transport(tmp_path):
+    path = str(tmp_path / "solp.sock")
+    thread = threading.Thread(target=serve_socket, args=(path,), daemon=True)
+    thread.start()
+    for _ in range(200):
+        if os.path.exists(path):
+            break
+        threading.Event().wait(0.01)
+
+    def connect():
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(path)
+        return client, client.makefile("r", encoding="utf-8")
+
+    clients = []
+    try:
+        first, first_reader = connect()
+        clients.append(first)
+        # didOpen as a request: its response orders it before the outline
+        first.sendall(
+            (
+                message("textDocument/didOpen", {"uri": "a", "text": SOURCE}) + "\n"
+            ).encode()
+        )
+        assert "error" not in json.loads(first_reader.readline())
+        second, reader = connect()
+        clients.append(second)
+        second.sendall((message("solp/outline", {"uri": "a"}) + "\n").encode())
+        assert len(json.loads(reader.readline())["result"]) == 3
+    finally:
+        if clients:
+            clients[-1].sendall((message("exit", request_id=None) + "\n").encode())
+        thread.join(5)
+        for client in clients:
+            client.close()
+    assert not thread.is_alive()
@@ -0,0 +1,125 @@
+# testdoc: Purpose
+# To test the SQLite project index: declarations, signatures, parameter
+# types and spans are stored and can be queried; updates are incremental per
+# file content hash, keyed by absolute path, and prune files that left the
+# corpus.
+
+# testdoc: Method
+# Temporary Solidity files are indexed into an in-memory or on-disk
+# database. Queries are checked against the declarations in the sources.
+import os
+
+from solp.index import ProjectIndex
+
+TOKEN = """pragma solidity ^0.8.0;
+contract Token {
+    uint supply;
+    address public owner;
+
+    constructor(address initial) public {
+        owner = initial;
+    }
+
+    function transferFrom(address from, address to, uint amount) public payable {
+        supply = amount;
+    }
+
+    function transfer(address to, uint amount) public {
+    }
+}
+"""
+
+
+def write(path, code):
+    path.write_text(code, encoding="utf-8")
+    return str(path)
+
+
+def test_functions_by_signature_and_payable(tmp_path):
+    # testdoc: Signature and payable filters find the declaring file and span
+    path = write(tmp_path / "Token.sol", TOKEN)
+    index = ProjectIndex()
+    index.update([path])
+    rows = index.find_functions(
+        signature="transferFrom(address,address,uint)", payable=True
+    )
+    assert rows == [
+        (
+            path,
+            "Token",
+            "transferFrom",
+            "transferFrom(address,address,uint)",
+            "public",
+            1,
+            10,
+            12,
+        )
+    ]
+    assert index.find_functions(name="transfer", payable=True) == []
+
+
+def test_members_parameters_and_contracts(tmp_path):
+    # testdoc: Variables, constructors and parameter types are stored
+    path = write(tmp_path / "Token.sol", TOKEN)
+    index = ProjectIndex()
+    index.update([path])
+    kinds = index.execute("SELECT kind, name FROM members ORDER BY id")
+    assert kinds == [
+        ("variable", "supply"),
+        ("variable", "owner"),
+        ("constructor", None),
+        ("function", "transferFrom"),
+        ("function", "transfer"),
+    ]
+    types = index.execute(
+        "SELECT type FROM parameters JOIN members ON members.id = member_id "
+        "WHERE members.name = 'transfer' ORDER BY position"
+    )
+    assert types == [("address",), ("uint",)]
+    assert index.find_contracts("Token") == [(path, "contract", 2, 16)]
+
+
+def test_incremental_update_by_hash(tmp_path):
+    # testdoc: Unchanged files are skipped; changed files replace their rows
+    db = str(tmp_path / "index.db")
+    a = write(tmp_path / "A.sol", "contract A { function f() public { } }")
+    b = write(tmp_path / "B.sol", "contract B { }")
+    index = ProjectIndex(db)
+    assert index.update([a, b]) == [a, b]
+    index.close()
+
+    index = ProjectIndex(db)
+    assert index.update([a, b]) == []
+    write(tmp_path / "A.sol", "contract A { function g() public { } }")
+    assert index.update([a, b]) == [a]
+    assert [row[2] for row in index.find_functions()] == ["g"]
+    assert index.execute("SELECT COUNT(*) FROM contracts") == [(2,)]
+
+
+def test_parse_errors_are_recorded(tmp_path):
+    # testdoc: Broken files are stored with their error and not re-parsed
+    path = write(tmp_path / "Bad.sol", "contract { }")
+    index = ProjectIndex()
+    assert index.update([path]) == [path]
+    assert index.execute("SELECT error IS NOT NULL FROM files") == [(1,)]
+    assert index.update([path]) == []
+
+
+def test_paths_are_absolute_and_missing_files_pruned(tmp_path, monkeypatch):
+    # testdoc: One row per file across path spellings; gone files are pruned
+    a = write(tmp_path / "A.sol", "contract A { }")
+    b = write(tmp_path / "B.sol", "contract B { }")
+    monkeypatch.chdir(tmp_path)
+    index = ProjectIndex()
+    assert index.update(["A.sol", "./B.sol"]) == [a, b]
+    assert index.update([a, os.path.join("..", tmp_path.name, "B.sol")]) == []
+    assert index.execute("SELECT COUNT(*) FROM files") == [(2,)]
+
+    os.remove(b)
+    assert index.update([a, b]) == []
+    assert index.find_contracts("B") == []
+    assert index.execute("SELECT path FROM files") == [(a,)]
+
+    c = write(tmp_path / "C.sol", "contract C { }")
+    assert index.update([c], prune=False) == [c]
+    assert index.execute("SELECT COUNT(*) FROM files") == [(2,)]
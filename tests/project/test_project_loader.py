@@ -0,0 +1,122 @@
+# testdoc: Purpose
+# To test the project loader: import resolution (relative, remapped and
+# base-path imports), construction of the dependency graph and parsing of
+# every reachable file exactly once in topological order.
+
+# testdoc: Method
+# A small project is written to a temporary directory. A thread pool that
+# records submitted paths replaces the default process pool so the number
+# of parses per file can be counted.
+from concurrent.futures import ThreadPoolExecutor
+
+from solp.project import ProjectLoader, load_project
+from solp.solidity_ast.nodes import SourceUnitNode
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=4)
+        self.submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted.append(args[0])
+        return super().submit(fn, *args, **kwargs)
+
+
+def write(path, code):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(code, encoding="utf-8")
+    return str(path)
+
+
+def make_project(tmp_path):
+    write(
+        tmp_path / "lib" / "oz" / "Ownable.sol",
+        'import "./Context.sol";\ncontract Ownable { uint owner; }',
+    )
+    write(tmp_path / "lib" / "oz" / "Context.sol", "contract Context { }")
+    write(tmp_path / "src" / "Math.sol", "library Math { }")
+    write(
+        tmp_path / "src" / "Token.sol",
+        'import "@oz/Ownable.sol";\nimport "src/Math.sol";\n'
+        "contract Token { uint supply; }",
+    )
+    vault = write(
+        tmp_path / "src" / "Vault.sol",
+        'pragma solidity ^0.8.0;\nimport "./Token.sol";\n'
+        'import {Ownable} from "@oz/Ownable.sol";\nimport "./Missing.sol";\n'
+        "contract Vault { }",
+    )
+    return vault
+
+
+def test_resolves_relative_remapped_and_base_path_imports(tmp_path):
+    # testdoc: All import styles resolve to absolute paths in the graph
+    vault = make_project(tmp_path)
+    project = load_project(
+        [vault],
+        remappings=[f"@oz/={tmp_path / 'lib' / 'oz'}/"],
+        base_path=tmp_path,
+        executor=RecordingExecutor(),
+    )
+    token = str(tmp_path / "src" / "Token.sol")
+    ownable = str(tmp_path / "lib" / "oz" / "Ownable.sol")
+    assert project.dependencies[vault] == [token, ownable]
+    assert project.dependencies[token] == [ownable, str(tmp_path / "src" / "Math.sol")]
+    assert project.unresolved == {vault: ["./Missing.sol"]}
+
+
+def test_each_file_parsed_once_in_topological_order(tmp_path):
+    # testdoc: Shared dependencies are parsed once, before their importers
+    vault = make_project(tmp_path)
+    executor = RecordingExecutor()
+    project = ProjectLoader(
+        remappings={"@oz/": str(tmp_path / "lib" / "oz") + "/"}, base_path=tmp_path
+    ).load([vault], executor)
+
+    assert sorted(executor.submitted) == sorted(set(executor.submitted))
+    assert len(project) == 5
+    order = project.order
+    for path, deps in project.dependencies.items():
+        for dep in deps:
+            assert order.index(dep) < order.index(path)
+    assert isinstance(project[vault], SourceUnitNode)
+    assert project[vault].children[-1].name == "Vault"
+
+
+def test_import_cycles_and_parse_errors(tmp_path):
+    # testdoc: Cycles do not block scheduling and parse errors are recorded
+    a = write(tmp_path / "A.sol", 'import "./B.sol";\ncontract A { }')
+    write(tmp_path / "B.sol", 'import "./A.sol";\nimport "./C.sol";\ncontract B { }')
+    write(tmp_path / "C.sol", "contract C { function f( }")
+    project = load_project([a], base_path=tmp_path, executor=RecordingExecutor())
+    assert set(project.units) == {a, str(tmp_path / "B.sol")}
+    assert list(project.errors) == [str(tmp_path / "C.sol")]
+
+
+def test_unreadable_files_are_recorded(tmp_path):
+    # testdoc: Files that cannot be read or decoded are errors, not aborts
+    a = write(tmp_path / "A.sol", 'import "./B.sol";\ncontract A { }')
+    (tmp_path / "B.sol").write_bytes(b"contract B { } \xff\xfe")
+    project = load_project([a], base_path=tmp_path, executor=RecordingExecutor())
+    assert list(project.units) == [a]
+    assert list(project.errors) == [str(tmp_path / "B.sol")]
+    assert "utf-8" in project.errors[str(tmp_path / "B.sol")]
+
+
+def test_discovery_is_breadth_first(tmp_path):
+    # testdoc: Discovery visits the imports of a file before their imports
+    a = write(tmp_path / "A.sol", 'import "./B.sol";\nimport "./C.sol";\n')
+    write(tmp_path / "B.sol", 'import "./D.sol";\n')
+    write(tmp_path / "C.sol", "")
+    write(tmp_path / "D.sol", "")
+    project = load_project([a], base_path=tmp_path, executor=RecordingExecutor())
+    names = [path.rsplit("/", 1)[1] for path in project.dependencies]
+    assert names == ["A.sol", "B.sol", "C.sol", "D.sol"]
+
+
+def test_default_process_pool(tmp_path):
+    # testdoc: Without an executor the files are parsed in a process pool
+    vault = make_project(tmp_path)
+    project = load_project([vault], base_path=tmp_path, max_workers=2)
+    assert project[vault].children[-1].name == "Vault"
@@ -0,0 +1,101 @@
+# testdoc: Purpose
+# To guard the startup cost of the package: `import solp` must not load the
+# parser, the rule modules or multiprocessing, the CLI must load only the
+# modules of the chosen subcommand, public names must still be reachable
+# through lazy attributes, rule modules must be imported on first use and
+# the precomputed lexer tables must match their definitions.
+
+# testdoc: Method
+# Imports are measured in fresh interpreters with `python -X importtime`
+# through scripts/startup_benchmark.py; the loaded modules are listed by a
+# child process. Time limits are the generous thresholds of the benchmark,
+# taken as the best of three runs.
+import os
+import runpy
+import subprocess
+import sys
+
+import pytest
+
+import solp
+from solp.lexer.definitions.keywords import KEYWORD_SET, KEYWORDS
+from solp.lexer.definitions.operators import OPERATOR_GROUP, OPERATOR_GROUPS, OPERATORS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BENCHMARK = runpy.run_path(os.path.join(ROOT, "scripts", "startup_benchmark.py"))
+
+
+def _loaded_modules(statement):
+    code = f"{statement}\nimport sys\nprint('\\n'.join(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+# testdoc: import solp loads no submodules
+def test_import_solp_is_lazy():
+    modules = _loaded_modules("import solp")
+    assert [name for name in modules if name.startswith("solp")] == ["solp"]
+    assert "concurrent.futures" not in modules
+
+
+# testdoc: Parsing loads neither multiprocessing nor unused rule modules
+def test_parse_loads_only_needed_modules():
+    modules = _loaded_modules(
+        "from solp import parse_source_unit\n"
+        "parse_source_unit('contract A { function f() public { g(x); } }')"
+    )
+    assert "solp.parser.rules.function" in modules
+    assert "solp.parser.rules.constructor" not in modules
+    assert "solp.lexer.arrays" not in modules
+    assert "solp.project" not in modules
+    assert "multiprocessing" not in modules
+    assert "concurrent.futures" not in modules
+
+
+# testdoc: The CLI loads only the modules of the chosen subcommand
+def test_cli_is_lazy():
+    from solp import cli
+    from solp.metrics import FORMAT_CSV, FORMAT_JSONL
+
+    modules = _loaded_modules("import solp.cli\nsolp.cli.build_parser()")
+    assert sorted(name for name in modules if name.startswith("solp")) == [
+        "solp",
+        "solp.cli",
+    ]
+    assert "concurrent.futures" not in modules
+    assert "multiprocessing" not in modules
+    assert cli.METRICS_FORMATS == (FORMAT_CSV, FORMAT_JSONL)
+
+
+# testdoc: Lazy attributes resolve to the defining module's objects
+def test_lazy_attributes():
+    from solp.solidity_parser import parse_source_unit
+
+    assert solp.parse_source_unit is parse_source_unit
+    assert set(solp.__all__) <= set(dir(solp))
+    with pytest.raises(AttributeError):
+        solp.no_such_name
+
+
+# testdoc: Precomputed lexer tables match OPERATOR_GROUPS and KEYWORDS
+def test_precomputed_tables():
+    derived = {op: group for group, ops in OPERATOR_GROUPS.items() for op in ops}
+    assert OPERATOR_GROUP == derived
+    assert sorted(OPERATORS) == sorted(derived)
+    lengths = [len(op) for op in OPERATORS]
+    assert lengths == sorted(lengths, reverse=True)
+    assert KEYWORD_SET == frozenset(KEYWORDS)
+
+
+# testdoc: Import times stay below the benchmark thresholds
+@pytest.mark.parametrize("statement", list(BENCHMARK["THRESHOLDS"]))
+def test_import_time_threshold(statement):
+    times = BENCHMARK["measure"](statement, 3)
+    elapsed = BENCHMARK["solp_time"](times) / 1000
+    assert elapsed <= BENCHMARK["THRESHOLDS"][statement]
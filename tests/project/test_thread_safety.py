@@ -0,0 +1,115 @@
+# testdoc: Purpose
+# To test the thread-safety guarantee: parsing in many threads with a
+# shared SymbolTable and a shared HashConsingNodeFactory must give the same
+# trees as serial parsing, shared caches must hand out one canonical object
+# per key, module-level lexer tables must be immutable, and parsing must
+# scale with the thread count on free-threaded builds.
+
+# testdoc: Method
+# A synthetic corpus from scripts/thread_benchmark.py is parsed serially
+# and by a thread pool; trees are compared by structural hash. Threads
+# start together on a barrier to maximize contention on the caches. The
+# scaling check only runs on a free-threaded build with at least 4 CPUs.
+import os
+import runpy
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+import pytest
+
+from solp.lexer import lexer
+from solp.lexer.interning import CANONICAL_KEYWORDS, SymbolTable
+from solp.query import _kind_bits, compile_query
+from solp.solidity_ast.factory import HashConsingNodeFactory
+from solp.solidity_parser import parse_source_unit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BENCHMARK = runpy.run_path(os.path.join(ROOT, "scripts", "thread_benchmark.py"))
+THREADS = 8
+
+
+def _run_together(function, count=THREADS):
+    barrier = threading.Barrier(count)
+
+    def task(position):
+        barrier.wait()
+        return function(position)
+
+    with ThreadPoolExecutor(count) as executor:
+        return list(executor.map(task, range(count)))
+
+
+# testdoc: Threaded parses equal serial parses with shared caches
+def test_threaded_parse_matches_serial():
+    sources = BENCHMARK["corpus"](24, contracts=5)
+    serial = [parse_source_unit(source).structural_hash() for source in sources]
+    _, units = BENCHMARK["parse_all"](sources, THREADS)
+    assert [unit.structural_hash() for unit in units] == serial
+
+
+# testdoc: A shared SymbolTable returns one string object per name
+def test_shared_symbol_table():
+    symbols = SymbolTable()
+    source = BENCHMARK["corpus"](1, contracts=3)[0]
+
+    def names(_):
+        unit = parse_source_unit(source, symbols=symbols)
+        return [member.name for member in unit.children[0].members]
+
+    results = _run_together(names)
+    for result in results[1:]:
+        assert all(a is b for a, b in zip(result, results[0]))
+
+
+# testdoc: A shared hash-consing factory returns one node per key
+def test_shared_hash_consing_factory():
+    nodes = HashConsingNodeFactory()
+    source = BENCHMARK["corpus"](1, contracts=1)[0]
+
+    def parameter(_):
+        unit = parse_source_unit(source, nodes)
+        return unit.children[0].members[1].parameters[0]
+
+    results = _run_together(parameter)
+    assert all(result is results[0] for result in results)
+
+
+# testdoc: Concurrent query compilation assigns distinct kind bits
+def test_concurrent_query_compilation():
+    kinds = [f"ThreadKind{i}" for i in range(THREADS * 4)]
+
+    def compile_all(position):
+        rotated = kinds[position:] + kinds[:position]
+        return [compile_query(f"{kind}[name]") for kind in rotated]
+
+    results = _run_together(compile_all)
+    bits = [_kind_bits[kind] for kind in kinds]
+    assert len(set(bits)) == len(bits)
+    for kind in kinds:
+        queries = {id(q) for result in results for q in result if q.last.kind == kind}
+        assert len(queries) == 1
+
+
+# testdoc: Module-level lexer tables are immutable
+def test_lexer_tables_are_immutable():
+    assert isinstance(lexer.KEYWORDS, frozenset)
+    assert isinstance(lexer.SYMBOL_SET, frozenset)
+    assert isinstance(lexer.OPERATORS, tuple)
+    assert isinstance(lexer.OPERATOR_GROUP, MappingProxyType)
+    assert isinstance(CANONICAL_KEYWORDS, MappingProxyType)
+    with pytest.raises(TypeError):
+        lexer.OPERATOR_GROUP["+"] = "other"
+
+
+# testdoc: Parsing scales with threads on a free-threaded build
+@pytest.mark.skipif(
+    BENCHMARK["gil_enabled"]() or (os.cpu_count() or 1) < 4,
+    reason="needs a free-threaded CPython build and at least 4 CPUs",
+)
+def test_scaling_without_gil():
+    sources = BENCHMARK["corpus"](32)
+    single, _ = BENCHMARK["parse_all"](sources, 1)
+    parallel, _ = BENCHMARK["parse_all"](sources, 4)
+    assert single / parallel >= 2.5, sys.version
@@ -0,0 +1,128 @@
+# testdoc: Purpose
+# To test the polling workspace index behind `solp watch`: change detection
+# by stat signature and content hash, incremental re-parsing and index
+# persistence.
+
+# testdoc: Method
+# Files in a temporary directory are created, touched, edited and deleted
+# between polls. mtimes are set explicitly so the tests do not depend on
+# filesystem timestamp resolution.
+import os
+import threading
+
+from solp import cli
+from solp.watch import WorkspaceIndex, watch
+
+
+def write(path, code, mtime_ns):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(code, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def test_initial_scan_reports_added_files(tmp_path):
+    # testdoc: Every .sol file is parsed once and reported as added
+    a = write(tmp_path / "A.sol", "contract A { }", 1)
+    b = write(tmp_path / "sub" / "B.sol", "contract B { }", 1)
+    write(tmp_path / "notes.txt", "contract X { }", 1)
+    events = WorkspaceIndex(tmp_path).scan()
+    assert [(e.kind, e.path) for e in events] == [("added", a), ("added", b)]
+    assert events[1].unit.children[0].name == "B"
+
+
+def test_only_changed_content_is_reparsed(tmp_path):
+    # testdoc: Touched files with identical content produce no event
+    a = write(tmp_path / "A.sol", "contract A { }", 1)
+    b = write(tmp_path / "B.sol", "contract B { }", 1)
+    index = WorkspaceIndex(tmp_path)
+    index.scan()
+    first_a = index.units[a]
+
+    write(tmp_path / "A.sol", "contract A { }", 2)
+    write(tmp_path / "B.sol", "contract B2 { }", 2)
+    events = index.scan()
+    assert [(e.kind, e.path) for e in events] == [("modified", b)]
+    assert events[0].unit.children[0].name == "B2"
+    assert index.units[a] is first_a
+    assert index.scan() == []
+
+
+def test_removed_files_and_parse_errors(tmp_path):
+    # testdoc: Deleted files are reported and parse errors travel with events
+    a = write(tmp_path / "A.sol", "contract A { }", 1)
+    index = WorkspaceIndex(tmp_path)
+    index.scan()
+    os.remove(a)
+    bad = write(tmp_path / "Bad.sol", "contract { }", 1)
+    events = index.scan()
+    assert [(e.kind, e.path) for e in events] == [("removed", a), ("added", bad)]
+    assert events[1].error is not None
+
+
+def test_index_persistence_skips_unchanged_workspace(tmp_path):
+    # testdoc: A reloaded index reports nothing for an unchanged tree
+    write(tmp_path / "src" / "A.sol", "contract A { }", 1)
+    index_file = str(tmp_path / "index.json")
+    index = WorkspaceIndex(tmp_path / "src")
+    index.scan()
+    index.save(index_file)
+    assert WorkspaceIndex.load(index_file, tmp_path / "src").scan() == []
+    assert len(WorkspaceIndex.load(index_file, tmp_path).entries) == 0
+
+
+def test_vanishing_files_and_failing_entries(tmp_path):
+    # testdoc: Files deleted during a poll and unreadable entries are skipped
+    a = write(tmp_path / "A.sol", "contract A { }", 1)
+    b = write(tmp_path / "B.sol", "contract B { }", 1)
+    index = WorkspaceIndex(tmp_path)
+    index.scan()
+
+    walk = index._walk
+
+    def deleting_walk():
+        # A is deleted after its stat, e.g. replaced by an atomic save
+        for path, stat in walk():
+            if path == a:
+                os.remove(a)
+                stat = os.stat_result((0,) * 7 + (0, 2, 2))
+            yield path, stat
+
+    index._walk = deleting_walk
+    assert [(e.kind, e.path) for e in index.scan()] == [("removed", a)]
+
+    del index._walk
+    os.symlink(tmp_path / "missing", tmp_path / "Dangling.sol")
+    write(tmp_path / "B.sol", "contract B2 { }", 3)
+    assert [(e.kind, e.path) for e in index.scan()] == [("modified", b)]
+
+
+def test_stat_only_changes_are_persisted(tmp_path):
+    # testdoc: A touched file updates the saved index without an event
+    a = write(tmp_path / "A.sol", "contract A { }", 1)
+    index_file = str(tmp_path / "index.json")
+    stop = threading.Event()
+    stop.set()
+    watch(tmp_path, [].append, interval=0, index_path=index_file, stop=stop)
+    write(tmp_path / "A.sol", "contract A { }", 2)
+    events = []
+    index = watch(tmp_path, events.append, 0, index_path=index_file, stop=stop)
+    assert events == [] and not index.dirty
+    assert WorkspaceIndex.load(index_file, tmp_path).entries[a][0] == 2
+
+
+def test_watch_loop_and_cli(tmp_path, capsys):
+    # testdoc: The watch loop and CLI report events until stopped
+    write(tmp_path / "A.sol", "contract A { }", 1)
+    stop = threading.Event()
+    events = []
+
+    def collect(event):
+        events.append(event)
+        stop.set()
+
+    watch(tmp_path, collect, interval=0.01, stop=stop)
+    assert [e.kind for e in events] == ["added"]
+
+    cli._print_event(events[0])
+    assert capsys.readouterr().out.startswith("added ")